@@ -1,17 +1,11 @@
+import time
+boot_start = time.perf_counter()
+
 from master_materials import (
     bplibrary,
-    constants,
-    menus
+    startup
 )
 
-import unreal
-
-
-# register metadata names
-unreal.MasterMaterialSystemBPLibrary.register_metadata_tags([
-    constants.META_MATERIAL_DISPLAY_NAME,
-    constants.META_IS_MASTER_MATERIAL
-])
 
-# register the menu system
-menus.setup_menus()
+# register the metadata names and menus, the master material menus are filled once the Asset Registry is ready
+startup.startup(boot_start)
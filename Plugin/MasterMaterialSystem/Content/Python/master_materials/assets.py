@@ -1,10 +1,13 @@
 
-from master_materials import constants
+from master_materials import (
+    constants,
+    level_usage,
+    tracing
+)
 
 from master_materials.unreal_systems import (
     asset_registry,
     asset_registry_helper,
-    EditorActorSubsystem,
     EditorAssetLibrary,
     EditorAssetSubsystem
 )
@@ -24,6 +27,49 @@ def set_metadata(asset, key, value):
     EditorAssetLibrary.set_metadata_tag(asset, key, str(value))
 
 
+def decode_bool(value):
+    """bools are a special case as bool(str) only checks for length"""
+    return value.lower() == "true"
+
+
+def compile_metadata_decoder(key):
+    """
+    Get the function converting a metadata string into the key's type from METADATA_TYPE_MAP
+
+    parameters:
+        key: the metadata key name
+
+    Return:
+        callable: the decoder, most value types may be directly converted
+    """
+    value_type = constants.METADATA_TYPE_MAP.get(key, str)
+    return decode_bool if value_type == bool else value_type
+
+
+# Precompiled decoders of the known metadata keys, other keys are decoded as str
+METADATA_DECODERS = {
+    key: compile_metadata_decoder(key)
+    for key in constants.METADATA_TYPE_MAP
+}
+
+
+def decode_metadata(key, value, default=None):
+    """
+    Convert a raw metadata string into its intended type
+
+    parameters:
+        key: the metadata key name
+        value (str): the raw metadata value
+        default: the default value to assume if the metadata is not set
+
+    Return:
+        the metadata value in its expected type (if mapped in METADATA_TYPE_MAP)
+    """
+    if value and value.lower() != "none":
+        return METADATA_DECODERS.get(key, str)(value)
+    return default
+
+
 def get_metadata(asset, key, default=None):
     """
     Getting Metadata can be done on a loaded unreal.Object reference OR unreal.AssetData
@@ -45,65 +91,175 @@ def get_metadata(asset, key, default=None):
     else:
         value = EditorAssetLibrary.get_metadata_tag(asset, key)
 
-    if value and value.lower != "none":
-        # Get this metadata key's expected value type:
-        value_type = constants.METADATA_TYPE_MAP.get(key, str)
+    return decode_metadata(key, value, default)
 
-        if value_type == bool:
-            # bools are a special case as bool(str) only checks for length
-            return value.lower() == "true"
-        else:
-            # most value types may be directly converted
-            return value_type(value)
 
-    return default
+def get_metadata_table(asset_datas, keys, default=None):
+    """
+    Read and decode several metadata keys from many assets in a single pass
 
+    parameters:
+        asset_datas (list(unreal.AssetData)): the assets to read the metadata from
+        keys (list): the metadata key names
+        default: the default value to assume if a key is not set
+
+    Return:
+        list(dict): one {key: value} row per asset, in the same order as asset_datas
+    """
+    decoders = [(key, METADATA_DECODERS.get(key, str)) for key in keys]
+
+    table = []
+    for asset_data in asset_datas:
+        row = dict()
+        for key, decoder in decoders:
+            value = asset_data.get_tag_value(key)
+            row[key] = decoder(value) if value and value.lower() != "none" else default
+        table.append(row)
+    return table
 
-def find_assets(name="", str_in_path="", exact_match=False, metadata=None, class_types=None):
-    """Find Unreal Assets based on a given name, a list of class names, or metadata {name:value} pairs
+
+def build_asset_filter(name="", exact_match=False, metadata=None, class_types=None, package_paths=None, recursive_paths=True):
+    """Build the unreal.ARFilter for an asset search, pushing every derivable constraint to the Asset Registry
+
+    Only the first metadata pair is added to the filter, the registry ORs multiple tags together
 
     parameters:
         name (str): the asset name to search for
-        str_in_path (str): look for assets based on a substring of the package path
-        exact_match (bool): If true, only return exact name matches. False will test as 'A in B' 
+        exact_match (bool): If true, only match exact names
         metadata (dict): a dictionary of metadata name:value pairs
-        class_type (list(str)): list of Unreal class type (Object, LevelSequence, Level, etc)
+        class_types (list(str)): list of Unreal class type (Object, LevelSequence, Level, etc)
+        package_paths (list(str)): the content folders to search in
+        recursive_paths (bool): whether to also search the sub folders of package_paths
 
     returns:
-        list(unreal.AssetData):
+        unreal.ARFilter:
     """
     metadata = metadata or {}
     class_types = class_types or ["object"]
+    package_paths = [str(path).rstrip("/") for path in package_paths or []]
 
-    # Create basic filter for the given class types and perform an initial search
-    base_filter = unreal.ARFilter(
+    filter_args = dict(
         class_names=class_types,
-        recursive_paths=True,
+        recursive_paths=recursive_paths,
     )
-    results = asset_registry.get_assets(base_filter) or []
 
-    # Remove any Temp asset paths
-    results = [r for r in results if not str(r.package_path).startswith("/Temp/")]
+    # An exact name in known folders is an exact object path
+    if name and exact_match and package_paths and not recursive_paths:
+        filter_args["soft_object_paths"] = [
+            unreal.SoftObjectPath(f"{path}/{name}.{name}")
+            for path in package_paths
+        ]
+    elif package_paths:
+        filter_args["package_paths"] = package_paths
+
+    base_filter = unreal.ARFilter(**filter_args)
 
-    # Filter results by each metadata key:value pair
-    for key, value in metadata.items():
+    if metadata:
+        key, value = next(iter(metadata.items()))
         query = unreal.TagAndValue(key, str(value))
-        meta_filter = asset_registry_helper.set_filter_tags_and_values(base_filter, [query])
-        results = asset_registry.run_assets_through_filter(results, meta_filter) or []
+        base_filter = asset_registry_helper.set_filter_tags_and_values(base_filter, [query])
+
+    return base_filter
+
+
+def iter_assets(name="", str_in_path="", exact_match=False, metadata=None, class_types=None,
+                package_paths=None, recursive_paths=True, limit=None):
+    """Iterate over Unreal Assets based on a given name, a list of class names, or metadata {name:value} pairs
+
+    Unlike find_assets the results are yielded in Asset Registry order, unsorted. The registry
+    query is not lazy: it runs once, up front, and returns every asset matching the ARFilter
+    before the first result is yielded. `limit` only stops the Python-side filtering, so the
+    registry only returns a single row when the filter itself is that narrow (an exact name in
+    non-recursive package_paths becomes an exact object path)
+
+    parameters:
+        name (str): the asset name to search for
+        str_in_path (str): look for assets based on a substring of the package path
+        exact_match (bool): If true, only return exact name matches. False will test as 'A in B'
+        metadata (dict): a dictionary of metadata name:value pairs
+        class_types (list(str)): list of Unreal class type (Object, LevelSequence, Level, etc)
+        package_paths (list(str)): the content folders to search in
+        recursive_paths (bool): whether to also search the sub folders of package_paths
+        limit (int): the maximum number of assets to yield
+
+    yields:
+        unreal.AssetData:
+    """
+    metadata = metadata or {}
+
+    # Let the Asset Registry apply everything it can before any results reach Python
+    base_filter = build_asset_filter(name, exact_match, metadata, class_types, package_paths, recursive_paths)
+    results = asset_registry.get_assets(base_filter) or []
+
+    # Filter results by each remaining metadata key:value pair, each from a fresh filter holding only
+    # that pair: set_filter_tags_and_values adds to the filter's tags and the registry ORs them
+    for key, value in list(metadata.items())[1:]:
         if not results:
-            break
+            return
+        query = unreal.TagAndValue(key, str(value))
+        meta_filter = asset_registry_helper.set_filter_tags_and_values(unreal.ARFilter(), [query])
+        results = asset_registry.run_assets_through_filter(results, meta_filter) or []
 
-    # Filter results by name (if provided)
-    if name:
-        # use exact match (a==b) or partial (a in b)
-        name_matches_filter = (
-            lambda a, b: a == b if exact_match else a.lower() in b.lower()
-        )
-        results = [r for r in results if name_matches_filter(name, str(r.asset_name))]
+    name = name.lower() if not exact_match else name
+    str_in_path = str_in_path.lower()
+
+    found = 0
+    for result in results:
+        # Remove any Temp asset paths
+        if str(result.package_path).startswith("/Temp/"):
+            continue
+
+        # Filter results by name (if provided), use exact match (a==b) or partial (a in b)
+        if name:
+            asset_name = str(result.asset_name)
+            if exact_match and name != asset_name:
+                continue
+            if not exact_match and name not in asset_name.lower():
+                continue
+
+        # Filter results by package path (if provided)
+        if str_in_path and str_in_path not in str(result.package_name).lower():
+            continue
+
+        yield result
+
+        found += 1
+        if limit and found >= limit:
+            return
+
+
+def find_asset(**kwargs):
+    """Find the first Unreal Asset matching the given iter_assets() arguments
+
+    The Asset Registry still returns every asset matching the ARFilter, pass an exact name with
+    non-recursive package_paths to look up a single object path
+
+    returns:
+        unreal.AssetData: the first match, None if nothing was found
+    """
+    return next(iter_assets(limit=1, **kwargs), None)
+
+
+@tracing.traced
+def find_assets(name="", str_in_path="", exact_match=False, metadata=None, class_types=None,
+                package_paths=None, recursive_paths=True):
+    """Find Unreal Assets based on a given name, a list of class names, or metadata {name:value} pairs
+
+    parameters:
+        name (str): the asset name to search for
+        str_in_path (str): look for assets based on a substring of the package path
+        exact_match (bool): If true, only return exact name matches. False will test as 'A in B' 
+        metadata (dict): a dictionary of metadata name:value pairs
+        class_type (list(str)): list of Unreal class type (Object, LevelSequence, Level, etc)
+        package_paths (list(str)): the content folders to search in
+        recursive_paths (bool): whether to also search the sub folders of package_paths
 
-    # Filter results by package path (if provided)
-    if str_in_path:
-        results = [r for r in results if str_in_path.lower() in str(r.package_name).lower()]
+    returns:
+        list(unreal.AssetData):
+    """
+    results = list(iter_assets(
+        name, str_in_path, exact_match, metadata, class_types, package_paths, recursive_paths
+    ))
 
     # Sort results by asset path, list local assets before any plugin assets
     if len(results) > 1:
@@ -115,26 +271,54 @@ def find_assets(name="", str_in_path="", exact_match=False, metadata=None, class
             )
         )
 
-    return list(results)
+    return results
 
 
 def get_all_actors():
     """
-    Get all actors including Sequencer spawned actors
+    Get all actors placed in the edited level and its streamed sublevels, transient actors such as
+    Sequencer spawnables are left out
 
     return:
         list(unreal.Actor): list of all actors in the currently open level
     """
-    scene_components = EditorActorSubsystem.get_all_level_actors_components()
-    return sorted(
-        list({
-            i.get_owner()
-            for i in scene_components
-            if i.get_owner()
-            and unreal.MathLibrary.class_is_child_of(i.get_owner().get_class(), unreal.Actor)
-        }),
-        key=lambda a: a.get_path_name()
-    )
+    return level_usage.get_level_material_index().get_actors()
+
+
+@tracing.traced
+def load_assets(asset_datas):
+    """Load many assets at once
+
+    The packages are requested together through the plugin's bulk prefetch so their loading
+    overlaps, the assets are then resolved from memory
+
+    parameters:
+        asset_datas (list(unreal.AssetData)): the assets to load
+
+    return:
+        list(unreal.Object): the loaded assets, in the same order
+    """
+    if asset_datas and hasattr(unreal.MasterMaterialSystemBPLibrary, "prefetch_assets"):
+        unreal.MasterMaterialSystemBPLibrary.prefetch_assets([
+            f"{asset_data.package_name}.{asset_data.asset_name}"
+            for asset_data in asset_datas
+        ])
+    return [asset_data.get_asset() for asset_data in asset_datas]
+
+
+@tracing.traced
+def save_packages(packages):
+    """Save the given packages in a single batch
+
+    parameters:
+        packages (list(unreal.Package)): the packages to save
+
+    return:
+        bool: if the operation was a success
+    """
+    if not packages:
+        return True
+    return unreal.EditorLoadingAndSavingUtils.save_packages(list(packages), False)
 
 
 def save_asset(asset):
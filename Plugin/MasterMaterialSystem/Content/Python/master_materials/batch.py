@@ -0,0 +1,326 @@
+"""
+Run master material reports and migrations from the command line, split over several editor processes
+
+Each shard runs in a headless editor through the Python script commandlet and writes its own
+result file, the merge step then combines the shard files into a single report:
+
+    UnrealEditor-Cmd <Project>.uproject -run=pythonscript -script="<this file> run report --shard 0 --shards 4 --output D:/reports"
+    python batch.py merge report --shards 4 --output D:/reports
+
+`launch` starts every shard, waits for them and merges their results:
+
+    python batch.py launch report --editor <UnrealEditor-Cmd> --project <Project>.uproject --output D:/reports
+
+Materials are sharded by content folder, so the instances a migration creates in a folder are
+always named by a single process. A mesh may use materials from several folders, so
+--replace-references is only allowed with a single shard
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import zlib
+from pathlib import Path
+
+# The launch and merge commands run in a plain Python outside the editor, the unreal module and
+# the modules using it are only imported by the shards
+
+
+# The operations a shard can run
+OPERATIONS = ["report", "migrate"]
+
+# The editor flags of each headless shard process
+SHARD_EDITOR_FLAGS = ["-unattended", "-nop4", "-nosplash", "-NullRHI", "-stdout", "-FullStdOutLogOutput"]
+
+
+def get_shard(package_path, shard_count):
+    """
+    Get the shard a content folder belongs to, stable across processes and sessions
+
+    parameters:
+        package_path (str): the content folder, e.g. "/Game/Props"
+        shard_count (int): the number of shards
+
+    return:
+        int: the shard index
+    """
+    return zlib.crc32(str(package_path).encode("utf-8")) % shard_count
+
+
+def get_shard_path(output_dir, operation, shard_index, shard_count):
+    """Get the result file of a shard"""
+    return Path(output_dir) / f"{operation}_shard{shard_index:03d}of{shard_count:03d}.json"
+
+
+def write_json(path, data):
+    """Write JSON through a temp file so a crashed shard never leaves a half written file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def serialize_value(value):
+    """Convert a material parameter value to JSON"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "get_path_name"):
+        return value.get_path_name()
+    if all(hasattr(value, channel) for channel in "rgba"):
+        return [value.r, value.g, value.b, value.a]
+    return str(value)
+
+
+def find_shard_materials(package_paths, shard_index, shard_count, class_types):
+    """
+    Get the materials of the given content folders which belong to a shard
+
+    return:
+        list(unreal.AssetData): the shard's materials
+    """
+    from master_materials import assets
+    from master_materials.unreal_systems import asset_registry
+
+    # a headless editor starts scanning the project in the background
+    asset_registry.wait_for_completion()
+    return [
+        asset_data
+        for asset_data in assets.find_assets(class_types=class_types, package_paths=package_paths)
+        if get_shard(asset_data.package_path, shard_count) == shard_index
+    ]
+
+
+def report_material(material):
+    """
+    Describe a material and its parameters
+
+    parameters:
+        material (unreal.MaterialInterface): the material to describe
+
+    return:
+        dict: the material's root material, master material and {parameter: {type, value}}
+    """
+    from master_materials import index, materials
+
+    material_info = materials.MaterialParamInfo(material)
+    root_path = material_info.parent_material.get_path_name() if material_info.parent_material else None
+    master = index.get_master_material_index().get(root_path.split(".", 1)[0]) if root_path else None
+    return {
+        "root": root_path,
+        "master": master.display_name if master else None,
+        "graph": material_info.graph_stats,
+        "parameters": {
+            parameter: {
+                "type": material_info.get_parameter_type(parameter).__name__,
+                "value": serialize_value(material_info.get_parameter_value(parameter)),
+            }
+            for parameter in material_info.get_parameter_names()
+        },
+    }
+
+
+def run_report(args, asset_datas):
+    """Describe every material of the shard"""
+    import unreal
+
+    items, errors = dict(), dict()
+    for asset_data in asset_datas:
+        object_path = f"{asset_data.package_name}.{asset_data.asset_name}"
+        try:
+            items[object_path] = report_material(unreal.load_asset(object_path))
+            items[object_path]["class"] = str(asset_data.asset_class_path.asset_name)
+        except Exception as error:
+            unreal.log_error(f"Could not report {object_path}: {error}")
+            errors[object_path] = str(error)
+    return {"items": items, "errors": errors}
+
+
+def run_migrate(args, asset_datas):
+    """Migrate every material of the shard, each shard resumes its own journal"""
+    from master_materials import migration
+    import unreal
+
+    master_material = unreal.load_asset(args.master)
+    if not master_material:
+        raise ValueError(f"Could not load the master material {args.master}")
+
+    job_name = args.job or migration.get_default_job_name("batch", master_material)
+    job = migration.MigrationJob(
+        master_material,
+        [f"{asset_data.package_name}.{asset_data.asset_name}" for asset_data in asset_datas],
+        job_name=f"{job_name}_shard{args.shard:03d}of{args.shards:03d}",
+        replace_references=args.replace_references
+    )
+    summary = job.run(retry_failed=args.retry_failed)
+    items = job.journal["items"]
+    return {
+        "summary": summary,
+        "items": {path: item for path, item in items.items() if item["status"] != migration.STATUS_FAILED},
+        "errors": {path: item["error"] for path, item in items.items() if item["status"] == migration.STATUS_FAILED},
+    }
+
+
+def run_shard(args):
+    """Run an operation on one shard and write its result file"""
+    import unreal
+
+    start_time = time.perf_counter()
+    class_types = ["Material", "MaterialInstanceConstant"] if args.operation == "report" else ["Material"]
+    asset_datas = find_shard_materials(args.paths, args.shard, args.shards, class_types)
+    unreal.log(f"Shard {args.shard + 1}/{args.shards}: {args.operation} of {len(asset_datas)} material(s)")
+
+    result = (run_report if args.operation == "report" else run_migrate)(args, asset_datas)
+    result.update({
+        "operation": args.operation,
+        "shard": args.shard,
+        "shards": args.shards,
+        "paths": args.paths,
+        "seconds": time.perf_counter() - start_time,
+    })
+    shard_path = get_shard_path(args.output, args.operation, args.shard, args.shards)
+    write_json(shard_path, result)
+    unreal.log(f"Shard {args.shard + 1}/{args.shards}: wrote {shard_path}")
+    return 1 if result["errors"] else 0
+
+
+def merge(output_dir, operation, shard_count):
+    """
+    Combine the shard result files into a single report
+
+    parameters:
+        output_dir (str): the folder holding the shard files
+        operation (str): the operation the shards ran
+        shard_count (int): the number of shards
+
+    return:
+        dict: the merged report, written to <output_dir>/<operation>.json
+    """
+    report = {"operation": operation, "shards": shard_count, "missing_shards": [], "items": {}, "errors": {}}
+    summary = dict()
+    for shard_index in range(shard_count):
+        shard_path = get_shard_path(output_dir, operation, shard_index, shard_count)
+        if not shard_path.exists():
+            report["missing_shards"].append(shard_index)
+            continue
+
+        shard = json.loads(shard_path.read_text(encoding="utf-8"))
+        report["items"].update(shard["items"])
+        report["errors"].update(shard["errors"])
+        for status, count in shard.get("summary", {}).items():
+            summary[status] = summary.get(status, 0) + count
+        report["paths"] = shard["paths"]
+
+    if summary:
+        report["summary"] = summary
+    write_json(Path(output_dir) / f"{operation}.json", report)
+    return report
+
+
+def get_shard_command(args, shard_index):
+    """Get the command line running one shard in a headless editor"""
+    script_args = [
+        Path(__file__).resolve().as_posix(), "run", args.operation,
+        "--shard", str(shard_index), "--shards", str(args.shards),
+        "--output", Path(args.output).resolve().as_posix(),
+        "--paths", *args.paths,
+    ]
+    if args.operation == "migrate":
+        script_args += ["--master", args.master]
+        if args.job:
+            script_args += ["--job", args.job]
+        if args.replace_references:
+            script_args.append("--replace-references")
+        if args.retry_failed:
+            script_args.append("--retry-failed")
+
+    # the commandlet splits the script on whitespace and double quotes, so each argument holding a
+    # space is quoted. The script is itself read as one -script="..." value, its quotes are escaped
+    script = subprocess.list2cmdline(script_args).replace('"', '\\"')
+    if os.name == "nt":
+        # list2cmdline would quote the whole -script= switch, which the editor's parser skips over
+        editor_command = subprocess.list2cmdline([args.editor, args.project, "-run=pythonscript"])
+        return f'{editor_command} -script="{script}" {subprocess.list2cmdline(SHARD_EDITOR_FLAGS)}'
+    # the editor quotes the value of a switch holding spaces when it rebuilds its command line
+    return [args.editor, args.project, "-run=pythonscript", f"-script={script}", *SHARD_EDITOR_FLAGS]
+
+
+def launch(args):
+    """Run every shard in its own headless editor, then merge their results"""
+    processes = [
+        subprocess.Popen(get_shard_command(args, shard_index))
+        for shard_index in range(args.shards)
+    ]
+    for shard_index, process in enumerate(processes):
+        if process.wait():
+            print(f"Shard {shard_index + 1}/{args.shards} exited with {process.returncode}")
+
+    report = merge(args.output, args.operation, args.shards)
+    print(
+        f"Merged {args.shards - len(report['missing_shards'])}/{args.shards} shard(s): "
+        f"{len(report['items'])} item(s), {len(report['errors'])} error(s)"
+    )
+    return 1 if report["errors"] or report["missing_shards"] else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_operation_args(command_parser):
+        command_parser.add_argument("operation", choices=OPERATIONS)
+        command_parser.add_argument("--shards", type=int, default=os.cpu_count() or 1,
+                                    help="the number of shards, one per core by default")
+        command_parser.add_argument("--output", required=True, help="the folder shard and merged results are written to")
+
+    def add_shard_args(command_parser):
+        command_parser.add_argument("--paths", nargs="+", default=["/Game"], help="the content folders to process")
+        command_parser.add_argument("--master", help="migrate: the object path of the master material")
+        command_parser.add_argument("--job", default="", help="migrate: the journal name, one journal is kept per shard")
+        command_parser.add_argument("--replace-references", action="store_true",
+                                    help="migrate: replace the mesh references to each migrated material, "
+                                         "requires --shards 1")
+        command_parser.add_argument("--retry-failed", action="store_true",
+                                    help="migrate: retry materials which previously failed")
+
+    run_parser = commands.add_parser("run", help="run one shard, inside the editor")
+    add_operation_args(run_parser)
+    add_shard_args(run_parser)
+    run_parser.add_argument("--shard", type=int, required=True, help="the index of the shard to run")
+
+    merge_parser = commands.add_parser("merge", help="combine the shard results into <output>/<operation>.json")
+    add_operation_args(merge_parser)
+
+    launch_parser = commands.add_parser("launch", help="run every shard in a headless editor, then merge them")
+    add_operation_args(launch_parser)
+    add_shard_args(launch_parser)
+    launch_parser.add_argument("--editor", required=True, help="the UnrealEditor-Cmd executable")
+    launch_parser.add_argument("--project", required=True, help="the .uproject file")
+
+    args = parser.parse_args(argv)
+    if args.command != "merge" and args.operation == "migrate" and not args.master:
+        parser.error("migrate requires --master")
+    # shards would edit and save the same meshes, the last save dropping the other replacements
+    if args.command != "merge" and args.replace_references and args.shards > 1:
+        parser.error("--replace-references edits meshes shared across shards, it requires --shards 1")
+    if args.command == "run" and not 0 <= args.shard < args.shards:
+        parser.error(f"--shard must be between 0 and {args.shards - 1}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "run":
+        return run_shard(args)
+    if args.command == "merge":
+        report = merge(args.output, args.operation, args.shards)
+        return 1 if report["errors"] or report["missing_shards"] else 0
+    return launch(args)
+
+
+if __name__ == "__main__":
+    exit_code = main(sys.argv[1:])
+    # exiting from inside the script commandlet would skip the editor shutdown, shards report through their files
+    if "unreal" not in sys.modules:
+        sys.exit(exit_code)
@@ -1,20 +1,49 @@
-import json
-from pathlib import Path
-
 from master_materials import (
     constants,
+    index,
     materials,
-    assets
+    assets,
+    permutations,
+    prefs,
+    scheduler,
+    tracing
 )
 
 from master_materials.unreal_systems import (
     AssetEditorSubsystem,
-    EditorUtilitySubsystem
+    EditorUtilitySubsystem,
+    MaterialEditingLibrary
 )
 
 import unreal
 
 
+def print_reference_report(task):
+    """Print the report of a finished reference replacement task"""
+    report = task.result
+    if not report:
+        return
+
+    print(f"Updated material assignments on the following assets:")
+    for entry in report["updated"]:
+        print(f"\t{entry}")
+
+    for class_name, package_names in sorted(report["skipped"].items()):
+        print(f"Skipped {len(package_names)} {class_name} referencer(s):")
+        for entry in package_names:
+            print(f"\t{entry}")
+
+    if report.get("cancelled"):
+        print(f"Cancelled before updating {len(report['cancelled'])} referencer(s)")
+
+
+@unreal.ustruct()
+class MaterialTextureMap(unreal.StructBase):
+    """The texture data of a material, see PyMasterMaterialLibrary.get_material_texture_map"""
+    material = unreal.uproperty(unreal.MaterialInterface)
+    textures = unreal.uproperty(unreal.Map(str, unreal.Texture2D))
+
+
 @unreal.uclass()
 class PyMasterMaterialLibrary(unreal.BlueprintFunctionLibrary):
     """
@@ -32,21 +61,26 @@ class PyMasterMaterialLibrary(unreal.BlueprintFunctionLibrary):
         parameters:
             material (unreal.Material): the material to query for its texture data
         """
-        # For materials get the texture names
-        if isinstance(material, unreal.Material):
-            return {
-                texture.get_name(): texture
-                for texture in unreal.MaterialEditingLibrary.get_used_textures(material)
-            }
-
-        # For material instances get the parameter names
-        if isinstance(material, unreal.MaterialInstanceConstant):
-            return {
-                param: unreal.MaterialEditingLibrary.get_material_instance_texture_parameter_value(material, param)
-                for param in unreal.MaterialEditingLibrary.get_texture_parameter_names(material)
-            }
-
-        return dict()
+        return materials.get_texture_map(material)
+
+    @unreal.ufunction(
+        ret=unreal.Array(MaterialTextureMap),
+        params=[unreal.Array(unreal.MaterialInterface)],
+        static=True, meta=dict(Category="Master Materials"), pure=True
+    )
+    def get_material_texture_maps(material_list) -> list:
+        """Get the texture data for many materials in one call
+
+        parameters:
+            material_list (unreal.Array(unreal.MaterialInterface)): the materials to query for their texture data
+        """
+        texture_maps = []
+        for material, textures in zip(material_list, materials.get_texture_maps(material_list)):
+            texture_map = MaterialTextureMap()
+            texture_map.material = material
+            texture_map.textures = textures
+            texture_maps.append(texture_map)
+        return texture_maps
 
     @unreal.ufunction(
         ret=unreal.Map(str, unreal.Material),
@@ -55,14 +89,15 @@ class PyMasterMaterialLibrary(unreal.BlueprintFunctionLibrary):
     def get_all_master_materials() -> dict:
         """Get all master materials as {name: material}"""
         return {
-            assets.get_metadata(asset, constants.META_MATERIAL_DISPLAY_NAME): asset.get_asset()
-            for asset in assets.find_assets(metadata={constants.META_IS_MASTER_MATERIAL: True}, class_types=["Material"])
+            entry.display_name: entry.get_asset()
+            for entry in index.get_master_material_index().get_entries()
         }
 
     @unreal.ufunction(
         params=[unreal.Material, unreal.MaterialInterface, unreal.Map(str, unreal.Texture), bool],
         static=True, meta=dict(Category="Master Materials")
     )
+    @tracing.traced
     def create_material_instance_with_texture_data(master_material, old_material, material_data, replace_references):
         """Create a new instance of the given master material and apply the given texture data to it
 
@@ -83,75 +118,33 @@ class PyMasterMaterialLibrary(unreal.BlueprintFunctionLibrary):
         )
         material_info = materials.MaterialParamInfo(new_material_instance)
 
-        # transfer the texture selections from the UI
-        for parameter, value in material_data.items():
-            if value != unreal.MaterialEditingLibrary.get_material_default_texture_parameter_value(master_material, parameter):
-                material_info.set_parameter_value(parameter, value)
+        # transfer the texture selections from the UI, the instance is saved once below
+        with materials.ParameterEditBatch(save=False):
+            for parameter, value in material_data.items():
+                if value != MaterialEditingLibrary.get_material_default_texture_parameter_value(master_material, parameter):
+                    material_info.set_parameter_value(parameter, value)
 
         AssetEditorSubsystem.open_editor_for_assets([new_material_instance])
         assets.save_asset(new_material_instance)
 
-        # replace references if checked
+        # replace references if checked, over the next editor ticks so the editor stays responsive
         if replace_references:
-            updated_assets = []
-            asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
-
-            for referencer in asset_registry.get_referencers(
-                old_material.get_package().get_path_name(),
-                unreal.AssetRegistryDependencyOptions()
-            ) or []:
-                asset = unreal.load_asset(referencer)
-
-                # Update Static Meshes:
-                if isinstance(asset, unreal.StaticMesh):
-                    material_slot_name = ""
-                    for material in asset.static_materials:
-                        if material.material_interface == old_material:
-                            material_slot_name = material.material_slot_name
-                    material_index = asset.get_material_index(material_slot_name)
-                    asset.set_material(material_index, new_material_instance)
-
-                # Update Skeletal Meshes:
-                elif isinstance(asset, unreal.SkeletalMesh):
-                    new_material_data = []
-                    for skeletal_mesh_mat_data in asset.materials:
-                        if skeletal_mesh_mat_data.material_interface == old_material:
-                            new_material_data.append(
-                                unreal.SkeletalMaterial(
-                                    new_material_instance,
-                                    skeletal_mesh_mat_data.material_slot_name,
-                                    skeletal_mesh_mat_data.uv_channel_data
-                                )
-                            )
-                        else:
-                            new_material_data.append(skeletal_mesh_mat_data)
-
-                    asset.materials = new_material_data
-
-                    # My incredible hack to force dirty skeletal meshes....
-                    tmp = asset.get_editor_property("support_ray_tracing")
-                    asset.set_editor_property("support_ray_tracing", not tmp)
-                    asset.set_editor_property("support_ray_tracing", not tmp)
-
-                # save the asset
-                assets.save_asset(asset)
-                updated_assets.append(asset.get_outer().get_name())
-
-            print(f"Updated material assignments on the following assets:")
-            for entry in updated_assets:
-                print(f"\t{entry}")
+            scheduler.submit(materials.create_reference_replacement_task(
+                old_material, new_material_instance, on_complete=print_reference_report
+            ))
 
         # close tool UI (no longer needed)
-        found_editor_tools = assets.find_assets(
+        found_editor_tool = assets.find_asset(
             name="CreateFromMasterMaterial",
             exact_match=True,
             class_types=["EditorUtilityWidgetBlueprint"],
-            str_in_path="/MasterMaterialSystem/"
+            package_paths=["/MasterMaterialSystem"],
+            recursive_paths=False
         )
-        if found_editor_tools:
+        if found_editor_tool:
             widget_id = EditorUtilitySubsystem.register_tab_and_get_id(
                 unreal.EditorAssetLibrary.load_asset(
-                    found_editor_tools[0].package_name
+                    found_editor_tool.package_name
                 )
             )
             EditorUtilitySubsystem.unregister_tab_by_id(widget_id)
@@ -163,29 +156,77 @@ class PyMasterMaterialLibrary(unreal.BlueprintFunctionLibrary):
         print(f"Created {package_path} from {master_material_name}")
 
 
+    @unreal.ufunction(
+        static=True, ret=str,
+        pure=True, meta=dict(Category="Master Materials")
+    )
+    def get_task_progress():
+        """Python Blueprint Node -- describe the progress of the running background task, empty when idle"""
+        tasks = scheduler.get_scheduler().tasks
+        if not tasks:
+            return ""
+        task = tasks[0]
+        progress = f"{task.completed}/{task.total}" if task.total else f"{task.completed}"
+        queued = f" (+{len(tasks) - 1} queued)" if len(tasks) > 1 else ""
+        return f"{task.name}: {progress}{queued}"
+
+
+    @unreal.ufunction(
+        static=True,
+        meta=dict(Category="Master Materials")
+    )
+    def cancel_tasks():
+        """Python Blueprint Node -- cancel the background tasks, each stops after its current item"""
+        scheduler.get_scheduler().cancel_all()
+
+
+    @unreal.ufunction(
+        static=True, ret=unreal.Map(str, int),
+        meta=dict(Category="Master Materials")
+    )
+    def analyze_static_switch_permutations():
+        """Python Blueprint Node -- count the static switch permutations of each master material as {name: count}, the rare combinations are logged"""
+        reports = scheduler.run_with_dialog(permutations.create_analysis_task()) or []
+        permutations.log_permutation_report(reports)
+        return {report["master"]: report["permutations"] for report in reports}
+
+
+    @unreal.ufunction(
+        static=True, ret=str, params=[bool],
+        meta=dict(Category="Master Materials")
+    )
+    def set_trace_capture(enabled):
+        """Python Blueprint Node -- start or stop recording a trace, returns the exported trace file once stopped"""
+        if enabled:
+            tracing.start_capture()
+            return ""
+
+        trace_path = tracing.stop_capture()
+        return str(trace_path) if trace_path else ""
+
+
+    @unreal.ufunction(
+        static=True, ret=bool,
+        pure=True, meta=dict(Category="Master Materials")
+    )
+    def is_trace_capturing():
+        """Python Blueprint Node -- whether a trace is being recorded"""
+        return tracing.is_capturing()
+
+
     @unreal.ufunction(
         static=True, params=[str, unreal.Map(str, str)],
         meta=dict(Category="Master Materials")
     )
     def save_user_prefs(prefs_name, prefs_data):
         """Python Blueprint Node -- save some basic prefs data"""
-        prefs = {
+        user_prefs = {
             str(key): str(value)
             for key, value in prefs_data.items()
         }
 
-        # save to the project's Saved dir under pytemp
-        prefs_file = Path(
-            unreal.Paths.project_saved_dir(),
-            "pytemp",
-            f"unreal_prefs_{prefs_name}.json"
-        )
-
-        if not prefs_file.exists():
-            prefs_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with prefs_file.open("w", encoding="utf-8") as f:
-            json.dump(prefs, f, indent=2)
+        # saved to the project's Saved dir under pytemp once the widget stops saving
+        prefs.get_prefs_store().save(prefs_name, user_prefs)
 
 
     @unreal.ufunction(
@@ -195,17 +236,8 @@ class PyMasterMaterialLibrary(unreal.BlueprintFunctionLibrary):
     def load_user_prefs(prefs_name) :
         """Python Blueprint Node -- load some basic prefs data"""
 
-        # use the same path structure as the save and make sure it exists
-        prefs_file = Path(
-            unreal.Paths.project_saved_dir(),
-            "pytemp",
-            f"unreal_prefs_{prefs_name}.json"
-        )
-        if not prefs_file.exists():
-            return {}
-
         # we can return the dict as-is, Unreal will convert it to a Map(str,str) for us
-        return json.loads(prefs_file.read_text())
+        return prefs.get_prefs_store().load(prefs_name)
 
 
     @unreal.ufunction(
@@ -0,0 +1,276 @@
+import hashlib
+import json
+
+from master_materials import (
+    assets,
+    hierarchy,
+    materials,
+    scheduler,
+    tracing
+)
+
+from master_materials.unreal_systems import (
+    asset_registry,
+    EditorAssetLibrary
+)
+
+import unreal
+
+
+# The decimals float values are compared at, smaller differences do not show
+FLOAT_PRECISION = 6
+
+# The material instance properties which change how it renders besides its parameter values,
+# properties an engine version does not expose are skipped
+INSTANCE_PROPERTIES = [
+    "base_property_overrides",      # blend mode, shading model, two sided, opacity mask clip value, ...
+    "phys_material",
+    "override_subsurface_profile",
+    "subsurface_profile",
+    "static_parameters",            # static switches and static component masks
+    "font_parameter_values",
+    "runtime_virtual_texture_parameter_values",
+    "sparse_volume_texture_parameter_values",
+    "lightmass_settings",
+]
+
+
+def canonicalize_value(value):
+    """Convert a parameter value to a JSON value which is equal for equal parameter values"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), FLOAT_PRECISION)
+    if isinstance(value, (list, tuple)):
+        return [canonicalize_value(item) for item in value]
+    if hasattr(value, "get_path_name"):
+        return value.get_path_name()
+    if all(hasattr(value, channel) for channel in "rgba"):
+        return [round(float(getattr(value, channel)), FLOAT_PRECISION) for channel in "rgba"]
+    if hasattr(value, "export_text"):
+        # structs, e.g. the base property overrides, in the engine's text form
+        return value.export_text()
+    return str(value)
+
+
+def get_instance_properties(material_instance):
+    """
+    Get the INSTANCE_PROPERTIES of a material instance as JSON values
+
+    return:
+        dict: {property name: canonical value} of the properties the engine exposes
+    """
+    properties = dict()
+    for property_name in INSTANCE_PROPERTIES:
+        try:
+            value = material_instance.get_editor_property(property_name)
+        except Exception:
+            continue
+        properties[property_name] = canonicalize_value(value)
+    return properties
+
+
+def get_instance_hash(material_info):
+    """
+    Get the content hash of a material instance: its parent, the value of each of its parameters
+    and its INSTANCE_PROPERTIES (property overrides, physical material, subsurface profile, static
+    parameters, font / virtual texture parameters)
+
+    Values are read through MaterialParamInfo.get_parameter_value, an override set to the value it
+    inherits hashes the same as no override at all
+
+    parameters:
+        material_info (materials.MaterialParamInfo): the material instance
+
+    return:
+        str: the hex digest, equal for instances which render the same
+    """
+    parent = material_info.material.parent
+    content = {
+        "parent": parent.get_path_name() if parent else None,
+        "parameters": [
+            [
+                parameter,
+                material_info.get_parameter_type(parameter).__name__,
+                canonicalize_value(material_info.get_parameter_value(parameter))
+            ]
+            for parameter in material_info.get_parameter_names()
+        ],
+        "properties": get_instance_properties(material_info.material),
+    }
+    return hashlib.sha1(json.dumps(content, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def get_sibling_instances(package_paths=None):
+    """
+    Get the instances sharing a parent with another instance, from the hierarchy index
+
+    parameters:
+        package_paths (list(str)): only include instances in these content folders (and their sub folders)
+
+    return:
+        list(str): the object paths of the instances, grouped by parent
+    """
+    folders = [package_path.rstrip("/") + "/" for package_path in package_paths or []]
+    instance_paths = []
+    for parent_path, children in sorted(hierarchy.get_material_hierarchy().children.items()):
+        siblings = sorted(
+            child_path
+            for child_path in children
+            if not folders or child_path.startswith(tuple(folders))
+        )
+        if len(siblings) > 1:
+            instance_paths.extend(siblings)
+    return instance_paths
+
+
+def find_duplicate_instances(package_paths=None):
+    """
+    Group the material instances which have the same parent and parameter values
+
+    parameters:
+        package_paths (list(str)): only scan instances in these content folders
+
+    return:
+        list(list(str)): the object paths of each group of duplicates
+    """
+    return scheduler.run_now(create_scan_task(package_paths))
+
+
+def create_scan_task(package_paths=None, on_complete=None):
+    """
+    Get find_duplicate_instances() as a task, to time-slice it with scheduler.submit()
+    or run it behind a progress dialog with scheduler.run_with_dialog()
+
+    Only instances sharing a parent with another instance are loaded. Once cancelled, the
+    duplicates among the instances scanned so far are returned
+
+    return:
+        scheduler.Task: the task, its result is the list of duplicate groups
+    """
+    instance_paths = get_sibling_instances(package_paths)
+    return scheduler.Task(
+        "Scanning for duplicate material instances",
+        iter_scan(instance_paths),
+        total=len(instance_paths),
+        on_complete=on_complete
+    )
+
+
+def iter_scan(instance_paths):
+    """The steps of create_scan_task(), yielding after each instance"""
+    instances_by_hash = dict()
+    try:
+        for instance_path in instance_paths:
+            material_instance = unreal.load_asset(instance_path)
+            if isinstance(material_instance, unreal.MaterialInstanceConstant):
+                instance_hash = get_instance_hash(materials.MaterialParamInfo(material_instance))
+                instances_by_hash.setdefault(instance_hash, []).append(instance_path)
+            yield instance_path
+    except scheduler.TaskCancelled:
+        pass
+
+    return sorted(
+        sorted(group)
+        for group in instances_by_hash.values()
+        if len(group) > 1
+    )
+
+
+def get_referencers(object_path):
+    """Get the package names referencing the given asset, as str rather than the registry's unreal.Name"""
+    return [
+        str(package_name)
+        for package_name in asset_registry.get_referencers(
+            object_path.split(".", 1)[0],
+            unreal.AssetRegistryDependencyOptions()
+        ) or []
+    ]
+
+
+def choose_survivor(instance_paths):
+    """Pick the duplicate the others are consolidated into: the most referenced one, the fewest packages then change"""
+    return max(sorted(instance_paths), key=lambda instance_path: len(get_referencers(instance_path)))
+
+
+@tracing.traced
+def consolidate_duplicates(groups, save=True, dry_run=True):
+    """
+    Consolidate each group of duplicates into one survivor
+
+    The referencers of the other instances are retargeted to the survivor and the other instances
+    are deleted, the modified referencers are then saved in a single batch. Consolidating deletes
+    assets, by default only the report of what would be consolidated is returned
+
+    parameters:
+        groups (list(list(str))): the object paths of each group of duplicates, see find_duplicate_instances
+        save (bool): whether to save the modified referencers
+        dry_run (bool): if True, only report the survivors and the referencers which would be retargeted
+
+    return:
+        dict: {survivor path: {"duplicates": [consolidated paths], "referencers": [package names]}}
+    """
+    return scheduler.run_now(create_consolidation_task(groups, save, dry_run))
+
+
+def create_consolidation_task(groups, save=True, dry_run=True, on_complete=None):
+    """
+    Get consolidate_duplicates() as a task, each step consolidates one group
+
+    Once cancelled, the referencers modified so far are still saved and the remaining groups are left as they are
+
+    return:
+        scheduler.Task: the task, its result is the consolidate_duplicates() report
+    """
+    return scheduler.Task(
+        "Finding duplicate material instance survivors" if dry_run else "Consolidating duplicate material instances",
+        iter_consolidation(groups, save, dry_run),
+        total=len(groups),
+        on_complete=on_complete
+    )
+
+
+def iter_consolidation(groups, save, dry_run=True):
+    """The steps of create_consolidation_task(), yielding after each group"""
+    report = dict()
+    referencer_packages = set()
+    consolidated_packages = set()
+    try:
+        for group in groups:
+            survivor_path = choose_survivor(group)
+            duplicate_paths = [instance_path for instance_path in group if instance_path != survivor_path]
+            group_referencers = {
+                package_name
+                for duplicate_path in duplicate_paths
+                for package_name in get_referencers(duplicate_path)
+            }
+            group_report = {"duplicates": duplicate_paths, "referencers": sorted(group_referencers)}
+            if dry_run:
+                report[survivor_path] = group_report
+                yield survivor_path
+                continue
+
+            survivor = unreal.load_asset(survivor_path)
+            duplicates = [unreal.load_asset(duplicate_path) for duplicate_path in duplicate_paths]
+            if survivor and all(duplicates) and EditorAssetLibrary.consolidate_assets(survivor, duplicates):
+                report[survivor_path] = group_report
+                referencer_packages.update(group_referencers)
+                consolidated_packages.update(duplicate_path.split(".", 1)[0] for duplicate_path in duplicate_paths)
+            else:
+                unreal.log_warning(f"Could not consolidate the duplicates of {survivor_path}")
+            yield survivor_path
+    except scheduler.TaskCancelled:
+        pass
+
+    if save and not dry_run:
+        # the referencers were loaded to be retargeted, the deleted duplicates are not saved
+        assets.save_packages([
+            package
+            for package in (
+                unreal.load_package(package_name)
+                for package_name in sorted(referencer_packages - consolidated_packages)
+            )
+            if package
+        ])
+
+    return report
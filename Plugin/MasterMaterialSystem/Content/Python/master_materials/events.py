@@ -0,0 +1,49 @@
+import unreal
+
+
+def get_event_bridge():
+    """
+    Get the C++ event bridge which forwards native editor delegates to Python
+
+    return:
+        unreal.MasterMaterialSystemEvents: the event bridge, None if the plugin binaries predate it
+    """
+    if not hasattr(unreal.MasterMaterialSystemBPLibrary, "get_events"):
+        return None
+    return unreal.MasterMaterialSystemBPLibrary.get_events()
+
+
+def connect(event_name, callback):
+    """
+    Bind a Python callable to one of the event bridge's delegates
+
+    parameters:
+        event_name (str): the delegate name on the event bridge (on_asset_added, on_asset_removed, etc)
+        callback (callable): the function to call when the event is broadcast
+
+    return:
+        bool: whether the callback was bound
+    """
+    bridge = get_event_bridge()
+    if not bridge:
+        unreal.log_warning(
+            f"Master Material System event bridge is unavailable, `{event_name}` will not be tracked. "
+            f"Rebuild the MasterMaterialSystem plugin to enable it."
+        )
+        return False
+
+    getattr(bridge, event_name).add_callable(callback)
+    return True
+
+
+def disconnect(event_name, callback):
+    """
+    Unbind a Python callable from one of the event bridge's delegates
+
+    parameters:
+        event_name (str): the delegate name on the event bridge
+        callback (callable): the previously bound function
+    """
+    bridge = get_event_bridge()
+    if bridge:
+        getattr(bridge, event_name).remove_callable(callback)
@@ -0,0 +1,256 @@
+from master_materials import (
+    assets,
+    events,
+    tracing
+)
+
+import unreal
+
+
+# The Asset Registry tag holding a material instance's parent as "Class'/Path/To.Parent'"
+PARENT_TAG = "Parent"
+
+# The deepest parent chain followed, guards against cycles in stale registry data
+MAX_DEPTH = 100
+
+
+def parse_parent_tag(value):
+    """
+    Get the object path from a Parent tag value
+
+    parameters:
+        value (str): the raw tag value, "/Script/Engine.Material'/Game/M_Base.M_Base'" or a bare object path
+
+    return:
+        str: the parent's object path, None if the instance has no parent
+    """
+    value = str(value or "").strip()
+    if not value or value.lower() == "none":
+        return None
+    if value.endswith("'") and "'" in value[:-1]:
+        value = value[value.index("'") + 1:-1]
+    return value or None
+
+
+class MaterialHierarchyIndex:
+    """
+    Parent / child index of the material instances as {instance path: parent path}
+
+    The index is built from the Asset Registry's Parent tags without loading anything, and
+    kept current by its added / removed / renamed / updated events. Packages with unsaved
+    changes may have been reparented in memory, get_root() does not answer for them
+    """
+
+    def __init__(self):
+        self.parents = dict()       # {instance path: parent path}
+        self.children = dict()      # {parent path: set(instance path)}
+        self.dirty_packages = set()
+        self.is_bound = False
+
+    @tracing.traced
+    def build(self):
+        """(Re)build the index from the Asset Registry"""
+        self.parents = dict()
+        self.children = dict()
+        results = assets.find_assets(class_types=["MaterialInstanceConstant"])
+        for asset_data, metadata in zip(results, assets.get_metadata_table(results, [PARENT_TAG])):
+            self.set_parent(
+                f"{asset_data.package_name}.{asset_data.asset_name}",
+                parse_parent_tag(metadata[PARENT_TAG])
+            )
+
+    def bind_events(self):
+        """Keep the index current with the Asset Registry"""
+        if self.is_bound:
+            return
+        self.is_bound = all([
+            events.connect("on_asset_added", self.on_asset_added),
+            events.connect("on_asset_removed", self.on_asset_removed),
+            events.connect("on_asset_renamed", self.on_asset_renamed),
+            events.connect("on_asset_updated", self.on_asset_added),
+            events.connect("on_package_dirty", self.on_package_dirty),
+            events.connect("on_package_saved", self.on_package_clean),
+            events.connect("on_package_reloaded", self.on_package_clean),
+        ])
+
+    def set_parent(self, instance_path, parent_path):
+        """Set or remove (parent_path=None) the parent of the given instance"""
+        old_parent_path = self.parents.pop(instance_path, None)
+        if old_parent_path:
+            siblings = self.children.get(old_parent_path)
+            siblings.discard(instance_path)
+            if not siblings:
+                del self.children[old_parent_path]
+
+        if parent_path:
+            self.parents[instance_path] = parent_path
+            self.children.setdefault(parent_path, set()).add(instance_path)
+
+    def remove(self, instance_path):
+        """Drop the given instance, its own instances keep pointing at its path"""
+        self.set_parent(instance_path, None)
+
+    def get_parent(self, material_path):
+        """Get the object path of the given instance's parent, None for materials and unknown assets"""
+        return self.parents.get(material_path)
+
+    def get_ancestors(self, material_path):
+        """
+        Get the parent chain of the given instance
+
+        parameters:
+            material_path (str): the instance's object path
+
+        return:
+            list(str): the object paths from the direct parent up to the root
+        """
+        ancestors = []
+        parent_path = self.parents.get(material_path)
+        while parent_path and len(ancestors) < MAX_DEPTH:
+            ancestors.append(parent_path)
+            parent_path = self.parents.get(parent_path)
+        return ancestors
+
+    def get_root(self, material_path):
+        """
+        Get the material at the top of the given instance's parent chain
+
+        parameters:
+            material_path (str): the instance's object path
+
+        return:
+            str: the root's object path, the material_path itself for materials and unknown assets,
+                None if a package along the chain has unsaved changes
+        """
+        chain = [material_path] + self.get_ancestors(material_path)
+        if any(path.split(".", 1)[0] in self.dirty_packages for path in chain):
+            return None
+        return chain[-1]
+
+    def get_depth(self, material_path):
+        """Get the number of parents above the given instance, 0 for materials"""
+        return len(self.get_ancestors(material_path))
+
+    def get_children(self, material_path):
+        """Get the object paths of the instances directly parented to the given material"""
+        return sorted(self.children.get(material_path, set()))
+
+    def get_descendants(self, material_path):
+        """
+        Get every instance derived from the given material, directly or through other instances
+
+        parameters:
+            material_path (str): the material's object path
+
+        return:
+            dict: {instance path: depth below material_path}, direct children are at depth 1
+        """
+        descendants = dict()
+        to_visit = [(material_path, 0)]
+        while to_visit:
+            path, depth = to_visit.pop()
+            for child_path in self.children.get(path, ()):
+                if child_path not in descendants and child_path != material_path:
+                    descendants[child_path] = depth + 1
+                    to_visit.append((child_path, depth + 1))
+        return descendants
+
+    def get_instance_count(self, material_path):
+        """Get the number of instances derived from the given material"""
+        return len(self.get_descendants(material_path))
+
+    def get_instance_counts(self):
+        """
+        Get the number of instances derived from each root material
+
+        return:
+            dict: {root material path: instance count}
+        """
+        counts = dict()
+        for instance_path in self.parents:
+            root_path = ([instance_path] + self.get_ancestors(instance_path))[-1]
+            counts[root_path] = counts.get(root_path, 0) + 1
+        return counts
+
+    def on_asset_added(self, asset_data):
+        if self.is_material_instance(asset_data):
+            self.set_parent(
+                f"{asset_data.package_name}.{asset_data.asset_name}",
+                parse_parent_tag(asset_data.get_tag_value(PARENT_TAG))
+            )
+
+    def on_asset_removed(self, asset_data):
+        self.remove(f"{asset_data.package_name}.{asset_data.asset_name}")
+
+    def on_asset_renamed(self, asset_data, old_object_path):
+        self.remove(str(old_object_path))
+        self.on_asset_added(asset_data)
+
+    def on_package_dirty(self, package_name):
+        self.dirty_packages.add(str(package_name))
+
+    def on_package_clean(self, package_name):
+        self.dirty_packages.discard(str(package_name))
+
+    @staticmethod
+    def is_material_instance(asset_data):
+        """Check whether the given AssetData describes an unreal.MaterialInstanceConstant"""
+        return str(asset_data.asset_class_path.asset_name) == "MaterialInstanceConstant"
+
+
+_material_hierarchy = None
+
+
+def get_material_hierarchy():
+    """
+    Get the process-wide material hierarchy index, building it on first use
+
+    return:
+        MaterialHierarchyIndex: the material hierarchy index
+    """
+    global _material_hierarchy
+    if _material_hierarchy is None:
+        _material_hierarchy = MaterialHierarchyIndex()
+        _material_hierarchy.bind_events()
+        _material_hierarchy.build()
+    return _material_hierarchy
+
+
+def update_material_instance(material_instance):
+    """
+    Re-index a loaded instance, used when it is (re)parented before being saved
+
+    parameters:
+        material_instance (unreal.MaterialInstance): the instance to re-index
+    """
+    if _material_hierarchy is None:
+        return
+    parent = material_instance.parent
+    _material_hierarchy.set_parent(material_instance.get_path_name(), parent.get_path_name() if parent else None)
+
+
+def get_root_material(material_instance):
+    """
+    Get the unreal.Material at the top of a loaded instance's parent chain
+
+    The chain is walked through the loaded parents, a loaded instance keeps its parents loaded so
+    this is only a few property reads. The hierarchy index is only asked when the walk does not
+    end in a material and the index is already built, it is never built for this
+
+    parameters:
+        material_instance (unreal.MaterialInstance): the instance
+
+    return:
+        unreal.Material: the root material, None if the chain does not end in a material
+    """
+    material = material_instance
+    for x in range(MAX_DEPTH):
+        material = material.parent
+        if not material or isinstance(material, unreal.Material):
+            break
+    if isinstance(material, unreal.Material) or _material_hierarchy is None or not _material_hierarchy.is_bound:
+        return material
+
+    root_path = _material_hierarchy.get_root(material_instance.get_path_name())
+    root = (unreal.find_asset(root_path) or unreal.load_asset(root_path)) if root_path else None
+    return root if isinstance(root, unreal.Material) else material
@@ -0,0 +1,285 @@
+from contextlib import contextmanager
+
+from master_materials import (
+    assets,
+    constants,
+    events,
+    persistent_index,
+    tracing
+)
+
+from master_materials.unreal_systems import EditorAssetLibrary
+
+import unreal
+
+
+# The metadata read for every indexed master material
+METADATA_KEYS = [
+    constants.META_IS_MASTER_MATERIAL,
+    constants.META_MATERIAL_DISPLAY_NAME
+]
+
+
+class MasterMaterialEntry:
+    """A registered master material as known by the Asset Registry, or by the persistent index (asset_data=None)"""
+
+    def __init__(self, asset_data, display_name, object_path=""):
+        self.asset_data = asset_data
+        self.display_name = display_name
+        if asset_data is not None:
+            self.package_name = str(asset_data.package_name)
+            self.asset_name = str(asset_data.asset_name)
+            self.object_path = f"{self.package_name}.{self.asset_name}"
+        else:
+            self.package_name, self.asset_name = object_path.split(".", 1)
+            self.object_path = object_path
+
+    def get_asset(self):
+        """Load and return the unreal.Material"""
+        if self.asset_data is None:
+            return unreal.load_asset(self.object_path)
+        return self.asset_data.get_asset()
+
+
+class MasterMaterialIndex:
+    """
+    Process-wide index of the registered master materials as {package_name: MasterMaterialEntry}
+
+    The index is built from a single Asset Registry query and kept current by the
+    Asset Registry's added / removed / renamed / updated events. Every change is written
+    to the persistent index, which warm starts read instead of querying the Asset Registry.
+    Listeners are notified once per change, or once per batch_changes() block
+    """
+
+    def __init__(self):
+        self.entries = dict()
+        self.listeners = list()
+        self.batch_depth = 0
+        self.pending_changes = dict()   # {package_name: entry} gathered by batch_changes()
+        self.is_built = False
+        self.is_bound = False
+
+    @tracing.traced
+    def build(self):
+        """(Re)build the index from the Asset Registry"""
+        self.is_built = False
+        results = assets.find_assets(
+            metadata={constants.META_IS_MASTER_MATERIAL: True},
+            class_types=["Material"]
+        )
+        found = set()
+        with self.batch_changes():
+            for asset_data, metadata in zip(results, assets.get_metadata_table(results, METADATA_KEYS)):
+                if self.store(asset_data, metadata):
+                    found.add(str(asset_data.package_name))
+
+            for package_name in set(self.entries) - found:
+                self.set_entry(package_name, None)
+        self.is_built = True
+
+        persistent_index.get_persistent_index().set_master_materials(
+            (entry.package_name, entry.object_path, entry.display_name)
+            for entry in self.entries.values()
+        )
+
+    def load_persisted(self):
+        """
+        Fill the index from the persistent index, without querying the Asset Registry
+
+        return:
+            bool: whether the persistent index could be read, build() is needed otherwise
+        """
+        persisted = persistent_index.get_persistent_index().get_master_materials()
+        if not persisted:
+            return False
+
+        with self.batch_changes():
+            for package_name, object_path, display_name in persisted:
+                self.set_entry(package_name, MasterMaterialEntry(None, display_name, object_path))
+        return True
+
+    def add_listener(self, callback):
+        """
+        Call the given function whenever master materials are added, removed or renamed in the index
+
+        parameters:
+            callback (callable): called as callback(changes), changes is {package_name: entry},
+                entry is None when removed
+        """
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Stop notifying the given function of index changes"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def set_entry(self, package_name, entry):
+        """Set or remove (entry=None) the entry of the given package, notifying listeners of any change"""
+        old_entry = self.entries.pop(package_name, None)
+        if entry:
+            self.entries[package_name] = entry
+
+        changed = (
+            (old_entry is None) != (entry is None)
+            or (entry and old_entry.display_name != entry.display_name)
+        )
+        if self.is_built and (changed or (entry and old_entry.object_path != entry.object_path)):
+            persistent_index.get_persistent_index().set_master_material(
+                package_name,
+                entry.object_path if entry else None,
+                entry.display_name if entry else None
+            )
+        if changed:
+            self.pending_changes[package_name] = entry
+            if not self.batch_depth:
+                self.notify_listeners()
+
+    def notify_listeners(self):
+        """Send the pending changes to the listeners"""
+        changes, self.pending_changes = self.pending_changes, dict()
+        if changes:
+            for callback in list(self.listeners):
+                callback(changes)
+
+    @contextmanager
+    def batch_changes(self):
+        """
+        Notify the listeners once of every change made inside the block, when the outermost block ends
+
+            with master_material_index.batch_changes():
+                for material in materials:
+                    master_material_index.update_material(material)
+        """
+        self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+            if not self.batch_depth:
+                self.notify_listeners()
+
+    def bind_events(self):
+        """Keep the index current with the Asset Registry"""
+        if self.is_bound:
+            return
+        self.is_bound = all([
+            events.connect("on_asset_added", self.on_asset_added),
+            events.connect("on_asset_removed", self.on_asset_removed),
+            events.connect("on_asset_renamed", self.on_asset_renamed),
+            events.connect("on_asset_updated", self.on_asset_updated),
+        ])
+
+    def store(self, asset_data, metadata=None):
+        """
+        Add, update or drop the given asset based on its master material metadata
+
+        parameters:
+            asset_data (unreal.AssetData): the asset to index
+            metadata (dict): the asset's decoded METADATA_KEYS, read from asset_data if not provided
+
+        return:
+            MasterMaterialEntry: the indexed entry, None if the asset is not a master material
+        """
+        package_name = str(asset_data.package_name)
+        if str(asset_data.package_path).startswith("/Temp/"):
+            self.set_entry(package_name, None)
+            return None
+
+        metadata = metadata or assets.get_metadata_table([asset_data], METADATA_KEYS)[0]
+        if not metadata[constants.META_IS_MASTER_MATERIAL]:
+            self.set_entry(package_name, None)
+            return None
+
+        display_name = metadata[constants.META_MATERIAL_DISPLAY_NAME] or str(asset_data.asset_name)
+        entry = MasterMaterialEntry(asset_data, display_name)
+        self.set_entry(package_name, entry)
+        return entry
+
+    def update_material(self, material):
+        """
+        Re-index a loaded material, used when its metadata changes before it is saved
+
+        parameters:
+            material (unreal.Material): the material to re-index
+        """
+        self.update_materials([material])
+
+    def update_materials(self, materials):
+        """
+        Re-index many loaded materials, their metadata is read in one pass and listeners are notified once
+
+        parameters:
+            materials (list(unreal.Material)): the materials to re-index
+        """
+        asset_datas = [EditorAssetLibrary.find_asset_data(material.get_path_name()) for material in materials]
+        asset_datas = [asset_data for asset_data in asset_datas if asset_data and asset_data.is_valid()]
+        with self.batch_changes():
+            for asset_data, metadata in zip(asset_datas, assets.get_metadata_table(asset_datas, METADATA_KEYS)):
+                self.store(asset_data, metadata)
+
+    def get(self, package_name):
+        """Get the entry for the given package name"""
+        return self.entries.get(str(package_name))
+
+    def get_entries(self):
+        """
+        Get all indexed master materials
+
+        return:
+            list(MasterMaterialEntry): the master materials sorted by display name
+        """
+        return sorted(self.entries.values(), key=lambda entry: entry.display_name.lower())
+
+    def get_display_names(self):
+        """Get all indexed master materials as {package_name: display_name}"""
+        return {
+            package_name: entry.display_name
+            for package_name, entry in self.entries.items()
+        }
+
+    def on_asset_added(self, asset_data):
+        if self.is_material(asset_data):
+            self.store(asset_data)
+
+    def on_asset_removed(self, asset_data):
+        self.set_entry(str(asset_data.package_name), None)
+
+    def on_asset_renamed(self, asset_data, old_object_path):
+        self.set_entry(str(old_object_path).split(".", 1)[0], None)
+        if self.is_material(asset_data):
+            self.store(asset_data)
+
+    def on_asset_updated(self, asset_data):
+        if self.is_material(asset_data):
+            self.store(asset_data)
+
+    @staticmethod
+    def is_material(asset_data):
+        """Check whether the given AssetData describes an unreal.Material"""
+        return str(asset_data.asset_class_path.asset_name) == "Material"
+
+
+_master_material_index = None
+
+
+def get_master_material_index(build=True):
+    """
+    Get the process-wide master material index, building it on first use
+
+    parameters:
+        build (bool): if False, a new index is only filled from the persistent index (if it can be read)
+            and left for the next call with build=True to build
+
+    return:
+        MasterMaterialIndex: the master material index
+    """
+    global _master_material_index
+    if _master_material_index is None:
+        _master_material_index = MasterMaterialIndex()
+        _master_material_index.bind_events()
+        if not build:
+            _master_material_index.load_persisted()
+    if build and not _master_material_index.is_built:
+        _master_material_index.build()
+    return _master_material_index
@@ -0,0 +1,191 @@
+from collections import namedtuple
+
+from master_materials import (
+    events,
+    tracing
+)
+
+from master_materials.unreal_systems import EditorActorSubsystem
+
+import unreal
+
+
+# A material slot of a component placed in the level
+MaterialUsage = namedtuple("MaterialUsage", ["actor", "component", "slot"])
+
+
+def is_level_actor(actor):
+    """
+    Whether the actor is placed in the edited level or one of its streamed sublevels, the same
+    filter the level actor events apply: templates, transient actors (Sequencer spawnables, etc)
+    and the actors of preview scenes or PIE worlds are left out of the index
+    """
+    return unreal.MasterMaterialSystemBPLibrary.is_editor_level_actor(actor)
+
+
+class LevelMaterialIndex:
+    """
+    Index of the materials used in the current level as {material path: [MaterialUsage]}
+
+    The index is built in a single pass over the level's components and kept current by
+    the level actor added / deleted / modified events, it is rebuilt when a map is opened
+    """
+
+    def __init__(self):
+        self.usages = dict()            # {material path: [MaterialUsage]}
+        self.actors = dict()            # {actor path: actor}
+        self.actor_materials = dict()   # {actor path: set(material path)}
+        self.is_bound = False
+
+    @tracing.traced
+    def build(self):
+        """(Re)build the index from every component in the current level"""
+        self.usages = dict()
+        self.actors = dict()
+        self.actor_materials = dict()
+
+        skipped = set()   # actor paths
+        for component in EditorActorSubsystem.get_all_level_actors_components():
+            actor = component.get_owner()
+            if not isinstance(actor, unreal.Actor):
+                continue
+
+            actor_path = actor.get_path_name()
+            if actor_path in skipped:
+                continue
+            if actor_path not in self.actors and not is_level_actor(actor):
+                skipped.add(actor_path)
+                continue
+
+            self.add_actor(actor)
+            if isinstance(component, unreal.MeshComponent):
+                self.add_component(actor, actor_path, component)
+
+    def bind_events(self):
+        """Keep the index current with the level"""
+        if self.is_bound:
+            return
+        self.is_bound = all([
+            events.connect("on_level_actor_added", self.index_actor),
+            events.connect("on_level_actor_deleted", self.remove_actor),
+            events.connect("on_level_actor_modified", self.index_actor),
+            events.connect("on_map_opened", self.build),
+        ])
+
+    def add_actor(self, actor):
+        actor_path = actor.get_path_name()
+        if actor_path not in self.actors:
+            self.actors[actor_path] = actor
+            self.actor_materials[actor_path] = set()
+        return actor_path
+
+    def add_component(self, actor, actor_path, component):
+        """Record every material slot of the given mesh component"""
+        for slot, material in enumerate(component.get_materials()):
+            if not material:
+                continue
+            material_path = material.get_path_name()
+            self.usages.setdefault(material_path, []).append(MaterialUsage(actor, component, slot))
+            self.actor_materials[actor_path].add(material_path)
+
+    def index_actor(self, actor):
+        """(Re)index a single actor"""
+        if not actor:
+            return
+        self.remove_actor(actor)
+        if not is_level_actor(actor):
+            return
+        actor_path = self.add_actor(actor)
+        for component in actor.get_components_by_class(unreal.MeshComponent):
+            self.add_component(actor, actor_path, component)
+
+    def remove_actor(self, actor):
+        """Drop a single actor from the index"""
+        if not actor:
+            return
+        actor_path = actor.get_path_name()
+        self.actors.pop(actor_path, None)
+        for material_path in self.actor_materials.pop(actor_path, set()):
+            usages = [
+                usage
+                for usage in self.usages.get(material_path, [])
+                if usage.actor != actor
+            ]
+            if usages:
+                self.usages[material_path] = usages
+            else:
+                self.usages.pop(material_path, None)
+
+    def get_actors(self):
+        """
+        Get all actors in the level
+
+        return:
+            list(unreal.Actor): the actors sorted by path name
+        """
+        return [self.actors[actor_path] for actor_path in sorted(self.actors)]
+
+    def get_usages(self, material):
+        """
+        Get where the given material is placed in the level
+
+        parameters:
+            material (unreal.MaterialInterface or str): the material or its object path
+
+        return:
+            list(MaterialUsage): every (actor, component, slot) using the material
+        """
+        material_path = material if isinstance(material, str) else material.get_path_name()
+        return list(self.usages.get(material_path, []))
+
+    def get_actors_using(self, material):
+        """Get the actors using the given material, sorted by path name"""
+        actors = {usage.actor.get_path_name(): usage.actor for usage in self.get_usages(material)}
+        return [actors[actor_path] for actor_path in sorted(actors)]
+
+    def get_materials(self, actor):
+        """Get the object paths of the materials used by the given actor"""
+        return sorted(self.actor_materials.get(actor.get_path_name(), set()))
+
+    def replace_material(self, old_material, new_material):
+        """
+        Assign new_material to every slot in the level using old_material
+
+        parameters:
+            old_material (unreal.MaterialInterface): the material to replace
+            new_material (unreal.MaterialInterface): the material to assign instead
+
+        return:
+            list(unreal.Actor): the updated actors
+        """
+        usages = self.get_usages(old_material)
+        with unreal.ScopedEditorTransaction(f"Replace {old_material.get_name()} with {new_material.get_name()}"):
+            for usage in usages:
+                usage.component.modify()
+                usage.component.set_material(usage.slot, new_material)
+
+        updated_actors = list({usage.actor.get_path_name(): usage.actor for usage in usages}.values())
+        for actor in updated_actors:
+            self.index_actor(actor)
+        return updated_actors
+
+
+_level_material_index = None
+
+
+def get_level_material_index():
+    """
+    Get the level material usage index, building it on first use
+
+    return:
+        LevelMaterialIndex: the level material usage index
+    """
+    global _level_material_index
+    if _level_material_index is None:
+        _level_material_index = LevelMaterialIndex()
+        _level_material_index.build()
+        _level_material_index.bind_events()
+    elif not _level_material_index.is_bound:
+        # without level events the index can't be trusted to be current
+        _level_material_index.build()
+    return _level_material_index
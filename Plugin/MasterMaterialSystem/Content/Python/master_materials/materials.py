@@ -1,85 +1,448 @@
+from collections import OrderedDict
+
 from master_materials import (
     assets,
     constants,
-    menus
+    events,
+    hierarchy,
+    index,
+    persistent_index,
+    scheduler,
+    shader_updates,
+    tracing
 )
 
 from master_materials.unreal_systems import (
+    asset_registry,
     AssetTools,
     AssetEditorSubsystem,
-    EditorAssetSubsystem
+    EditorAssetSubsystem,
+    MaterialEditingLibrary
 )
 
 import unreal
 
 
-# Utility class to make material parameters more convenient to interact with
-class MaterialParamInfo:
-    material = None
-    parameters = dict()
-    nodes = dict()
+# Every final output of a material graph
+MATERIAL_PROPERTIES = [
+    getattr(unreal.MaterialProperty, attr_member)
+    for attr_member in dir(unreal.MaterialProperty)
+    if attr_member.startswith("MP_")
+]
 
-    def __init__(self, material):
-        self.material = material
-        self.is_material_instance = isinstance(material, unreal.MaterialInstance)
+# The number of parent material schemas kept in memory
+SCHEMA_CACHE_SIZE = 64
 
-        # Find the actual parent material if dealing with a Material Instance
-        self.parent_material = self.material
-        if self.is_material_instance:
-            for x in range(100):
-                self.parent_material = self.parent_material.parent
-                if isinstance(self.parent_material, unreal.Material):
-                    break
+# The number of material texture maps kept in memory
+TEXTURE_MAP_CACHE_SIZE = 256
 
-        self.populate_data()
+# The parameter data types by the name they are stored under in the persistent index
+PARAMETER_TYPES = {
+    "float": float,
+    "bool": bool,
+    "Texture": unreal.Texture,
+    "LinearColor": unreal.LinearColor
+}
+
+# The asset classes replace_material_references() can update
+REFERENCE_REPLACEMENT_CLASSES = ["StaticMesh", "SkeletalMesh"]
+
+# The number of referencing meshes a time-sliced reference replacement loads at once
+REFERENCE_LOAD_CHUNK_SIZE = 16
 
+
+class ParameterSchema:
+    """
+    The parameters of a parent material as {param_name: data_type} and {param_name: graph node}
+
+    A schema read from the persistent index only walks the material graph once its nodes are needed
+    """
+
+    def __init__(self, material, parameters=None, graph_stats=None):
+        self.material = material
+        self.parameters = dict()
+        self._nodes = None
+        self.graph_stats = dict()
+        if parameters is None:
+            self.populate_data()
+        else:
+            self.parameters = parameters
+            self.graph_stats = graph_stats or dict()
+
+    @property
+    def nodes(self):
+        """The {param_name: graph node} of the parameters, walking the material graph on first use"""
+        if self._nodes is None:
+            self.populate_data()
+        return self._nodes
+
+    @tracing.traced
     def populate_data(self):
         """Populate the data from the material graph"""
         self.parameters = dict()
-        self.nodes = dict()
+        self._nodes = dict()
 
         # collect parameters as {param_name: data_type}
         self.parameters = {
             str(item): float
             for item in
-            unreal.MaterialEditingLibrary.get_scalar_parameter_names(self.material)
+            MaterialEditingLibrary.get_scalar_parameter_names(self.material)
         } | {
             str(item): bool
             for item in
-            unreal.MaterialEditingLibrary.get_static_switch_parameter_names(self.material)
+            MaterialEditingLibrary.get_static_switch_parameter_names(self.material)
         } | {
             str(item): unreal.Texture
             for item in
-            unreal.MaterialEditingLibrary.get_texture_parameter_names(self.material)
+            MaterialEditingLibrary.get_texture_parameter_names(self.material)
         } | {
             str(item): unreal.LinearColor
             for item in
-            unreal.MaterialEditingLibrary.get_vector_parameter_names(self.material)
+            MaterialEditingLibrary.get_vector_parameter_names(self.material)
         }
 
-        # Loop through each final output node of the parent material
-        for attr_member in dir(unreal.MaterialProperty):
-            if attr_member.startswith("MP_"):
-                end_node = unreal.MaterialEditingLibrary.get_material_property_input_node(
-                    self.parent_material,
-                    getattr(unreal.MaterialProperty, attr_member)
-                )
-                self.walk_node(end_node)
+        # Walk up from every final output node of the material in a single pass,
+        # the outputs share most of their graph
+        end_nodes = [
+            MaterialEditingLibrary.get_material_property_input_node(self.material, material_property)
+            for material_property in MATERIAL_PROPERTIES
+        ]
+        self.graph_stats = self.walk_node(*end_nodes)
+
+    def walk_node(self, *nodes):
+        """
+        Walk up the node connections (end -> start) looking for param info
+
+        The walk is iterative and visits every node once, shared nodes (UVs, masks, etc)
+        are not explored again for each path leading to them
+
+        parameters:
+            nodes (unreal.MaterialExpression): the node(s) to start walking from
+
+        return:
+            dict: the number of {"nodes": int, "edges": int} walked
+        """
+        found_nodes = self.nodes
+        visited = set()
+        edge_count = 0
+        to_visit = [node for node in reversed(nodes) if node]
+
+        while to_visit:
+            node = to_visit.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+
+            # Register any parameter nodes that are found
+            if isinstance(node, unreal.MaterialExpressionParameter) or isinstance(node, unreal.MaterialExpressionTextureSampleParameter):
+                property_name = str(node.get_editor_property("parameter_name"))
+                if property_name not in found_nodes:
+                    found_nodes[property_name] = node
+
+            # Queue up the node chain
+            inputs = [
+                item
+                for item in MaterialEditingLibrary.get_inputs_for_material_expression(self.material, node)
+                if item
+            ]
+            edge_count += len(inputs)
+            to_visit.extend(item for item in reversed(inputs) if item not in visited)
+
+        return {"nodes": len(visited), "edges": edge_count}
+
+    def to_data(self):
+        """Get the parameters as {param_name: type_name} to store in the persistent index"""
+        type_names = {data_type: type_name for type_name, data_type in PARAMETER_TYPES.items()}
+        return {
+            parameter: type_names[data_type]
+            for parameter, data_type in self.parameters.items()
+        }
+
+    @classmethod
+    def from_data(cls, material, parameters, graph_stats):
+        """Create the schema of the given material from the parameters stored by to_data()"""
+        return cls(
+            material,
+            parameters={
+                parameter: PARAMETER_TYPES[type_name]
+                for parameter, type_name in parameters.items()
+            },
+            graph_stats=graph_stats
+        )
 
-    def walk_node(self, node):
-        """Walk up the node connection (end -> start) looking for param info"""
-        if not node:
+
+class ParameterSchemaCache:
+    """
+    LRU cache of ParameterSchema keyed by the parent material's package name
+
+    A schema is dropped as soon as its package is dirtied, its material recompiled
+    or the asset removed, so instances of the same master share a single graph walk.
+    Misses are looked up in the persistent index before walking the graph
+    """
+
+    def __init__(self, max_size=SCHEMA_CACHE_SIZE):
+        self.max_size = max_size
+        self.schemas = OrderedDict()
+        self.is_bound = False
+
+    def bind_events(self):
+        """Invalidate schemas when their material changes"""
+        if self.is_bound:
             return
+        self.is_bound = all([
+            events.connect("on_package_dirty", self.invalidate),
+            events.connect("on_material_compiled", self.on_material_compiled),
+            events.connect("on_asset_removed", self.on_asset_removed),
+        ])
+
+    def get(self, material):
+        """
+        Get the schema of the given parent material, walking its graph if it is not stored in memory or on disk
+
+        parameters:
+            material (unreal.Material): the parent material
+
+        return:
+            ParameterSchema: the material's parameter schema
+        """
+        package_name = material.get_outermost().get_path_name()
+        schema = self.schemas.get(package_name)
+        if schema:
+            self.schemas.move_to_end(package_name)
+            return schema
+
+        schema = self.load(material, package_name)
+        self.schemas[package_name] = schema
+        while len(self.schemas) > self.max_size:
+            self.schemas.popitem(last=False)
+        return schema
+
+    @staticmethod
+    def load(material, package_name):
+        """Read the schema from the persistent index, or walk the material graph and store the result"""
+        store = persistent_index.get_persistent_index()
+        stored = store.get_schema(package_name)
+        if stored:
+            try:
+                return ParameterSchema.from_data(material, *stored)
+            except KeyError:
+                pass
+
+        schema = ParameterSchema(material)
+        store.set_schema(package_name, schema.to_data(), schema.graph_stats)
+        return schema
+
+    def invalidate(self, package_name):
+        """Drop the schema of the given package"""
+        self.schemas.pop(str(package_name), None)
+
+    def clear(self):
+        self.schemas.clear()
+
+    def on_material_compiled(self, material):
+        if material:
+            self.invalidate(material.get_outermost().get_path_name())
+
+    def on_asset_removed(self, asset_data):
+        self.invalidate(asset_data.package_name)
+
+
+_schema_cache = None
+
+
+def get_parameter_schema(material):
+    """
+    Get the cached parameter schema of the given parent material
 
-        # Register any parameter nodes that are found
-        if isinstance(node, unreal.MaterialExpressionParameter) or isinstance(node, unreal.MaterialExpressionTextureSampleParameter):
-            property_name = str(node.get_editor_property("parameter_name"))
-            if property_name not in self.nodes:
-                self.nodes[property_name] = node
+    parameters:
+        material (unreal.Material): the parent material
+
+    return:
+        ParameterSchema: the material's parameter schema
+    """
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = ParameterSchemaCache()
+        _schema_cache.bind_events()
+    return _schema_cache.get(material)
+
+
+def build_texture_map(material):
+    """
+    Get the textures used by the given material
 
-        # Walk up the node chain
-        for item in unreal.MaterialEditingLibrary.get_inputs_for_material_expression(self.parent_material, node):
-            self.walk_node(item)
+    parameters:
+        material (unreal.MaterialInterface): the material to query for its texture data
+
+    return:
+        dict: {texture name: texture} for materials, {parameter: texture} for material instances
+    """
+    # For materials get the texture names
+    if isinstance(material, unreal.Material):
+        return {
+            texture.get_name(): texture
+            for texture in MaterialEditingLibrary.get_used_textures(material)
+        }
+
+    # For material instances get the parameter names
+    if isinstance(material, unreal.MaterialInstanceConstant):
+        return {
+            param: MaterialEditingLibrary.get_material_instance_texture_parameter_value(material, param)
+            for param in MaterialEditingLibrary.get_texture_parameter_names(material)
+        }
+
+    return dict()
+
+
+def get_material_packages(material):
+    """Get the package names of the given material and of each of its parents"""
+    package_names = []
+    for _ in range(100):
+        if not material:
+            break
+        package_names.append(material.get_outermost().get_path_name())
+        if not isinstance(material, unreal.MaterialInstance):
+            break
+        material = material.get_editor_property("parent")
+    return package_names
+
+
+class TextureMapCache:
+    """
+    LRU cache of material texture maps keyed by object path
+
+    An instance's textures include the values inherited from its parents, so each map is dropped
+    as soon as the package of its material or of any parent is dirtied, saved or reloaded
+    """
+
+    def __init__(self, max_size=TEXTURE_MAP_CACHE_SIZE):
+        self.max_size = max_size
+        self.texture_maps = OrderedDict()  # {object path: {name: texture}}
+        self.packages = dict()              # {object path: [package name]}
+        self.dependents = dict()            # {package name: set(object path)}
+        self.is_bound = False
+
+    def bind_events(self):
+        """Invalidate texture maps when their materials change"""
+        if self.is_bound:
+            return
+        self.is_bound = all([
+            events.connect("on_package_dirty", self.invalidate),
+            events.connect("on_package_saved", self.invalidate),
+            events.connect("on_package_reloaded", self.invalidate),
+            events.connect("on_asset_removed", self.on_asset_removed),
+        ])
+
+    def get(self, material):
+        """
+        Get the texture map of the given material, querying it on a cache miss
+
+        parameters:
+            material (unreal.MaterialInterface): the material to query for its texture data
+
+        return:
+            dict: a copy of the material's texture map
+        """
+        # without package events the cache can't be trusted to be current
+        if not self.is_bound:
+            return build_texture_map(material)
+
+        object_path = material.get_path_name()
+        texture_map = self.texture_maps.get(object_path)
+        if texture_map is not None:
+            self.texture_maps.move_to_end(object_path)
+            return dict(texture_map)
+
+        texture_map = build_texture_map(material)
+        self.texture_maps[object_path] = texture_map
+        self.packages[object_path] = get_material_packages(material)
+        for package_name in self.packages[object_path]:
+            self.dependents.setdefault(package_name, set()).add(object_path)
+        while len(self.texture_maps) > self.max_size:
+            self.remove(next(iter(self.texture_maps)))
+        return dict(texture_map)
+
+    def remove(self, object_path):
+        """Drop the texture map of the given material and its place in every dependents set"""
+        self.texture_maps.pop(object_path, None)
+        for package_name in self.packages.pop(object_path, []):
+            object_paths = self.dependents.get(package_name)
+            if object_paths is None:
+                continue
+            object_paths.discard(object_path)
+            if not object_paths:
+                del self.dependents[package_name]
+
+    def invalidate(self, package_name):
+        """Drop the texture maps depending on the given package"""
+        for object_path in list(self.dependents.get(str(package_name), [])):
+            self.remove(object_path)
+
+    def clear(self):
+        self.texture_maps.clear()
+        self.packages.clear()
+        self.dependents.clear()
+
+    def on_asset_removed(self, asset_data):
+        self.invalidate(asset_data.package_name)
+
+
+_texture_map_cache = None
+
+
+def get_texture_maps(materials):
+    """
+    Get the cached texture maps of many materials at once
+
+    parameters:
+        materials (list(unreal.MaterialInterface)): the materials to query for their texture data
+
+    return:
+        list(dict): a texture map per material, in the same order (see build_texture_map)
+    """
+    global _texture_map_cache
+    if _texture_map_cache is None:
+        _texture_map_cache = TextureMapCache()
+        _texture_map_cache.bind_events()
+    return [_texture_map_cache.get(material) for material in materials]
+
+
+def get_texture_map(material):
+    """Get the cached texture map of the given material (see build_texture_map)"""
+    return get_texture_maps([material])[0]
+
+
+# Utility class to make material parameters more convenient to interact with
+class MaterialParamInfo:
+    material = None
+    parameters = dict()
+    graph_stats = dict()
+
+    def __init__(self, material):
+        self.material = material
+        self.is_material_instance = isinstance(material, unreal.MaterialInstance)
+
+        # Find the actual parent material if dealing with a Material Instance
+        self.parent_material = self.material
+        if self.is_material_instance:
+            self.parent_material = hierarchy.get_root_material(self.material)
+
+        self.populate_data()
+
+    def populate_data(self):
+        """Populate the data from the parent material's (cached) parameter schema"""
+        self.schema = get_parameter_schema(self.parent_material)
+        self.parameters = self.schema.parameters
+        self.graph_stats = self.schema.graph_stats
+
+    @property
+    def nodes(self):
+        """The parent material's {param_name: graph node}, the graph is only walked once nodes are needed"""
+        return self.schema.nodes
+
+    def walk_node(self, *nodes):
+        """Walk up the parent material's node connections (end -> start) looking for param info"""
+        return self.schema.walk_node(*nodes)
 
     def get_node(self, parameter):
         """Get the graph node for the given parameter"""
@@ -103,28 +466,32 @@ class MaterialParamInfo:
 
         if self.is_material_instance:
             if node_type == float:
-                return unreal.MaterialEditingLibrary.get_material_instance_scalar_parameter_value(self.material, parameter)
+                return MaterialEditingLibrary.get_material_instance_scalar_parameter_value(self.material, parameter)
             elif node_type == bool:
-                return unreal.MaterialEditingLibrary.get_material_instance_static_switch_parameter_value(self.material, parameter)
+                return MaterialEditingLibrary.get_material_instance_static_switch_parameter_value(self.material, parameter)
             elif node_type == unreal.Texture:
-                return unreal.MaterialEditingLibrary.get_material_instance_texture_parameter_value(self.material, parameter)
+                return MaterialEditingLibrary.get_material_instance_texture_parameter_value(self.material, parameter)
             elif node_type == unreal.LinearColor:
-                return unreal.MaterialEditingLibrary.get_material_instance_vector_parameter_value(self.material, parameter)
+                return MaterialEditingLibrary.get_material_instance_vector_parameter_value(self.material, parameter)
         else:
             if node_type == float:
-                return unreal.MaterialEditingLibrary.get_material_default_scalar_parameter_value(self.parent_material, parameter)
+                return MaterialEditingLibrary.get_material_default_scalar_parameter_value(self.parent_material, parameter)
             elif node_type == bool:
-                return unreal.MaterialEditingLibrary.get_material_default_static_switch_parameter_value(self.parent_material, parameter)
+                return MaterialEditingLibrary.get_material_default_static_switch_parameter_value(self.parent_material, parameter)
             elif node_type == unreal.Texture:
-                return unreal.MaterialEditingLibrary.get_material_default_texture_parameter_value(self.parent_material, parameter)
+                return MaterialEditingLibrary.get_material_default_texture_parameter_value(self.parent_material, parameter)
             elif node_type == unreal.LinearColor:
-                return unreal.MaterialEditingLibrary.get_material_default_vector_parameter_value(self.parent_material, parameter)
+                return MaterialEditingLibrary.get_material_default_vector_parameter_value(self.parent_material, parameter)
 
     def set_parameter_value(self, parameter, value):
-        """Set the value of the given parameter"""
+        """
+        Set the value of the given parameter
+
+        Inside a ParameterEditBatch the save and editor refresh are deferred until the batch ends
+        """
 
-        # convert ints to floats if needed
-        if isinstance(value, int):
+        # convert ints to floats if needed (bools are ints too)
+        if isinstance(value, int) and not isinstance(value, bool):
             value = float(value)
 
         if not isinstance(value, self.get_parameter_type(parameter)):
@@ -139,18 +506,16 @@ class MaterialParamInfo:
         # handle Material Instances
         if self.is_material_instance:
             if node_type == float:
-                unreal.MaterialEditingLibrary.set_material_instance_scalar_parameter_value(self.material, parameter, value)
+                MaterialEditingLibrary.set_material_instance_scalar_parameter_value(self.material, parameter, value)
             elif node_type == bool:
-                unreal.MaterialEditingLibrary.set_material_instance_static_switch_parameter_value(self.material, parameter, value)
+                MaterialEditingLibrary.set_material_instance_static_switch_parameter_value(self.material, parameter, value)
             elif node_type == unreal.Texture:
-                unreal.MaterialEditingLibrary.set_material_instance_texture_parameter_value(self.material, parameter, value)
+                MaterialEditingLibrary.set_material_instance_texture_parameter_value(self.material, parameter, value)
             elif node_type == unreal.LinearColor:
-                unreal.MaterialEditingLibrary.set_material_instance_vector_parameter_value(self.material, parameter, value)
+                MaterialEditingLibrary.set_material_instance_vector_parameter_value(self.material, parameter, value)
             else:
                 raise ValueError(f"Unhandled type {node_type} for parameter {parameter} on {self.material}")
 
-            EditorAssetSubsystem.save_loaded_asset(self.material)
-
         # handle normal materials
         else:
             node = self.nodes.get(parameter)
@@ -158,21 +523,94 @@ class MaterialParamInfo:
                 node.set_editor_property("texture", value)
             else:
                 node.set_editor_property("default_value", value)
-            EditorAssetSubsystem.save_loaded_asset(self.parent_material)
 
+        if _edit_batches:
+            _edit_batches[0].add(self)
+        else:
+            self.commit_changes()
+
+    def set_parameter_values(self, values, save=True):
+        """
+        Set many parameter values with a single save and editor refresh
+
+        parameters:
+            values (dict): the {parameter: value} pairs to set
+            save (bool): whether to save the asset once all values are set
+        """
+        with ParameterEditBatch(save=save):
+            for parameter, value in values.items():
+                self.set_parameter_value(parameter, value)
+
+    def get_edited_asset(self):
+        """Get the asset parameter changes are written to"""
+        return self.material if self.is_material_instance else self.parent_material
+
+    @tracing.traced
+    def commit_changes(self, save=True):
+        """Save the edited asset and queue the refresh of its editor window and shaders"""
+        if save:
+            EditorAssetSubsystem.save_loaded_asset(self.get_edited_asset())
         self.refresh_editor_window()
 
+    @tracing.traced
     def refresh_editor_window(self):
-        """Refresh the editor window if the material or its parent is currently open in the Editor"""
-        if AssetEditorSubsystem.close_all_editors_for_asset(self.material):
-            AssetEditorSubsystem.open_editor_for_assets([self.material])
+        """
+        Queue the update of the edited asset's shaders and of its editor window if it is open
 
-        if self.is_material_instance:
-            unreal.MaterialEditingLibrary.update_material_instance(self.material)
-        else:
-            unreal.MaterialEditingLibrary.recompile_material(self.parent_material)
+        The updates of every edited material are coalesced and applied on the next editor tick,
+        or at the end of the outermost ParameterEditBatch / shader_updates.deferred() block
+        """
+        shader_updates.mark_dirty(self.get_edited_asset())
+
+
+# the ParameterEditBatch stack, edits are committed by the outermost batch
+_edit_batches = list()
 
 
+class ParameterEditBatch:
+    """
+    Gather parameter edits and commit them once per touched asset:
+    one save, one editor refresh and one update / recompile
+
+    The shader updates are held until the outermost batch ends, then flushed together
+
+        with materials.ParameterEditBatch():
+            for parameter, value in values.items():
+                material_info.set_parameter_value(parameter, value)
+
+    Nested batches are merged into the outermost one
+    """
+
+    def __init__(self, save=True):
+        self.save = save
+        self.touched = dict()  # {asset path: MaterialParamInfo}
+
+    def __enter__(self):
+        _edit_batches.append(self)
+        shader_updates.get_shader_updates().hold()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _edit_batches.remove(self)
+        # edits are applied as they are made, commit them even if the batch was interrupted
+        try:
+            self.commit()
+        finally:
+            shader_updates.get_shader_updates().release()
+        return False
+
+    def add(self, material_info):
+        """Track an asset edited through the given MaterialParamInfo"""
+        self.touched.setdefault(material_info.get_edited_asset().get_path_name(), material_info)
+
+    def commit(self):
+        """Save and refresh every touched asset once"""
+        touched, self.touched = self.touched, dict()
+        for material_info in touched.values():
+            material_info.commit_changes(save=self.save)
+
+
+@tracing.traced
 def create_new_material_instance(destination_folder, master_material, asset_name=None, target_material=None, should_save=True, should_open=True):
     """
     Create a new material instance based on a master material
@@ -198,7 +636,8 @@ def create_new_material_instance(destination_folder, master_material, asset_name
     )
     if not new_material_instance:
         raise RuntimeError(f"Something went wrong here.... sigh.")
-    unreal.MaterialEditingLibrary.set_material_instance_parent(new_material_instance, master_material)
+    MaterialEditingLibrary.set_material_instance_parent(new_material_instance, master_material)
+    hierarchy.update_material_instance(new_material_instance)
 
     if should_save:
         assets.save_asset(new_material_instance)
@@ -209,34 +648,289 @@ def create_new_material_instance(destination_folder, master_material, asset_name
     return new_material_instance
 
 
-def generate_new_master_material_instance_name(destination_folder, master_material, target_material=None):
+@tracing.traced
+def replace_material_references(old_material, new_material, save=True):
     """
-    Generate a unique name based on the provided Master Material. If a target material is provided it
-    will be incorporated in the new name
+    Replace the references to a material on the Static and Skeletal Meshes using it
+
+    Referencers are filtered by class from Asset Registry data before anything is loaded,
+    the meshes are then loaded in one bulk prefetch and saved in a single batch
+
+    parameters:
+        old_material (unreal.MaterialInterface): the material to replace
+        new_material (unreal.MaterialInterface): the material to assign instead
+        save (bool): whether to save the modified meshes
+
+    return:
+        dict: {"updated": [package names], "skipped": {class name: [package names]}}
+    """
+    return scheduler.run_now(
+        create_reference_replacement_task(old_material, new_material, save, load_chunk_size=0)
+    )
+
+
+def create_reference_replacement_task(old_material, new_material, save=True, on_complete=None,
+                                      load_chunk_size=REFERENCE_LOAD_CHUNK_SIZE):
+    """
+    Get replace_material_references() as a task, to time-slice it with scheduler.submit()
+    or run it behind a progress dialog with scheduler.run_with_dialog()
+
+    Each step updates one mesh. Once cancelled, the meshes updated so far are still saved
+    and reported, the others are left untouched and reported as "cancelled"
+
+    parameters:
+        old_material (unreal.MaterialInterface): the material to replace
+        new_material (unreal.MaterialInterface): the material to assign instead
+        save (bool): whether to save the modified meshes
+        on_complete (callable): called as on_complete(task) once the task is finished
+        load_chunk_size (int): the number of meshes loaded at once, 0 loads them all together
+
+    return:
+        scheduler.Task: the task, its result is the replace_material_references() report
+    """
+    report = {"updated": [], "skipped": {}}
+
+    referencer_packages = asset_registry.get_referencers(
+        old_material.get_package().get_path_name(),
+        unreal.AssetRegistryDependencyOptions()
+    ) or []
+
+    # Sort the referencers by class without loading them
+    meshes_data = []
+    if referencer_packages:
+        for asset_data in asset_registry.get_assets(unreal.ARFilter(package_names=referencer_packages)) or []:
+            class_name = str(asset_data.asset_class_path.asset_name)
+            if class_name in REFERENCE_REPLACEMENT_CLASSES:
+                meshes_data.append(asset_data)
+            else:
+                report["skipped"].setdefault(class_name, []).append(str(asset_data.package_name))
+
+    return scheduler.Task(
+        f"Replacing {old_material.get_name()} with {new_material.get_name()}",
+        iter_reference_replacement(old_material, new_material, meshes_data, report, save, load_chunk_size),
+        total=len(meshes_data),
+        on_complete=on_complete
+    )
+
+
+def iter_reference_replacement(old_material, new_material, meshes_data, report, save, load_chunk_size):
+    """The steps of create_reference_replacement_task(), yielding after each mesh"""
+    modified_packages = []
+    processed_count = 0
+    chunk_size = load_chunk_size or len(meshes_data) or 1
+    try:
+        for chunk_start in range(0, len(meshes_data), chunk_size):
+            chunk = meshes_data[chunk_start:chunk_start + chunk_size]
+            for asset_data, mesh in zip(chunk, assets.load_assets(chunk)):
+                if replace_mesh_material(mesh, old_material, new_material):
+                    modified_packages.append(mesh.get_package())
+                    report["updated"].append(mesh.get_package().get_path_name())
+                processed_count += 1
+                yield str(asset_data.package_name)
+    except scheduler.TaskCancelled:
+        report["cancelled"] = [str(asset_data.package_name) for asset_data in meshes_data[processed_count:]]
+
+    if save:
+        assets.save_packages(modified_packages)
+
+    return report
+
+
+def replace_mesh_material(mesh, old_material, new_material):
+    """
+    Assign new_material to every slot of the given mesh using old_material
+
+    parameters:
+        mesh (unreal.StaticMesh or unreal.SkeletalMesh): the mesh to update
+        old_material (unreal.MaterialInterface): the material to replace
+        new_material (unreal.MaterialInterface): the material to assign instead
+
+    return:
+        bool: whether the mesh was modified
+    """
+    # Update Static Meshes:
+    if isinstance(mesh, unreal.StaticMesh):
+        material_indices = [
+            material_index
+            for material_index, static_material in enumerate(mesh.static_materials)
+            if static_material.material_interface == old_material
+        ]
+        if material_indices:
+            mesh.modify()
+        for material_index in material_indices:
+            mesh.set_material(material_index, new_material)
+        return bool(material_indices)
+
+    # Update Skeletal Meshes:
+    if isinstance(mesh, unreal.SkeletalMesh):
+        new_material_data = []
+        changed = False
+        for skeletal_mesh_mat_data in mesh.materials:
+            if skeletal_mesh_mat_data.material_interface == old_material:
+                changed = True
+                new_material_data.append(
+                    unreal.SkeletalMaterial(
+                        new_material,
+                        skeletal_mesh_mat_data.material_slot_name,
+                        skeletal_mesh_mat_data.uv_channel_data
+                    )
+                )
+            else:
+                new_material_data.append(skeletal_mesh_mat_data)
+
+        if not changed:
+            return False
+
+        # modify() marks the package dirty so it is picked up by the batch save
+        mesh.modify()
+        mesh.materials = new_material_data
+        return True
+
+    return False
+
+
+def get_master_material_instance_base_name(master_material, target_material=None):
+    """
+    Get the name of a new MI based on the provided Master Material, before any uniqueness suffix
 
     parameters:
-        destination_folder (str): the Content Browser folder to place the new material
         master_material (unreal.Material): the master material to create a MI name based on
         target_material (unreal.MaterialInterface): If provided, a target material to incorporate in the name
 
     return:
-        str: a unique name to use for the new MI
+        str: the base name of the new MI
     """
-    # Get the master material name (or reuse
+    # Get the master material name (or reuse the asset name)
     master_material_name = assets.get_metadata(master_material, constants.META_MATERIAL_DISPLAY_NAME)
     if not master_material_name:
-        master_material_name = master_material_name.get_name().split("M_", 1)[-1].split("MI_", 1)[-1]
+        master_material_name = master_material.get_name().split("M_", 1)[-1].split("MI_", 1)[-1]
 
-    new_name = None
     if target_material:
         old_name = target_material.get_name().split("M_", 1)[-1].split("MI_", 1)[-1]
-        new_name = f"MI_{master_material_name}_{old_name}".replace(" ", "_")
-    else:
-        new_name = f"MI_{master_material_name}".replace(" ", "_")
+        return f"MI_{master_material_name}_{old_name}".replace(" ", "_")
+
+    return f"MI_{master_material_name}".replace(" ", "_")
+
+
+def generate_new_master_material_instance_name(destination_folder, master_material, target_material=None):
+    """
+    Generate a unique name based on the provided Master Material. If a target material is provided it
+    will be incorporated in the new name
+
+    parameters:
+        destination_folder (str): the Content Browser folder to place the new material
+        master_material (unreal.Material): the master material to create a MI name based on
+        target_material (unreal.MaterialInterface): If provided, a target material to incorporate in the name
 
+    return:
+        str: a unique name to use for the new MI
+    """
+    new_name = get_master_material_instance_base_name(master_material, target_material)
     new_asset_path = f"{destination_folder}/{new_name}"
     return AssetTools.create_unique_asset_name(new_asset_path, "")[1]
 
+
+class InstanceNameAllocator:
+    """
+    Hand out unique asset names in a destination folder
+
+    The folder's existing asset names are read once, every name handed out is reserved
+    so names can't collide within a batch before its assets are saved
+    """
+
+    def __init__(self, destination_folder):
+        self.destination_folder = destination_folder.rstrip("/")
+        self.taken = {
+            str(asset_data.asset_name).lower()
+            for asset_data in asset_registry.get_assets_by_path(self.destination_folder, recursive=False) or []
+        }
+        self.next_suffix = dict()  # {base name: next numeric suffix to try}
+
+    def allocate(self, base_name):
+        """
+        Reserve a unique name for the given base name
+
+        parameters:
+            base_name (str): the preferred name
+
+        return:
+            str: base_name, or base_name with the lowest free numeric suffix
+        """
+        name = base_name
+        key = base_name.lower()
+        if key in self.taken:
+            suffix = self.next_suffix.get(key, 1)
+            while f"{key}_{suffix}" in self.taken:
+                suffix += 1
+            name = f"{base_name}_{suffix}"
+            self.next_suffix[key] = suffix + 1
+
+        self.taken.add(name.lower())
+        return name
+
+
+def allocate_master_material_instance_names(destination_folder, material_pairs):
+    """
+    Generate unique MI names for many (master material, target material) pairs at once
+
+    parameters:
+        destination_folder (str): the Content Browser folder to place the new materials
+        material_pairs (list(tuple)): (master_material, target_material or None) pairs
+
+    return:
+        list(str): a unique name per pair, in the same order
+    """
+    allocator = InstanceNameAllocator(destination_folder)
+
+    # the master material part of the name only needs to be read once per master
+    master_names = dict()
+    names = []
+    for master_material, target_material in material_pairs:
+        master_path = master_material.get_path_name()
+        if master_path not in master_names:
+            master_names[master_path] = get_master_material_instance_base_name(master_material)
+
+        base_name = master_names[master_path]
+        if target_material:
+            old_name = target_material.get_name().split("M_", 1)[-1].split("MI_", 1)[-1]
+            base_name = f"{base_name}_{old_name}".replace(" ", "_")
+
+        names.append(allocator.allocate(base_name))
+
+    return names
+
+def get_default_display_name(material):
+    """
+    Get the master material display name generated from a material's name:
+    any M_ prefix and the redundant "material" / "master" words are removed
+
+    parameters:
+        material (unreal.Material): the material to name
+
+    return:
+        str: the display name, e.g. "Foliage" for "M_Master_Foliage_Material"
+    """
+    display_name = str(material.get_name()).split("M_", 1)[-1]
+    replacements = [
+        ["material", ""],
+        ["master", ""],
+        ["__", "_"]
+    ]
+
+    # remove redundancies from the default name
+    for old_text, new_text in replacements:
+        while True:
+            if old_text in display_name.lower():
+                from_index = display_name.lower().index(old_text)
+                to_index = len(old_text) + from_index
+                display_name = new_text.join([display_name[:from_index], display_name[to_index:]])
+            else:
+                break
+
+    # fix any underscores at either end
+    return display_name.lstrip("_").rstrip("_")
+
+
 def register_master_material(material, display_name=""):
     """
     Register the given material in the Master Material System
@@ -249,7 +943,7 @@ def register_master_material(material, display_name=""):
 
     assets.set_metadata(material, constants.META_IS_MASTER_MATERIAL, True)
     assets.set_metadata(material, constants.META_MATERIAL_DISPLAY_NAME, display_name)
-    menus.setup_menus()
+    index.get_master_material_index().update_material(material)
 
 
 def unregister_master_material(material):
@@ -260,4 +954,65 @@ def unregister_master_material(material):
         material (unreal.Material): the master material to unregister
     """
     assets.set_metadata(material, constants.META_IS_MASTER_MATERIAL, False)
-    menus.setup_menus()
+    index.get_master_material_index().update_material(material)
+
+
+@tracing.traced
+def register_master_materials(materials, display_names=None, save=True):
+    """
+    Register many materials in the Master Material System at once: their metadata is set, the
+    index and menus are updated once and the packages are saved in a single batch
+
+    parameters:
+        materials (list(unreal.Material)): the master materials to register
+        display_names (dict): {material path: display name}, the other materials keep the display
+            name they were previously registered with or get get_default_display_name()
+        save (bool): whether to save the materials
+
+    return:
+        dict: {material path: display name} of the registered materials
+    """
+    display_names = display_names or dict()
+    registered = dict()
+    for material in materials:
+        material_path = material.get_path_name()
+        display_name = (
+            display_names.get(material_path)
+            or assets.get_metadata(material, constants.META_MATERIAL_DISPLAY_NAME)
+            or get_default_display_name(material)
+        )
+        assets.set_metadata(material, constants.META_IS_MASTER_MATERIAL, True)
+        assets.set_metadata(material, constants.META_MATERIAL_DISPLAY_NAME, display_name)
+        registered[material_path] = display_name
+
+    index.get_master_material_index().update_materials(materials)
+    if save:
+        assets.save_packages([material.get_package() for material in materials])
+    return registered
+
+
+def register_master_materials_in_folders(package_paths, save=True):
+    """
+    Register every material of the given content folders (and their sub folders) which is not
+    a master material yet, see register_master_materials
+
+    parameters:
+        package_paths (list(str)): the content folders, e.g. ["/Game/Materials/Masters"]
+        save (bool): whether to save the materials
+
+    return:
+        dict: {material path: display name} of the newly registered materials
+    """
+    results = assets.find_assets(class_types=["Material"], package_paths=package_paths)
+    unregistered = [
+        asset_data
+        for asset_data, metadata in zip(
+            results, assets.get_metadata_table(results, [constants.META_IS_MASTER_MATERIAL])
+        )
+        if not metadata[constants.META_IS_MASTER_MATERIAL]
+        and not str(asset_data.package_path).startswith("/Temp/")
+    ]
+    return register_master_materials(
+        [material for material in assets.load_assets(unregistered) if material],
+        save=save
+    )
@@ -2,7 +2,9 @@
 from master_materials import(
     constants,
     assets,
-    materials
+    index,
+    materials,
+    tracing
 )
 
 from master_materials.unreal_systems import EditorUtilitySubsystem
@@ -107,25 +109,7 @@ class ToggleMasterMaterial(PythonMenuTool):
 
             # Generate a default name -- removes any M_ prefixes and redundant words
             if not display_name:
-                display_name = str(self.material.get_name()).split("M_", 1)[-1]
-                replacements = [
-                    ["material", ""],
-                    ["master", ""],
-                    ["__", "_"]
-                ]
-
-                # remove redundancies from the default name
-                for old_text, new_text in replacements:
-                    while True:
-                        if old_text in display_name.lower():
-                            from_index = display_name.lower().index(old_text)
-                            to_index = len(old_text) + from_index
-                            display_name = new_text.join([display_name[:from_index], display_name[to_index:]])
-                        else:
-                            break
-
-                # fix any underscores at either end
-                display_name = display_name.lstrip("_").rstrip("_")
+                display_name = materials.get_default_display_name(self.material)
 
             # Pop up message for the user to name this master material
             user_input = unreal.new_object(UserInputField)
@@ -168,24 +152,67 @@ class ToggleMasterMaterial(PythonMenuTool):
         return True
 
 
+@unreal.uclass()
+class RegisterMasterMaterials(PythonMenuTool):
+    name = "RegisterMasterMaterials"
+    display_name = "Register Master Materials"
+    tool_tip = "Register every selected material as a Master Material, named from its asset name"
+
+    @unreal.ufunction(override=True)
+    def get_label(self, context):
+        return f"Register {len(self.get_unregistered_assets(context))} Master Materials"
+
+    @unreal.ufunction(override=True)
+    def execute(self, context):
+        selected_materials = [material for material in assets.load_assets(self.get_unregistered_assets(context)) if material]
+        registered = materials.register_master_materials(selected_materials)
+        unreal.log(f"Registered {len(registered)} master material(s): {', '.join(sorted(registered.values()))}")
+
+    @unreal.ufunction(override=True)
+    def can_execute(self, context) -> bool:
+        return bool(self.get_unregistered_assets(context))
+
+    @staticmethod
+    def get_unregistered_assets(context):
+        """
+        Get the selected materials which are not master materials yet, without loading them
+
+        return:
+            list(unreal.AssetData): the materials, empty unless several assets are selected
+        """
+        content_browser_context = context.find_by_class(unreal.ContentBrowserAssetContextMenuContext)
+        if not content_browser_context or len(content_browser_context.selected_assets) < 2:
+            return []
+        return [
+            asset_data
+            for asset_data in content_browser_context.selected_assets
+            if unreal.MathLibrary.class_is_child_of(asset_data.get_class(), unreal.Material)
+            and not assets.get_metadata(asset_data, constants.META_IS_MASTER_MATERIAL)
+        ]
+
+
 @unreal.uclass()
 class ApplyMasterMaterial(PythonMenuTool):
     tool_name = "<Material Name>"
     tool_display_name = "<Display Name>"
-    material = unreal.uproperty(unreal.Material)
+    material_path = unreal.uproperty(str)
     display_name = unreal.uproperty(str)
 
-    def __init__(self, material, menu=None, section="", insert_policy=None):
+    def __init__(self, master_material, menu=None, section="", insert_policy=None):
+        """
+        initialize this entry from Asset Registry data, the master material itself is only loaded on execute
+
+        parameters:
+            master_material (index.MasterMaterialEntry): the indexed master material
+            menu: the menu object to add this tool to
+            section: the section to group this tool under
+            insert_policy: (OPTIONAL) unreal.ToolMenuInsert object to manage how the menu is inserted
+        """
         super().__init__()
-        self.tool_name = material.get_name()
-        self.tool_display_name = assets.get_metadata(
-            material,
-            constants.META_MATERIAL_DISPLAY_NAME,
-            self.tool_name
-        )
-        self.material = material
-        self.display_name = assets.get_metadata(material, constants.META_MATERIAL_DISPLAY_NAME, material.get_name())
-        self.tool_tip = f"create a new Material Instance of {self.tool_name}"
+        self.tool_name = master_material.package_name
+        self.material_path = master_material.object_path
+        self.tool_tip = f"create a new Material Instance of {master_material.asset_name}"
+        self.set_display_name(master_material.display_name)
 
         if menu:
             self.init_entry(
@@ -196,8 +223,33 @@ class ApplyMasterMaterial(PythonMenuTool):
                 self.display_name,
                 self.tool_tip
             )
+            self.add_to_menu(menu, section, insert_policy)
+
+    def add_to_menu(self, menu, section="", insert_policy=None):
+        """(Re)insert this entry in the given menu"""
+        if insert_policy:
+            entry = unreal.ToolMenuEntry(
+                name=self.tool_name,
+                type=unreal.MultiBlockType.MENU_ENTRY,
+                insert_position=insert_policy,
+                script_object=self
+            )
+            menu.add_menu_entry(section, entry)
+        else:
             menu.add_menu_entry_object(self)
 
+    def set_display_name(self, display_name):
+        """Relabel this entry, the menu reads the label through get_label()"""
+        self.tool_display_name = display_name
+        self.display_name = display_name
+
+    @unreal.ufunction(override=True)
+    def get_label(self, context):
+        return self.display_name
+
+    def get_material(self):
+        """Load the master material this entry applies"""
+        return unreal.load_asset(self.material_path)
 
     @unreal.ufunction(override=True)
     def execute(self, context):
@@ -209,7 +261,7 @@ class ApplyMasterMaterial(PythonMenuTool):
 
             new_material_instance = materials.create_new_material_instance(
                 current_folder,
-                self.material
+                self.get_material()
             )
             package_path = new_material_instance.get_package().get_path_name()
             unreal.EditorUtilityLibrary().sync_browser_to_folders([package_path.rsplit("/", 1)[0]])
@@ -217,17 +269,18 @@ class ApplyMasterMaterial(PythonMenuTool):
             return
 
         # Get the EUW
-        EUW_results = assets.find_assets(
+        EUW_result = assets.find_asset(
             name="CreateFromMasterMaterial",
             exact_match=True,
             class_types=["EditorUtilityWidgetBlueprint"],
-            str_in_path="/MasterMaterialSystem/"
+            package_paths=["/MasterMaterialSystem"],
+            recursive_paths=False
         )
 
-        if not EUW_results:
+        if not EUW_result:
             unreal.log_error(f"Could not find the CreateFromMasterMaterial tool!")
             return
-        tool = EUW_results[0].package_name
+        tool = EUW_result.package_name
 
         # Launch the EUW tool
         widget = EditorUtilitySubsystem.spawn_and_register_tab(
@@ -237,22 +290,155 @@ class ApplyMasterMaterial(PythonMenuTool):
         )
 
         # Populate the EUW
+        material = self.get_material()
         widget.set_editor_properties({
             "from_material": selected_materials[0],
-            "to_material": self.material
+            "to_material": material
         })
         master_material_selector = widget.get_editor_property("master_material_selector")
         master_material_selector.set_selected_option(self.display_name)
-        widget.call_method("populate", (self.material,))
+        widget.call_method("populate", (material,))
 
     @unreal.ufunction(override=True)
     def can_execute(self, context):
         selected_materials = unreal.EditorUtilityLibrary.get_selected_assets_of_class(unreal.MaterialInterface) or []
-        return not (selected_materials and self.material in selected_materials)
+        return not any(
+            selected_material.get_path_name() == self.material_path
+            for selected_material in selected_materials
+        )
 
 
-def setup_menus():
-    """Initialize the Master Material System menus"""
+class MasterMaterialMenus:
+    """
+    Incremental model of the master material drop-down menus
+
+    Each master material owns one ApplyMasterMaterial entry per drop-down menu. Index changes
+    add, remove or relabel the affected entries only, everything else is left untouched
+    """
+    section = "Master Materials"
+
+    def __init__(self, material_menus, create_new_asset_menu):
+        self.parent_menus = [
+            (menu_object, "ApplyMasterMaterials", "Apply Master Material")
+            for menu_object in material_menus
+        ] + [
+            (create_new_asset_menu, "NewFromMasterMaterials", "New From Master Material")
+        ]
+        self.dropdown_menus = list()
+        self.entries = dict()  # {package_name: [ApplyMasterMaterial per drop-down menu]}
+        self.sort_keys = dict()  # {package_name: sort key}
+        self.is_populated = False
+
+    def sync(self, master_materials):
+        """
+        Reconcile the menus with the given master materials
+
+        parameters:
+            master_materials (list(index.MasterMaterialEntry)): the master materials to list
+        """
+        wanted = {entry.package_name: entry for entry in master_materials}
+        for package_name in set(self.entries) - set(wanted):
+            self.remove(package_name, refresh=False)
+        for entry in master_materials:
+            self.update(entry, refresh=False)
+        unreal.ToolMenus.get().refresh_all_widgets()
+
+    def on_index_changed(self, changes):
+        """MasterMaterialIndex listener, the menus are refreshed once per batch of changes"""
+        for package_name, entry in changes.items():
+            if entry:
+                self.update(entry, refresh=False)
+            else:
+                self.remove(package_name, refresh=False)
+        unreal.ToolMenus.get().refresh_all_widgets()
+
+    def get_sort_key(self, entry):
+        return entry.display_name.lower(), entry.package_name
+
+    def get_insert_policy(self, sort_key):
+        """Get the insert policy which keeps the drop-down menus sorted by display name"""
+        following = [
+            (key, package_name)
+            for package_name, key in self.sort_keys.items()
+            if key > sort_key
+        ]
+        if not following:
+            return None
+        return unreal.ToolMenuInsert(min(following)[1], unreal.ToolMenuInsertType.BEFORE)
+
+    def update(self, entry, refresh=True):
+        """Add the given master material to the menus or relabel its existing entries"""
+        package_name = entry.package_name
+        sort_key = self.get_sort_key(entry)
+        tools = self.entries.get(package_name)
+
+        if tools and self.sort_keys[package_name] == sort_key and tools[0].display_name == entry.display_name:
+            return
+
+        self.sort_keys.pop(package_name, None)
+        insert_policy = self.get_insert_policy(sort_key)
+        self.sort_keys[package_name] = sort_key
+
+        if tools:
+            # relabel the existing entries and move them to their new sorted position
+            for tool, menu_object in zip(tools, self.dropdown_menus):
+                tool.set_display_name(entry.display_name)
+                unreal.ToolMenus.get().remove_entry(menu_object.menu_name, "", tool.tool_name)
+                tool.add_to_menu(menu_object, "", insert_policy)
+        else:
+            self.add_dropdown_menus()
+            self.entries[package_name] = [
+                ApplyMasterMaterial(entry, menu_object, "", insert_policy)
+                for menu_object in self.dropdown_menus
+            ]
+
+        if refresh:
+            unreal.ToolMenus.get().refresh_all_widgets()
+
+    def remove(self, package_name, refresh=True):
+        """Remove the given master material from the menus"""
+        self.sort_keys.pop(package_name, None)
+        tools = self.entries.pop(package_name, None)
+        if not tools:
+            return
+
+        for tool, menu_object in zip(tools, self.dropdown_menus):
+            unreal.ToolMenus.get().remove_entry(menu_object.menu_name, "", tool.tool_name)
+
+        if not self.entries:
+            self.remove_dropdown_menus()
+
+        if refresh:
+            unreal.ToolMenus.get().refresh_all_widgets()
+
+    def add_dropdown_menus(self):
+        """Add the drop-down menus to apply/create material instances"""
+        if self.dropdown_menus:
+            return
+        for menu_object, name, label in self.parent_menus:
+            self.dropdown_menus.append(
+                menu_object.add_sub_menu(MENU_OWNER, self.section, name, label)
+            )
+
+    def remove_dropdown_menus(self):
+        """Remove the drop-down menus once no master materials are left"""
+        for menu_object, name, label in self.parent_menus:
+            unreal.ToolMenus.get().remove_entry(menu_object.menu_name, self.section, name)
+        self.dropdown_menus = list()
+
+
+_menu_model = None
+
+
+@tracing.traced
+def register_menus():
+    """Register the Master Material System menu sections and tools, without querying the Asset Registry"""
+    global _menu_model
+
+    # stop the previous menus from following the index
+    if _menu_model and _menu_model.is_populated:
+        index.get_master_material_index(build=False).remove_listener(_menu_model.on_index_changed)
+
     remove_menus()
     material_asset_menu = unreal.ToolMenus.get().extend_menu("ContentBrowser.AssetContextMenu.Material")
     material_instance_asset_menu = unreal.ToolMenus.get().extend_menu(
@@ -265,39 +451,46 @@ def setup_menus():
         material_instance_asset_menu
     ]
 
-    section = "Master Materials"
-    for menu_object in material_menus:
+    section = MasterMaterialMenus.section
+    for menu_object in material_menus + [create_new_asset_menu]:
         menu_object.add_section(section, section)
-    create_new_asset_menu.add_section(section, section)
 
     # mark as master materials
     ToggleMasterMaterial(material_asset_menu, section)
-    
-    master_materials = assets.find_assets(metadata={constants.META_IS_MASTER_MATERIAL: True}, class_types=["Material"])
-
-    # Add the drop-down menus to apply/create material instances
-    if master_materials:
-        master_materials = sorted(
-            master_materials,
-            key=lambda asset_data: assets.get_metadata(asset_data.get_asset(), constants.META_MATERIAL_DISPLAY_NAME).lower()
-        )
-        dropdown_menus = list()
-        for menu_object in material_menus:
-            dropdown_menus.append(
-                menu_object.add_sub_menu(
-                    MENU_OWNER, section, "ApplyMasterMaterials", "Apply Master Material"
-                )
-            )
-        dropdown_menus.append(
-            create_new_asset_menu.add_sub_menu(
-                MENU_OWNER, section, "NewFromMasterMaterials", "New From Master Material"
-            )
-        )
+    RegisterMasterMaterials(material_asset_menu, section)
+
+    _menu_model = MasterMaterialMenus(material_menus, create_new_asset_menu)
+
 
-        # Register each master materials to the drop-down menus
-        for material_asset_data in master_materials:
-            for menu_object in dropdown_menus:
-                ApplyMasterMaterial(material_asset_data.get_asset(), menu_object)
+@tracing.traced
+def populate_menus(build=True):
+    """
+    Register each master material to the drop-down menus, later changes are applied incrementally
+
+    parameters:
+        build (bool): if False, list the master materials of the persistent index without querying
+            the Asset Registry, a later call with build=True reconciles them
+    """
+    if _menu_model is None:
+        register_menus()
+    master_material_index = index.get_master_material_index(build=build)
+    if _menu_model.is_populated:
+        return
+
+    _menu_model.sync(master_material_index.get_entries())
+    master_material_index.add_listener(_menu_model.on_index_changed)
+    _menu_model.is_populated = True
+
+
+def is_populated():
+    """Whether the master material drop-down menus have been filled"""
+    return bool(_menu_model and _menu_model.is_populated)
+
+
+def setup_menus():
+    """Initialize the Master Material System menus"""
+    register_menus()
+    populate_menus()
 
 
 def remove_menus():
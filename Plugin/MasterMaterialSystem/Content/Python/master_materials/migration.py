@@ -0,0 +1,380 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from master_materials import (
+    assets,
+    index,
+    materials,
+    scheduler,
+    tracing
+)
+
+from master_materials.unreal_systems import EditorAssetLibrary
+
+import unreal
+
+
+# Journal item states
+STATUS_PENDING = "pending"
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def get_journal_dir():
+    """Get the folder migration journals are written to"""
+    return Path(unreal.Paths.project_saved_dir(), "master_materials", "migrations")
+
+
+def get_source_paths(source):
+    """
+    Get the object paths of a migration source
+
+    parameters:
+        source (str or list): a content folder, or a list of material paths / AssetData / materials
+
+    return:
+        list(str): the object paths of the source's materials
+    """
+    if isinstance(source, str):
+        return [
+            f"{asset_data.package_name}.{asset_data.asset_name}"
+            for asset_data in assets.find_assets(class_types=["Material"], package_paths=[source])
+        ]
+
+    source_paths = []
+    for item in source:
+        if isinstance(item, unreal.AssetData):
+            source_paths.append(f"{item.package_name}.{item.asset_name}")
+        elif isinstance(item, unreal.Object):
+            source_paths.append(item.get_path_name())
+        else:
+            source_paths.append(str(item))
+    return source_paths
+
+
+def get_default_job_name(source, master_material):
+    """
+    Generate a job name from the migration source and target master material, a list source
+    is named after a hash of its sorted paths so each selection gets its own journal
+    """
+    if isinstance(source, str):
+        source_name = source
+    else:
+        source_hash = hashlib.sha1("\n".join(sorted(get_source_paths(source))).encode("utf-8")).hexdigest()
+        source_name = f"selection_{source_hash[:12]}"
+    return re.sub(r"[^A-Za-z0-9_]+", "_", f"{source_name}_to_{master_material.get_name()}").strip("_")
+
+
+def map_parameters_by_name(source_info, target_info):
+    """
+    The default parameter mapping rule: copy every parameter found on both materials with the same type
+
+    parameters:
+        source_info (materials.MaterialParamInfo): the legacy material
+        target_info (materials.MaterialParamInfo): the new material instance
+
+    return:
+        dict: the {target_parameter: value} pairs to set
+    """
+    values = dict()
+    for parameter in source_info.get_parameter_names():
+        target_type = target_info.get_parameter_type(parameter)
+        if target_type and target_type == source_info.get_parameter_type(parameter):
+            value = source_info.get_parameter_value(parameter)
+            if value is not None:
+                values[parameter] = value
+    return values
+
+
+class MigrationJob:
+    """
+    Migrate legacy materials onto a registered master material as new Material Instances
+
+    Progress is journaled under Saved/master_materials/migrations/<job_name>.json: each item
+    change is appended to <job_name>.log, which is folded back into the journal when the job is
+    resumed. Running a job with the same name again resumes where it stopped and adds the
+    materials found since as pending. A cancelled job stops between materials and leaves the
+    rest pending
+    """
+
+    def __init__(self, master_material, source, parameter_mapping=None, job_name="",
+                 destination_folder="", replace_references=False):
+        """
+        parameters:
+            master_material (unreal.Material): the master material to create instances of
+            source (str or list): a content folder, or a list of material paths / AssetData / materials
+            parameter_mapping (dict or callable): a {target_parameter: source_parameter} dict, or a
+                function(source_info, target_info) returning {target_parameter: value}.
+                Parameters are matched by name and type if not provided
+            job_name (str): the journal name, generated from the source and master if not provided
+            destination_folder (str): where to create the instances, next to each material if not provided
+            replace_references (bool): if True, replace mesh references to each legacy material
+        """
+        self.master_material = master_material
+        self.source = source
+        self.parameter_mapping = parameter_mapping
+        self.job_name = job_name or get_default_job_name(source, master_material)
+        self.destination_folder = destination_folder.rstrip("/")
+        self.replace_references = replace_references
+        self.journal = None
+        self.name_allocators = dict()  # {destination folder: materials.InstanceNameAllocator}
+
+    def get_journal_path(self):
+        return get_journal_dir() / f"{self.job_name}.json"
+
+    def get_log_path(self):
+        return get_journal_dir() / f"{self.job_name}.log"
+
+    def load_journal(self):
+        """
+        Load the job's journal, or start a new one listing every material to migrate
+
+        A resumed journal gets the materials collected since it was written as pending items
+
+        raise:
+            ValueError: if the journal of this job name targets another master material
+        """
+        journal_path = self.get_journal_path()
+        master_path = self.master_material.get_path_name()
+        if journal_path.exists():
+            self.journal = json.loads(journal_path.read_text(encoding="utf-8"))
+            if self.journal.get("master_material") != master_path:
+                raise ValueError(
+                    f"Migration `{self.job_name}` targets {self.journal.get('master_material')}, not {master_path}"
+                )
+            self.apply_log()
+            unreal.log(f"Resuming migration `{self.job_name}` from {journal_path}")
+        else:
+            self.journal = {"job": self.job_name, "master_material": master_path, "items": dict()}
+
+        for source_path in self.collect_sources():
+            self.journal["items"].setdefault(source_path, {"status": STATUS_PENDING})
+        self.save_journal()
+        return self.journal
+
+    def apply_log(self):
+        """Fold the item changes logged since the journal was written back into it"""
+        log_path = self.get_log_path()
+        if not log_path.exists():
+            return
+        for line in log_path.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # the last record of a crashed run may be cut short
+                continue
+            self.journal["items"][record.pop("source")] = record
+
+    def save_journal(self):
+        """Write the whole journal through a temp file so a crash never leaves it half written, then clear the log"""
+        journal_path = self.get_journal_path()
+        journal_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = journal_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(self.journal, separators=(",", ":")), encoding="utf-8")
+        os.replace(temp_path, journal_path)
+        self.get_log_path().unlink(missing_ok=True)
+
+    def log_item(self, source_path):
+        """Append the current state of one item to the log, instead of rewriting the whole journal"""
+        record = dict(self.journal["items"][source_path], source=source_path)
+        with self.get_log_path().open("a", encoding="utf-8") as log_file:
+            log_file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def collect_sources(self):
+        """
+        Get the object paths of the materials to migrate
+
+        return:
+            list(str): the object paths, registered master materials are never migrated
+        """
+        source_paths = get_source_paths(self.source)
+        master_materials = index.get_master_material_index()
+        return [
+            source_path
+            for source_path in source_paths
+            if not master_materials.get(source_path.split(".", 1)[0])
+        ]
+
+    def get_pending(self, retry_failed=False):
+        """Get the object paths still left to migrate"""
+        statuses = {STATUS_PENDING, STATUS_IN_PROGRESS}
+        if retry_failed:
+            statuses.add(STATUS_FAILED)
+        return [
+            source_path
+            for source_path, item in self.journal["items"].items()
+            if item["status"] in statuses
+        ]
+
+    def run(self, limit=None, retry_failed=False):
+        """
+        Migrate the pending materials, journaling progress after each one
+
+        parameters:
+            limit (int): the maximum number of materials to migrate in this run
+            retry_failed (bool): whether to retry materials which previously failed
+
+        return:
+            dict: the number of items per status
+        """
+        return scheduler.run_now(self.create_task(limit, retry_failed))
+
+    def create_task(self, limit=None, retry_failed=False, on_complete=None):
+        """
+        Get the run as a task, to time-slice it with scheduler.submit() or run it
+        behind a progress dialog with scheduler.run_with_dialog()
+
+        parameters:
+            limit (int): the maximum number of materials to migrate in this run
+            retry_failed (bool): whether to retry materials which previously failed
+            on_complete (callable): called as on_complete(task) once the task is finished
+
+        return:
+            scheduler.Task: the task, its result is the number of items per status
+        """
+        self.load_journal()
+        pending = self.get_pending(retry_failed)
+        if limit:
+            pending = pending[:limit]
+
+        return scheduler.Task(
+            f"Migrating to {self.master_material.get_name()}",
+            self.iter_items(pending),
+            total=len(pending),
+            on_complete=on_complete
+        )
+
+    def iter_items(self, source_paths):
+        """The steps of create_task(), yielding after each journaled material"""
+        try:
+            for source_path in source_paths:
+                self.migrate_item(source_path)
+                yield source_path
+        except scheduler.TaskCancelled:
+            pass
+        # fold the run's log into the journal
+        self.save_journal()
+        return self.get_summary()
+
+    @tracing.traced
+    def migrate_item(self, source_path):
+        """Migrate a single journaled material, recording its result"""
+        item = self.journal["items"][source_path]
+        try:
+            source_material = unreal.load_asset(source_path)
+            if not source_material:
+                raise ValueError(f"Could not load {source_path}")
+
+            destination_folder = self.destination_folder or source_path.rsplit("/", 1)[0]
+
+            # Journal the planned asset before creating it, a resumed or retried item then reuses it
+            if not item.get("instance"):
+                asset_name = self.get_name_allocator(destination_folder).allocate(
+                    materials.get_master_material_instance_base_name(self.master_material, source_material)
+                )
+                item["instance"] = f"{destination_folder}/{asset_name}"
+            item["status"] = STATUS_IN_PROGRESS
+            self.log_item(source_path)
+
+            new_material_instance = self.get_or_create_instance(item["instance"])
+            self.transfer_parameters(source_material, new_material_instance)
+            assets.save_asset(new_material_instance)
+
+            if self.replace_references:
+                item["references"] = materials.replace_material_references(
+                    source_material, new_material_instance
+                )["updated"]
+
+            item["status"] = STATUS_DONE
+            item.pop("error", None)
+
+        except Exception as error:
+            unreal.log_error(f"Failed to migrate {source_path}: {error}")
+            item["status"] = STATUS_FAILED
+            item["error"] = str(error)
+
+        self.log_item(source_path)
+
+    def get_name_allocator(self, destination_folder):
+        """
+        Get the name allocator of the given folder, its existing names are only read once per run
+
+        The instances journaled in the folder are reserved too, even if they were never created
+        """
+        if destination_folder not in self.name_allocators:
+            allocator = materials.InstanceNameAllocator(destination_folder)
+            for item in self.journal["items"].values():
+                folder, _, asset_name = item.get("instance", "").rpartition("/")
+                if folder == destination_folder:
+                    allocator.taken.add(asset_name.lower())
+            self.name_allocators[destination_folder] = allocator
+        return self.name_allocators[destination_folder]
+
+    def get_or_create_instance(self, instance_path):
+        """Get the planned material instance, creating it if a previous run did not get to it"""
+        if EditorAssetLibrary.does_asset_exist(instance_path):
+            return unreal.load_asset(instance_path)
+
+        destination_folder, asset_name = instance_path.rsplit("/", 1)
+        return materials.create_new_material_instance(
+            destination_folder,
+            self.master_material,
+            asset_name=asset_name,
+            should_save=False,
+            should_open=False
+        )
+
+    def transfer_parameters(self, source_material, new_material_instance):
+        """Apply the parameter mapping rule to the new material instance"""
+        source_info = materials.MaterialParamInfo(source_material)
+        target_info = materials.MaterialParamInfo(new_material_instance)
+
+        if callable(self.parameter_mapping):
+            values = self.parameter_mapping(source_info, target_info)
+        elif self.parameter_mapping:
+            values = {
+                target_parameter: source_info.get_parameter_value(source_parameter)
+                for target_parameter, source_parameter in self.parameter_mapping.items()
+                if source_info.get_parameter_type(source_parameter)
+            }
+        else:
+            values = map_parameters_by_name(source_info, target_info)
+
+        # the instance is saved by the caller
+        with materials.ParameterEditBatch(save=False):
+            for parameter, value in values.items():
+                if value is not None and target_info.get_parameter_type(parameter):
+                    target_info.set_parameter_value(parameter, value)
+
+    def get_summary(self):
+        """Get the number of journaled items per status"""
+        summary = {STATUS_PENDING: 0, STATUS_IN_PROGRESS: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        for item in self.journal["items"].values():
+            summary[item["status"]] += 1
+        return summary
+
+
+def migrate_materials(master_material, source, parameter_mapping=None, job_name="", **kwargs):
+    """
+    Migrate a folder or list of legacy materials onto the given master material, resuming
+    any previous run of the same job
+
+    Progress is shown in a dialog, cancelling it stops the job after the current material
+
+    parameters:
+        master_material (unreal.Material): the master material to create instances of
+        source (str or list): a content folder, or a list of material paths / AssetData / materials
+        parameter_mapping (dict or callable): see MigrationJob
+        job_name (str): the journal name, generated from the source and master if not provided
+
+    return:
+        dict: the number of journaled items per status
+    """
+    job = MigrationJob(master_material, source, parameter_mapping, job_name, **kwargs)
+    summary = scheduler.run_with_dialog(job.create_task())
+    unreal.log(f"Migration `{job.job_name}`: {summary}")
+    return summary
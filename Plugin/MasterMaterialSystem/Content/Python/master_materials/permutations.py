@@ -0,0 +1,189 @@
+from master_materials import (
+    hierarchy,
+    index,
+    materials,
+    persistent_index,
+    scheduler,
+    tracing
+)
+
+from master_materials.unreal_systems import MaterialEditingLibrary
+
+import unreal
+
+
+# Combinations used by this many instances or fewer are reported with the instances using them
+RARE_PERMUTATION_COUNT = 2
+
+
+def get_static_switch_names(master_material):
+    """
+    Get the static switches of a master material, from its (cached) parameter schema
+
+    parameters:
+        master_material (unreal.Material): the master material
+
+    return:
+        list(str): the sorted static switch parameter names
+    """
+    schema = materials.get_parameter_schema(master_material)
+    return sorted(parameter for parameter, data_type in schema.parameters.items() if data_type == bool)
+
+
+def read_static_switches(material_instance, switch_names):
+    """
+    Get the static switch values a loaded instance compiles with, overridden or inherited
+
+    return:
+        dict: {switch_name: bool}
+    """
+    return {
+        switch_name: bool(
+            MaterialEditingLibrary.get_material_instance_static_switch_parameter_value(material_instance, switch_name)
+        )
+        for switch_name in switch_names
+    }
+
+
+def summarize_permutations(entry, switch_names, instance_switches, rare_count=RARE_PERMUTATION_COUNT):
+    """
+    Group the instances of a master material by the static switch combination they compile
+
+    parameters:
+        entry (index.MasterMaterialEntry): the master material
+        switch_names (list(str)): the master material's static switches
+        instance_switches (dict): {instance path: {switch_name: bool}}
+        rare_count (int): list the instances of combinations used by this many instances or fewer
+
+    return:
+        dict: the master material, its instance and permutation counts and each combination,
+            most used first
+    """
+    combinations = dict()
+    for instance_path, switches in sorted(instance_switches.items()):
+        key = tuple(switches.get(switch_name, False) for switch_name in switch_names)
+        combinations.setdefault(key, []).append(instance_path)
+
+    return {
+        "master": entry.display_name,
+        "object_path": entry.object_path,
+        "switches": switch_names,
+        "instances": len(instance_switches),
+        "permutations": len(combinations),
+        "combinations": [
+            {
+                "values": dict(zip(switch_names, key)),
+                "count": len(instance_paths),
+                "instances": instance_paths if len(instance_paths) <= rare_count else [],
+            }
+            for key, instance_paths in sorted(combinations.items(), key=lambda item: (-len(item[1]), item[0]))
+        ],
+    }
+
+
+@tracing.traced
+def analyze_permutations(entries=None, rare_count=RARE_PERMUTATION_COUNT):
+    """
+    Count the static switch permutations the instances of each master material compile
+
+    parameters:
+        entries (list(index.MasterMaterialEntry)): the master materials to analyze, every registered one by default
+        rare_count (int): list the instances of combinations used by this many instances or fewer
+
+    return:
+        list(dict): the summarize_permutations() report of each master material
+    """
+    return scheduler.run_now(create_analysis_task(entries, rare_count))
+
+
+def create_analysis_task(entries=None, rare_count=RARE_PERMUTATION_COUNT, on_complete=None):
+    """
+    Get analyze_permutations() as a task, each step reads one instance
+
+    The instances are found through the hierarchy index and their switch values are read from
+    the persistent index, only instances which changed since they were last analyzed, or whose
+    parent chain changed, are loaded.
+    Once cancelled, the master materials analyzed so far are reported
+
+    return:
+        scheduler.Task: the task, its result is the analyze_permutations() report
+    """
+    if entries is None:
+        entries = index.get_master_material_index().get_entries()
+    material_hierarchy = hierarchy.get_material_hierarchy()
+    instances = [
+        (entry, sorted(material_hierarchy.get_descendants(entry.object_path)))
+        for entry in entries
+    ]
+    return scheduler.Task(
+        "Analyzing static switch permutations",
+        iter_analysis(instances, rare_count),
+        total=sum(len(instance_paths) for entry, instance_paths in instances),
+        on_complete=on_complete
+    )
+
+
+def get_package_chain(instance_path, material_hierarchy):
+    """Get the packages an instance's resolved switch values depend on: its own and its parent chain's"""
+    return [
+        material_path.split(".", 1)[0]
+        for material_path in [instance_path] + material_hierarchy.get_ancestors(instance_path)
+    ]
+
+
+def iter_analysis(instances, rare_count):
+    """The steps of create_analysis_task(), yielding after each instance"""
+    store = persistent_index.get_persistent_index()
+    material_hierarchy = hierarchy.get_material_hierarchy()
+    chains = {
+        instance_path.split(".", 1)[0]: get_package_chain(instance_path, material_hierarchy)
+        for entry, instance_paths in instances
+        for instance_path in instance_paths
+    }
+    stored = store.get_static_switches(chains)
+    reports = []
+    try:
+        for entry, instance_paths in instances:
+            master_material = entry.get_asset()
+            if not master_material:
+                unreal.log_warning(f"Could not load the master material {entry.object_path}")
+                continue
+
+            switch_names = get_static_switch_names(master_material)
+            instance_switches, new_switches = dict(), dict()
+            try:
+                for instance_path in instance_paths:
+                    package_name = instance_path.split(".", 1)[0]
+                    switches = stored.get(package_name)
+                    # values stored before the master material's switches changed are read again
+                    if switches is None or sorted(switches) != switch_names:
+                        material_instance = unreal.load_asset(instance_path)
+                        if not isinstance(material_instance, unreal.MaterialInstance):
+                            yield instance_path
+                            continue
+                        switches = new_switches[package_name] = read_static_switches(material_instance, switch_names)
+                    instance_switches[instance_path] = switches
+                    yield instance_path
+            finally:
+                store.set_static_switches(new_switches, chains)
+                reports.append(summarize_permutations(entry, switch_names, instance_switches, rare_count))
+    except scheduler.TaskCancelled:
+        pass
+
+    return reports
+
+
+def log_permutation_report(reports):
+    """Log the analyze_permutations() report, naming the instances of the rare combinations"""
+    for report in reports:
+        unreal.log(
+            f"{report['master']}: {report['permutations']} permutation(s) of "
+            f"{len(report['switches'])} static switch(es) across {report['instances']} instance(s)"
+        )
+        for combination in report["combinations"]:
+            if combination["instances"]:
+                enabled = [switch_name for switch_name, value in combination["values"].items() if value]
+                unreal.log(
+                    f"    {combination['count']} instance(s) with {', '.join(enabled) or 'no switch'} enabled: "
+                    f"{', '.join(combination['instances'])}"
+                )
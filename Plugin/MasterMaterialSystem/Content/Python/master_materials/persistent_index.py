@@ -0,0 +1,352 @@
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+from master_materials import events
+
+import unreal
+
+
+# Bump whenever the tables change, older index files are then rebuilt from scratch
+SCHEMA_VERSION = 3
+
+
+def get_index_path():
+    """Get the index file of the current project"""
+    return Path(unreal.Paths.project_saved_dir(), "master_materials", "index.sqlite")
+
+
+def get_saved_hashes(package_names):
+    """
+    Get the hash each package had when it was last saved, as recorded by the Asset Registry
+
+    parameters:
+        package_names (list(str)): the packages to look up
+
+    return:
+        dict: {package_name: saved_hash} for the packages the Asset Registry knows of,
+            None if the plugin binaries predate the lookup
+    """
+    if not hasattr(unreal.MasterMaterialSystemBPLibrary, "get_package_saved_hashes"):
+        return None
+    if not package_names:
+        return dict()
+    return {
+        str(package_name): str(saved_hash)
+        for package_name, saved_hash in
+        unreal.MasterMaterialSystemBPLibrary.get_package_saved_hashes(list(package_names)).items()
+    }
+
+
+class PersistentIndex:
+    """
+    SQLite store of the master materials, parent material parameter schemas and material instance
+    static switch values, shared between editor sessions
+
+    Every row records the saved hash of its package, or of every package its values depend on,
+    and is only trusted while the Asset Registry reports the same hashes. Packages with unsaved changes are never trusted, their master material
+    row is held back until the package is saved and their schemas and switch values are not stored at all
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.connection = None
+        self.dirty_packages = set()
+        self.pending = dict()   # {package_name: (object_path, display_name)} waiting for a save
+        self.is_bound = False
+
+    def bind_events(self):
+        """Follow unsaved changes, the index is not used without them"""
+        if self.is_bound:
+            return
+        self.is_bound = all([
+            events.connect("on_package_dirty", self.on_package_dirty),
+            events.connect("on_package_saved", self.on_package_saved),
+            events.connect("on_package_reloaded", self.on_package_reloaded),
+        ])
+
+    def connect(self):
+        """Open the index file, resetting it if it was written by another SCHEMA_VERSION"""
+        if self.connection is not None:
+            return self.connection
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.db_path), timeout=5.0)
+        # editors of the same project may share the file, WAL lets them read while another writes
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS master_materials")
+                connection.execute("DROP TABLE IF EXISTS parameter_schemas")
+                connection.execute("DROP TABLE IF EXISTS static_switches")
+                connection.execute(
+                    "CREATE TABLE master_materials ("
+                    "package_name TEXT PRIMARY KEY, object_path TEXT, display_name TEXT, saved_hash TEXT)"
+                )
+                connection.execute(
+                    "CREATE TABLE parameter_schemas ("
+                    "package_name TEXT PRIMARY KEY, saved_hash TEXT, parameters TEXT, graph_stats TEXT)"
+                )
+                connection.execute(
+                    "CREATE TABLE static_switches (package_name TEXT PRIMARY KEY, chain_hash TEXT, switch_values TEXT)"
+                )
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection = connection
+        return connection
+
+    def execute(self, statements):
+        """
+        Run the given statements in a single transaction
+
+        parameters:
+            statements (list(tuple)): the (sql, parameters) pairs to run
+
+        return:
+            bool: whether the statements were committed
+        """
+        try:
+            with self.connect() as connection:
+                for sql, parameters in statements:
+                    connection.execute(sql, parameters)
+        except sqlite3.Error as error:
+            unreal.log_warning(f"Could not write the master material index {self.db_path}: {error}")
+            return False
+        return True
+
+    def query(self, sql, parameters=()):
+        """Get the rows of the given query, empty if the index could not be read"""
+        try:
+            return self.connect().execute(sql, parameters).fetchall()
+        except sqlite3.Error as error:
+            unreal.log_warning(f"Could not read the master material index {self.db_path}: {error}")
+            return []
+
+    def is_trusted(self, package_name, stored_hash, saved_hashes):
+        """Whether a row stored at stored_hash still describes the package"""
+        return (
+            package_name not in self.dirty_packages
+            and stored_hash is not None
+            and saved_hashes.get(package_name) == stored_hash
+        )
+
+    def get_master_materials(self):
+        """
+        Get the stored master materials whose packages did not change since they were stored
+
+        return:
+            list(tuple): the (package_name, object_path, display_name) of each master material,
+                None if the index cannot be validated
+        """
+        if not self.is_bound:
+            return None
+        rows = self.query("SELECT package_name, object_path, display_name, saved_hash FROM master_materials")
+        saved_hashes = get_saved_hashes([row[0] for row in rows])
+        if saved_hashes is None:
+            return None
+        return [
+            (package_name, object_path, display_name)
+            for package_name, object_path, display_name, saved_hash in rows
+            if self.is_trusted(package_name, saved_hash, saved_hashes)
+        ]
+
+    def set_master_materials(self, entries):
+        """
+        Replace every stored master material
+
+        parameters:
+            entries (list(tuple)): the (package_name, object_path, display_name) of each master material
+        """
+        if not self.is_bound:
+            return
+        entries = list(entries)
+        saved_hashes = get_saved_hashes([entry[0] for entry in entries])
+        if saved_hashes is None:
+            return
+
+        statements = [("DELETE FROM master_materials", ())]
+        for package_name, object_path, display_name in entries:
+            saved_hash = saved_hashes.get(package_name)
+            if package_name in self.dirty_packages:
+                # the unsaved state is only trusted once it is saved
+                self.pending[package_name] = (object_path, display_name)
+                saved_hash = None
+            statements.append((
+                "INSERT INTO master_materials VALUES (?, ?, ?, ?)",
+                (package_name, object_path, display_name, saved_hash)
+            ))
+        self.execute(statements)
+
+    def set_master_material(self, package_name, object_path=None, display_name=None):
+        """
+        Store or remove (object_path=None) one master material, changes to unsaved packages are applied once saved
+
+        parameters:
+            package_name (str): the master material's package
+            object_path (str): the master material's object path
+            display_name (str): the master material's display name
+        """
+        if not self.is_bound:
+            return
+        if package_name in self.dirty_packages:
+            self.pending[package_name] = (object_path, display_name)
+            return
+
+        self.pending.pop(package_name, None)
+        statements = [("DELETE FROM master_materials WHERE package_name = ?", (package_name,))]
+        if object_path:
+            saved_hashes = get_saved_hashes([package_name]) or dict()
+            statements.append((
+                "INSERT INTO master_materials VALUES (?, ?, ?, ?)",
+                (package_name, object_path, display_name, saved_hashes.get(package_name))
+            ))
+        self.execute(statements)
+
+    def get_schema(self, package_name):
+        """
+        Get the stored parameter schema of the given parent material
+
+        parameters:
+            package_name (str): the parent material's package
+
+        return:
+            tuple: ({param_name: type_name}, graph_stats), None if nothing trusted is stored
+        """
+        if not self.is_bound or package_name in self.dirty_packages:
+            return None
+        rows = self.query(
+            "SELECT saved_hash, parameters, graph_stats FROM parameter_schemas WHERE package_name = ?",
+            (package_name,)
+        )
+        if not rows:
+            return None
+
+        saved_hash, parameters, graph_stats = rows[0]
+        if not self.is_trusted(package_name, saved_hash, get_saved_hashes([package_name]) or dict()):
+            return None
+        try:
+            return json.loads(parameters), json.loads(graph_stats)
+        except ValueError:
+            return None
+
+    def set_schema(self, package_name, parameters, graph_stats):
+        """
+        Store the parameter schema of the given parent material, skipped while it has unsaved changes
+
+        parameters:
+            package_name (str): the parent material's package
+            parameters (dict): the {param_name: type_name} parameters
+            graph_stats (dict): the graph walk stats
+        """
+        if not self.is_bound or package_name in self.dirty_packages:
+            return
+        saved_hash = (get_saved_hashes([package_name]) or dict()).get(package_name)
+        if saved_hash is None:
+            return
+        self.execute([(
+            "INSERT OR REPLACE INTO parameter_schemas VALUES (?, ?, ?, ?)",
+            (package_name, saved_hash, json.dumps(parameters), json.dumps(graph_stats))
+        )])
+
+    def get_chain_hashes(self, chains):
+        """
+        Combine the saved hashes of the packages each row depends on
+
+        parameters:
+            chains (dict): {package_name: [the package names its row depends on]}
+
+        return:
+            dict: {package_name: chain_hash} for the chains without unsaved or unknown packages
+        """
+        saved_hashes = get_saved_hashes({
+            chain_package for chain in chains.values() for chain_package in chain
+        }) or dict()
+        chain_hashes = dict()
+        for package_name, chain in chains.items():
+            if any(chain_package in self.dirty_packages or chain_package not in saved_hashes for chain_package in chain):
+                continue
+            chain_hashes[package_name] = hashlib.sha1(
+                "|".join(saved_hashes[chain_package] for chain_package in chain).encode("utf-8")
+            ).hexdigest()
+        return chain_hashes
+
+    def get_static_switches(self, chains):
+        """
+        Get the stored static switch values of many material instances
+
+        The values an instance compiles with may be inherited, each row is only trusted while
+        neither the instance nor any material up its parent chain changed
+
+        parameters:
+            chains (dict): {instance package_name: [its package and those of its parent chain]}
+
+        return:
+            dict: {package_name: {switch_name: bool}} for the packages with trusted values
+        """
+        if not self.is_bound or not chains:
+            return dict()
+        chain_hashes = self.get_chain_hashes(chains)
+        switches = dict()
+        for package_name, chain_hash, switch_values in self.query(
+            "SELECT package_name, chain_hash, switch_values FROM static_switches"
+        ):
+            if package_name in chain_hashes and chain_hashes[package_name] == chain_hash:
+                try:
+                    switches[package_name] = json.loads(switch_values)
+                except ValueError:
+                    continue
+        return switches
+
+    def set_static_switches(self, switches, chains):
+        """
+        Store the static switch values of many material instances, skipping those with unsaved changes
+        up their parent chain
+
+        parameters:
+            switches (dict): {package_name: {switch_name: bool}}
+            chains (dict): {package_name: [its package and those of its parent chain]}
+        """
+        if not self.is_bound or not switches:
+            return
+        chain_hashes = self.get_chain_hashes({package_name: chains[package_name] for package_name in switches})
+        self.execute([
+            (
+                "INSERT OR REPLACE INTO static_switches VALUES (?, ?, ?)",
+                (package_name, chain_hashes[package_name], json.dumps(switches[package_name]))
+            )
+            for package_name in switches
+            if package_name in chain_hashes
+        ])
+
+    def on_package_dirty(self, package_name):
+        self.dirty_packages.add(str(package_name))
+
+    def on_package_saved(self, package_name):
+        package_name = str(package_name)
+        self.dirty_packages.discard(package_name)
+        if package_name in self.pending:
+            self.set_master_material(package_name, *self.pending[package_name])
+
+    def on_package_reloaded(self, package_name):
+        # the unsaved changes were thrown away, the stored row describes the package again
+        package_name = str(package_name)
+        self.dirty_packages.discard(package_name)
+        self.pending.pop(package_name, None)
+
+
+_persistent_index = None
+
+
+def get_persistent_index():
+    """
+    Get the persistent index of the current project
+
+    return:
+        PersistentIndex: the persistent index
+    """
+    global _persistent_index
+    if _persistent_index is None:
+        _persistent_index = PersistentIndex(get_index_path())
+        _persistent_index.bind_events()
+    return _persistent_index
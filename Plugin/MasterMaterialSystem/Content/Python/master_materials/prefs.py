@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import unreal
+
+
+# The seconds a save waits for further saves before the prefs file is written
+WRITE_DELAY = 0.5
+
+
+def get_prefs_dir():
+    """Get the folder the prefs are stored in"""
+    return Path(unreal.Paths.project_saved_dir(), "pytemp")
+
+
+class PrefsStore:
+    """
+    Every prefs name in a single JSON file as {prefs_name: {key: value}}
+
+    Files are cached in memory and only parsed again when their mtime changes. Saves are
+    kept in memory and written together once no other save arrived for WRITE_DELAY seconds,
+    or when Python shuts down. Prefs from the older one-file-per-name layout are still read
+    """
+
+    def __init__(self, prefs_dir, write_delay=WRITE_DELAY):
+        self.prefs_dir = Path(prefs_dir)
+        self.prefs_path = self.prefs_dir / "unreal_prefs.json"
+        self.write_delay = write_delay
+        self.file_cache = dict()    # {path: (mtime_ns, data)}
+        self.pending = dict()       # {prefs_name: prefs} not written yet
+        self.write_due = 0.0
+        self.tick_handle = None
+
+    def get_legacy_path(self, prefs_name):
+        return self.prefs_dir / f"unreal_prefs_{prefs_name}.json"
+
+    def read(self, path):
+        """Read a JSON file through the cache"""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            self.file_cache.pop(path, None)
+            return dict()
+
+        cached = self.file_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as error:
+            unreal.log_warning(f"Could not read prefs file {path}: {error}")
+            data = dict()
+        self.file_cache[path] = (mtime, data)
+        return data
+
+    def load(self, prefs_name):
+        """
+        Get the prefs stored under the given name
+
+        parameters:
+            prefs_name (str): the prefs name
+
+        return:
+            dict: a copy of the {key: value} prefs, empty if none were saved
+        """
+        if prefs_name in self.pending:
+            return dict(self.pending[prefs_name])
+
+        prefs = self.read(self.prefs_path)
+        if prefs_name in prefs:
+            return dict(prefs[prefs_name])
+        return dict(self.read(self.get_legacy_path(prefs_name)))
+
+    def save(self, prefs_name, prefs):
+        """
+        Store the prefs under the given name, the file is written once saves stop arriving
+
+        parameters:
+            prefs_name (str): the prefs name
+            prefs (dict): the {key: value} prefs
+        """
+        self.pending[prefs_name] = dict(prefs)
+        self.write_due = time.monotonic() + self.write_delay
+        if self.tick_handle is None:
+            self.tick_handle = unreal.register_slate_post_tick_callback(self.on_tick)
+
+    def on_tick(self, delta_seconds):
+        if time.monotonic() >= self.write_due:
+            self.flush()
+
+    def flush(self):
+        """
+        Write any pending saves now
+
+        If the file can't be written (read-only folder, locked by another editor, etc) the saves
+        stay pending and are written by the next flush
+        """
+        if self.tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self.tick_handle)
+            self.tick_handle = None
+        if not self.pending:
+            return
+
+        # merge over the file as it is now, another editor may have written to it
+        prefs = dict(self.read(self.prefs_path))
+        prefs.update(self.pending)
+
+        # write through a temp file so a crash never leaves the prefs half written
+        try:
+            self.prefs_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.prefs_path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(prefs, separators=(",", ":")), encoding="utf-8")
+            os.replace(temp_path, self.prefs_path)
+        except OSError as error:
+            unreal.log_warning(f"Could not write prefs file {self.prefs_path}, the saves are kept for the next flush: {error}")
+            return
+
+        self.pending = dict()
+        self.file_cache[self.prefs_path] = (self.prefs_path.stat().st_mtime_ns, prefs)
+
+
+_prefs_store = None
+
+
+def get_prefs_store():
+    """
+    Get the prefs store of the current project
+
+    return:
+        PrefsStore: the prefs store
+    """
+    global _prefs_store
+    if _prefs_store is None:
+        _prefs_store = PrefsStore(get_prefs_dir())
+        unreal.register_python_shutdown_callback(_prefs_store.flush)
+    return _prefs_store
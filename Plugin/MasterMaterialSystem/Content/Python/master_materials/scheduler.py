@@ -0,0 +1,206 @@
+import time
+
+from master_materials import shader_updates
+
+import unreal
+
+
+# The seconds of each editor tick given to scheduled tasks
+TICK_BUDGET = 0.008
+
+# Task states
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_CANCELLED = "cancelled"
+STATUS_FAILED = "failed"
+
+
+class TaskCancelled(Exception):
+    """Thrown into a task's steps when it is cancelled, a task may catch it to return a partial result"""
+
+
+class Task:
+    """
+    A long operation split into steps which run on the game thread
+
+    The steps are a generator which yields after each item, every yield must leave the work
+    in a consistent state.
+
+    On cancel, TaskCancelled is thrown into the generator at its current yield, a generator
+    catching it may finish the items it started (save what it modified, etc) and return its
+    partial result
+    """
+
+    def __init__(self, name, steps, total=0, on_complete=None):
+        """
+        parameters:
+            name (str): the label shown in progress dialogs and logs
+            steps (generator): the task's work, its return value is the task result
+            total (int): the number of items the steps yield, 0 if unknown
+            on_complete (callable): called as on_complete(task) once the task is done, cancelled or failed
+        """
+        self.name = name
+        self.steps = steps
+        self.total = total
+        self.on_complete = on_complete
+        self.completed = 0
+        self.description = ""
+        self.status = STATUS_PENDING
+        self.result = None
+        self.error = None
+        self.cancel_requested = False
+
+    def cancel(self):
+        """Stop the task before its next item"""
+        self.cancel_requested = True
+
+    def is_finished(self):
+        return self.status in (STATUS_DONE, STATUS_CANCELLED, STATUS_FAILED)
+
+    def get_progress(self):
+        """Get the fraction of the items done, 0.0 if the total is unknown"""
+        return min(self.completed / self.total, 1.0) if self.total else 0.0
+
+    def advance(self):
+        """
+        Run the steps up to their next yield
+
+        return:
+            bool: whether the task has more steps to run
+        """
+        if self.is_finished():
+            return False
+
+        self.status = STATUS_RUNNING
+        try:
+            if self.cancel_requested:
+                value = self.steps.throw(TaskCancelled())
+            else:
+                value = next(self.steps)
+        except StopIteration as stop:
+            self.result = stop.value
+            self.finish(STATUS_CANCELLED if self.cancel_requested else STATUS_DONE)
+            return False
+        except TaskCancelled:
+            self.finish(STATUS_CANCELLED)
+            return False
+        except Exception as error:
+            unreal.log_error(f"{self.name} failed: {error}")
+            self.error = error
+            self.finish(STATUS_FAILED)
+            return False
+
+        self.completed += 1
+        if value:
+            self.description = str(value)
+        return True
+
+    def finish(self, status):
+        self.status = status
+        if status == STATUS_CANCELLED:
+            unreal.log_warning(f"{self.name} cancelled after {self.completed} of {self.total or '?'} items")
+        if self.on_complete:
+            self.on_complete(self)
+
+
+class TaskScheduler:
+    """
+    Run tasks on the game thread within a time budget per editor tick, in submission order
+
+    Unreal API calls are only safe on the game thread, so the tasks share each tick with the
+    editor instead of running on other threads.
+    The shader updates of the materials the tasks edit are held while the steps of a tick run,
+    so edits made between ticks (widgets, details panels) still update as they happen
+    """
+
+    def __init__(self, budget=TICK_BUDGET):
+        self.budget = budget
+        self.tasks = list()
+        self.tick_handle = None
+
+    def submit(self, task):
+        """
+        Queue a task to run over the next editor ticks
+
+        parameters:
+            task (Task): the task to run
+
+        return:
+            Task: the queued task
+        """
+        self.tasks.append(task)
+        if self.tick_handle is None:
+            self.tick_handle = unreal.register_slate_post_tick_callback(self.on_tick)
+        return task
+
+    def on_tick(self, delta_seconds):
+        deadline = time.perf_counter() + self.budget
+        with shader_updates.deferred():
+            while self.tasks and time.perf_counter() < deadline:
+                task = self.tasks[0]
+                if not task.advance():
+                    self.tasks.pop(0)
+
+        if not self.tasks:
+            unreal.unregister_slate_post_tick_callback(self.tick_handle)
+            self.tick_handle = None
+
+    def cancel_all(self):
+        """Cancel every queued task, each stops before its next item"""
+        for task in self.tasks:
+            task.cancel()
+
+
+def run_with_dialog(task):
+    """
+    Run a task to completion now, showing its progress in a cancellable ScopedSlowTask dialog,
+    the shader updates of the materials it edits are flushed once it is done
+
+    parameters:
+        task (Task): the task to run
+
+    return:
+        the task's result
+    """
+    with shader_updates.deferred(), unreal.ScopedSlowTask(task.total or 1, task.name) as slow_task:
+        slow_task.make_dialog(True)
+        completed = task.completed
+        while True:
+            if slow_task.should_cancel():
+                task.cancel()
+            if not task.advance():
+                break
+            if task.completed != completed:
+                completed = task.completed
+                slow_task.enter_progress_frame(1, task.description or task.name)
+    return task.result
+
+
+def run_now(task):
+    """Run a task to completion now without any dialog, used by scripts and nested operations"""
+    with shader_updates.deferred():
+        while task.advance():
+            pass
+    return task.result
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """
+    Get the process-wide task scheduler
+
+    return:
+        TaskScheduler: the task scheduler
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TaskScheduler()
+    return _scheduler
+
+
+def submit(task):
+    """Queue a task to run over the next editor ticks, see TaskScheduler.submit"""
+    return get_scheduler().submit(task)
@@ -0,0 +1,172 @@
+import time
+from contextlib import contextmanager
+
+from master_materials import (
+    hierarchy,
+    tracing
+)
+
+from master_materials.unreal_systems import (
+    AssetEditorSubsystem,
+    MaterialEditingLibrary
+)
+
+import unreal
+
+
+class ShaderUpdateScheduler:
+    """
+    Coalesce the shader updates and editor refreshes of edited materials
+
+    Edited materials are marked dirty and flushed together on the next editor tick, or once the
+    outermost hold ends (a ParameterEditBatch, a task). A flush recompiles each dirty material
+    once, updates each dirty instance once unless a recompiled material above it covers it, and
+    only refreshes the editors which are open. The time the shader compiler then needs to empty
+    its queue is logged, jobs queued by anything else are counted in it too
+    """
+
+    def __init__(self):
+        self.materials = dict()     # {material path: unreal.Material} to recompile
+        self.instances = dict()     # {instance path: unreal.MaterialInstance} to update
+        self.hold_count = 0
+        self.tick_handle = None
+        self.compile_start = None
+        self.compile_count = 0
+        self.last_compile_seconds = None
+
+    def mark_dirty(self, material):
+        """
+        Queue the shader update of an edited material
+
+        parameters:
+            material (unreal.MaterialInterface): the edited material or material instance
+        """
+        if isinstance(material, unreal.MaterialInstance):
+            self.instances[material.get_path_name()] = material
+        else:
+            self.materials[material.get_path_name()] = material
+        self.request_tick()
+
+    def has_pending(self):
+        return bool(self.materials or self.instances)
+
+    def hold(self):
+        """Defer flushes until the matching release()"""
+        self.hold_count += 1
+
+    def release(self):
+        """End a hold(), flushing the pending updates once no hold is left"""
+        self.hold_count = max(self.hold_count - 1, 0)
+        if not self.hold_count:
+            self.flush()
+
+    def request_tick(self):
+        if self.tick_handle is None:
+            self.tick_handle = unreal.register_slate_post_tick_callback(self.on_tick)
+
+    def on_tick(self, delta_seconds):
+        if not self.hold_count:
+            self.flush()
+        if self.compile_start is not None:
+            self.poll_compilation()
+
+        # held updates are flushed by release(), the tick is only kept to follow a compilation
+        if self.compile_start is None and (self.hold_count or not self.has_pending()):
+            unreal.unregister_slate_post_tick_callback(self.tick_handle)
+            self.tick_handle = None
+
+    @tracing.traced
+    def flush(self):
+        """Recompile / update every dirty material now and refresh their open editors"""
+        if not self.has_pending():
+            return
+        materials, self.materials = self.materials, dict()
+        instances, self.instances = self.instances, dict()
+
+        for material in materials.values():
+            MaterialEditingLibrary.recompile_material(material)
+
+        material_hierarchy = hierarchy.get_material_hierarchy() if materials else None
+        for instance_path, material_instance in instances.items():
+            # recompiling a material updates every instance derived from it
+            if material_hierarchy and set(materials).intersection(material_hierarchy.get_ancestors(instance_path)):
+                continue
+            MaterialEditingLibrary.update_material_instance(material_instance)
+
+        self.refresh_editors({**materials, **instances})
+        self.start_compile_timer(len(materials) + len(instances))
+
+    @staticmethod
+    def refresh_editors(edited_assets):
+        """
+        Reopen the editors of the given assets which are currently open
+
+        parameters:
+            edited_assets (dict): {asset path: asset}
+        """
+        open_paths = {asset.get_path_name() for asset in AssetEditorSubsystem.get_all_edited_assets() or []}
+        reopened = [asset for asset_path, asset in edited_assets.items() if asset_path in open_paths]
+        for asset in reopened:
+            AssetEditorSubsystem.close_all_editors_for_asset(asset)
+        if reopened:
+            AssetEditorSubsystem.open_editor_for_assets(reopened)
+
+    def start_compile_timer(self, material_count):
+        """Time the shader compilation of a flush, back to back flushes are timed together"""
+        if not hasattr(unreal.MasterMaterialSystemBPLibrary, "get_num_remaining_shader_jobs"):
+            return
+        if self.compile_start is None:
+            self.compile_start = time.perf_counter()
+            self.compile_count = 0
+        self.compile_count += material_count
+        self.request_tick()
+
+    def poll_compilation(self):
+        if unreal.MasterMaterialSystemBPLibrary.get_num_remaining_shader_jobs():
+            return
+        self.last_compile_seconds = time.perf_counter() - self.compile_start
+        self.compile_start = None
+        unreal.log(f"Compiled the shaders of {self.compile_count} edited material(s) in {self.last_compile_seconds:.2f}s")
+
+
+_shader_updates = None
+
+
+def get_shader_updates():
+    """
+    Get the process-wide shader update scheduler
+
+    return:
+        ShaderUpdateScheduler: the shader update scheduler
+    """
+    global _shader_updates
+    if _shader_updates is None:
+        _shader_updates = ShaderUpdateScheduler()
+    return _shader_updates
+
+
+def mark_dirty(material):
+    """Queue the shader update of an edited material, see ShaderUpdateScheduler.mark_dirty"""
+    get_shader_updates().mark_dirty(material)
+
+
+def flush():
+    """Apply the pending shader updates now, scripts running without editor ticks call it once done editing"""
+    get_shader_updates().flush()
+
+
+@contextmanager
+def deferred():
+    """
+    Hold the shader updates of the edits made inside the block, they are flushed once the outermost block ends
+
+        with shader_updates.deferred():
+            for material_info in material_infos:
+                material_info.set_parameter_value("Roughness", 0.5)
+    """
+    shader_updates = get_shader_updates()
+    shader_updates.hold()
+    try:
+        yield shader_updates
+    finally:
+        shader_updates.release()
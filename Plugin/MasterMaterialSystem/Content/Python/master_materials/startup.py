@@ -0,0 +1,87 @@
+import time
+
+from master_materials import (
+    constants,
+    events,
+    index,
+    menus
+)
+
+from master_materials.unreal_systems import asset_registry
+
+import unreal
+
+
+# The time spent in each startup phase as {phase: seconds}
+timings = dict()
+
+_tick_handle = None
+
+
+def record_phase(phase, start_time):
+    """Record and log the time spent in a startup phase since start_time"""
+    timings[phase] = time.perf_counter() - start_time
+    unreal.log(f"Master Material System {phase}: {timings[phase] * 1000:.1f} ms")
+
+
+def startup(boot_start=None):
+    """
+    Run the cheap startup phase and schedule the deferred phase
+
+    The metadata tags and menu stubs are registered right away, and the menus are filled with
+    the master materials of the persistent index if the previous session stored any. The index
+    is built from the Asset Registry once it has finished its initial scan, or on the first editor
+    tick if it already has. Opening a menu never builds the index, the menus only list the master
+    materials known so far until then
+
+    parameters:
+        boot_start (float): the time.perf_counter() value init_unreal started at
+    """
+    global _tick_handle
+
+    if boot_start is not None:
+        record_phase("imports", boot_start)
+
+    start_time = time.perf_counter()
+    unreal.MasterMaterialSystemBPLibrary.register_metadata_tags([
+        constants.META_MATERIAL_DISPLAY_NAME,
+        constants.META_IS_MASTER_MATERIAL
+    ])
+    menus.register_menus()
+
+    # warm start: list what the previous session stored, the deferred phase reconciles it
+    if index.get_master_material_index(build=False).entries:
+        menus.populate_menus(build=False)
+
+    # fill the menus once the Asset Registry is ready, on the next tick if it already is
+    waiting_for_registry = (
+        asset_registry.is_loading_assets()
+        and events.connect("on_files_loaded", on_files_loaded)
+    )
+    if not waiting_for_registry:
+        _tick_handle = unreal.register_slate_post_tick_callback(on_first_tick)
+    record_phase("startup", start_time)
+
+
+def finish_startup():
+    """The deferred phase: build the master material index and fill the menus"""
+    global _tick_handle
+
+    events.disconnect("on_files_loaded", on_files_loaded)
+    if _tick_handle is not None:
+        unreal.unregister_slate_post_tick_callback(_tick_handle)
+        _tick_handle = None
+
+    if menus.is_populated() and index.get_master_material_index(build=False).is_built:
+        return
+    start_time = time.perf_counter()
+    menus.populate_menus()
+    record_phase("deferred startup", start_time)
+
+
+def on_files_loaded():
+    finish_startup()
+
+
+def on_first_tick(delta_seconds):
+    finish_startup()
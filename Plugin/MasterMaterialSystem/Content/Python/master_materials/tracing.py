@@ -0,0 +1,222 @@
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from master_materials import (
+    events,
+    unreal_systems
+)
+
+import unreal
+
+
+# The number of slowest calls logged when a capture stops
+SUMMARY_SIZE = 15
+
+
+def get_trace_dir():
+    """Get the folder traces are written to"""
+    return Path(unreal.Paths.project_saved_dir(), "master_materials", "traces")
+
+
+class Tracer:
+    """
+    Record nested spans as Chrome trace events, with the number of assets loaded and
+    packages saved while each span was open
+    """
+
+    def __init__(self):
+        self.trace_events = list()
+        self.calls = dict()             # {span name: [call count, total seconds]}
+        self.loads = 0
+        self.saves = 0
+        self.origin = time.perf_counter()
+        self.started = datetime.now()
+
+    def on_asset_loaded(self, asset):
+        self.loads += 1
+
+    def on_package_saved(self, package_name):
+        self.saves += 1
+
+    @contextmanager
+    def span(self, name, category="python"):
+        """Record the wall time, loads and saves of the enclosed block"""
+        loads, saves = self.loads, self.saves
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.record(name, category, start, end, self.loads - loads, self.saves - saves)
+
+    def record(self, name, category, start, end, loads, saves):
+        stats = self.calls.setdefault(name, [0, 0.0])
+        stats[0] += 1
+        stats[1] += end - start
+
+        # Chrome nests complete ("X") events of the same thread by their time range
+        self.trace_events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self.origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"loads": loads, "saves": saves},
+        })
+
+    def get_summary(self, limit=SUMMARY_SIZE):
+        """
+        Get the most expensive spans
+
+        return:
+            list(tuple): (name, call count, total seconds) sorted by total time
+        """
+        summary = sorted(
+            ((name, count, total) for name, (count, total) in self.calls.items()),
+            key=lambda item: item[2],
+            reverse=True
+        )
+        return summary[:limit]
+
+    def export(self, trace_path):
+        """Write the recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        trace = {
+            "traceEvents": self.trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "started": self.started.isoformat(),
+                "loads": self.loads,
+                "saves": self.saves,
+            },
+        }
+        trace_path.write_text(json.dumps(trace), encoding="utf-8")
+
+
+class TracedHandle:
+    """Stand-in for an Unreal library or subsystem which records a span around every method call"""
+
+    def __init__(self, tracer, name, handle):
+        self._tracer = tracer
+        self._name = name
+        self._handle = handle
+
+    def __getattr__(self, attr):
+        value = getattr(self._handle, attr)
+        if not callable(value) or isinstance(value, type):
+            return value
+
+        tracer = self._tracer
+        span_name = f"{self._name}.{attr}"
+
+        @functools.wraps(value)
+        def traced_call(*args, **kwargs):
+            with tracer.span(span_name, "unreal"):
+                return value(*args, **kwargs)
+
+        return traced_call
+
+
+_tracer = None
+_swapped_handles = list()   # [(module, attribute name, original handle)]
+
+
+def get_handles():
+    """Get the Unreal libraries and subsystems shared by the package as {name: handle}"""
+    return {
+        name: handle
+        for name, handle in vars(unreal_systems).items()
+        if isinstance(handle, unreal_systems.LazyHandle)
+    }
+
+
+def is_capturing():
+    return _tracer is not None
+
+
+def start_capture():
+    """
+    Start recording spans, every master_materials module then calls Unreal through traced handles
+
+    return:
+        bool: False if a capture was already running
+    """
+    global _tracer
+    if _tracer is not None:
+        return False
+
+    _tracer = Tracer()
+    events.connect("on_asset_loaded", _tracer.on_asset_loaded)
+    events.connect("on_package_saved", _tracer.on_package_saved)
+
+    handles = get_handles()
+    traced_handles = {
+        name: TracedHandle(_tracer, name, handle)
+        for name, handle in handles.items()
+    }
+    for module_name, module in list(sys.modules.items()):
+        if module_name.split(".", 1)[0] != "master_materials" or module is sys.modules[__name__]:
+            continue
+        for name, handle in handles.items():
+            if vars(module).get(name) is handle:
+                _swapped_handles.append((module, name, handle))
+                setattr(module, name, traced_handles[name])
+
+    unreal.log("Master Material System trace capture started")
+    return True
+
+
+def stop_capture():
+    """
+    Stop recording, restore the original handles and export the trace
+
+    return:
+        Path: the exported trace, None if no capture was running
+    """
+    global _tracer
+    if _tracer is None:
+        return None
+
+    tracer = _tracer
+    _tracer = None
+    while _swapped_handles:
+        module, name, handle = _swapped_handles.pop()
+        setattr(module, name, handle)
+    events.disconnect("on_asset_loaded", tracer.on_asset_loaded)
+    events.disconnect("on_package_saved", tracer.on_package_saved)
+
+    # milliseconds keep back to back captures apart
+    trace_path = get_trace_dir() / f"trace_{tracer.started:%Y%m%d_%H%M%S}_{tracer.started.microsecond // 1000:03d}.json"
+    tracer.export(trace_path)
+
+    lines = [f"Master Material System trace: {trace_path} ({tracer.loads} loads, {tracer.saves} saves)"]
+    for name, count, total in tracer.get_summary():
+        lines.append(f"\t{total * 1000:10.2f} ms  {count:6d} x  {name}")
+    unreal.log("\n".join(lines))
+    return trace_path
+
+
+def traced(func):
+    """Decorator recording a span around every call of the function while a capture is running"""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _tracer is None:
+            return func(*args, **kwargs)
+        with _tracer.span(name):
+            return func(*args, **kwargs)
+
+    # unreal.ufunction reads the parameter names through inspect.getfullargspec, which ignores __wrapped__
+    wrapper.__signature__ = inspect.signature(func)
+    return wrapper
@@ -1,17 +1,38 @@
 import unreal
 
 
+class LazyHandle:
+    """
+    Stand-in for an Unreal library or subsystem which is only resolved on first use,
+    importing the package then costs nothing during editor startup
+    """
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+        self._handle = None
+
+    def get(self):
+        """Get the resolved library or subsystem"""
+        if self._handle is None:
+            self._handle = self._resolve()
+        return self._handle
+
+    def __getattr__(self, attr):
+        return getattr(self.get(), attr)
+
+
 # Registries and Libraries
-asset_registry_helper = unreal.AssetRegistryHelpers()
-asset_registry        = asset_registry_helper.get_asset_registry()
-EditorAssetLibrary    = unreal.EditorAssetLibrary()
-ToolMenus             = unreal.ToolMenus.get()
-AssetTools            = unreal.AssetToolsHelpers.get_asset_tools()
+asset_registry_helper  = LazyHandle(lambda: unreal.AssetRegistryHelpers())
+asset_registry         = LazyHandle(lambda: asset_registry_helper.get_asset_registry())
+EditorAssetLibrary     = LazyHandle(lambda: unreal.EditorAssetLibrary())
+ToolMenus              = LazyHandle(lambda: unreal.ToolMenus.get())
+AssetTools             = LazyHandle(lambda: unreal.AssetToolsHelpers.get_asset_tools())
+MaterialEditingLibrary = LazyHandle(lambda: unreal.MaterialEditingLibrary)
 
 
 # Subsystems
-AssetEditorSubsystem   = unreal.get_editor_subsystem(unreal.AssetEditorSubsystem)
-EditorAssetSubsystem   = unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
-EditorActorSubsystem   = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
-EditorUtilitySubsystem = unreal.get_editor_subsystem(unreal.EditorUtilitySubsystem)
-LevelEditorSubsystem   = unreal.get_editor_subsystem(unreal.LevelEditorSubsystem)
\ No newline at end of file
+AssetEditorSubsystem   = LazyHandle(lambda: unreal.get_editor_subsystem(unreal.AssetEditorSubsystem))
+EditorAssetSubsystem   = LazyHandle(lambda: unreal.get_editor_subsystem(unreal.EditorAssetSubsystem))
+EditorActorSubsystem   = LazyHandle(lambda: unreal.get_editor_subsystem(unreal.EditorActorSubsystem))
+EditorUtilitySubsystem = LazyHandle(lambda: unreal.get_editor_subsystem(unreal.EditorUtilitySubsystem))
+LevelEditorSubsystem   = LazyHandle(lambda: unreal.get_editor_subsystem(unreal.LevelEditorSubsystem))
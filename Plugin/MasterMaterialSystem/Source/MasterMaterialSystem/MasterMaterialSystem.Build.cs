@@ -34,6 +34,7 @@ public class MasterMaterialSystem : ModuleRules
 		PrivateDependencyModuleNames.AddRange(
 			new string[]
 			{
+				"AssetRegistry",
 				"Blutility",
 				"CoreUObject",
 				"Engine",
@@ -1,6 +1,7 @@
 // Copyright Epic Games, Inc. All Rights Reserved.
 
 #include "MasterMaterialSystem.h"
+#include "MasterMaterialSystemEvents.h"
 
 #define LOCTEXT_NAMESPACE "FMasterMaterialSystemModule"
 
@@ -14,7 +15,7 @@ void FMasterMaterialSystemModule::ShutdownModule()
 {
 	// This function may be called during shutdown to clean up your module.  For modules that support dynamic reloading,
 	// we call this function before unloading the module.
-	
+	UMasterMaterialSystemEvents::Shutdown();
 }
 
 #undef LOCTEXT_NAMESPACE
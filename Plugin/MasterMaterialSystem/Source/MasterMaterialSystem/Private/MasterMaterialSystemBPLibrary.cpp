@@ -5,6 +5,10 @@
 #include "EditorUtilitySubsystem.h"
 #include "EditorUtilityWidgetBlueprint.h"
 #include "AssetRegistry/AssetRegistryModule.h"
+#include "IO/IoHash.h"
+#include "Misc/PackageName.h"
+#include "ShaderCompiler.h"
+#include "UObject/UObjectGlobals.h"
 
 
 UMasterMaterialSystemBPLibrary::UMasterMaterialSystemBPLibrary(const FObjectInitializer& ObjectInitializer)
@@ -38,3 +42,61 @@ UMasterMaterialSystemBPLibrary::RegisterMetadataTags(const TArray<FName>& Tags)
 	}
 }
 
+
+UMasterMaterialSystemEvents*
+UMasterMaterialSystemBPLibrary::GetEvents()
+{
+	return UMasterMaterialSystemEvents::Get();
+}
+
+
+void
+UMasterMaterialSystemBPLibrary::PrefetchAssets(const TArray<FString>& ObjectPaths)
+{
+	TSet<FString> PackageNames;
+	for (const FString& ObjectPath : ObjectPaths)
+	{
+		const FString PackageName = FPackageName::ObjectPathToPackageName(ObjectPath);
+		if (!PackageName.IsEmpty() && !FindPackage(nullptr, *PackageName))
+		{
+			PackageNames.Add(PackageName);
+		}
+	}
+
+	for (const FString& PackageName : PackageNames)
+	{
+		LoadPackageAsync(PackageName);
+	}
+	FlushAsyncLoading();
+}
+
+
+TMap<FString, FString>
+UMasterMaterialSystemBPLibrary::GetPackageSavedHashes(const TArray<FString>& PackageNames)
+{
+	TMap<FString, FString> SavedHashes;
+	IAssetRegistry& AssetRegistry = FModuleManager::LoadModuleChecked<FAssetRegistryModule>("AssetRegistry").Get();
+	for (const FString& PackageName : PackageNames)
+	{
+		TOptional<FAssetPackageData> PackageData = AssetRegistry.GetAssetPackageDataCopy(FName(*PackageName));
+		if (PackageData.IsSet())
+		{
+			SavedHashes.Add(PackageName, LexToString(PackageData->GetPackageSavedHash()));
+		}
+	}
+	return SavedHashes;
+}
+
+
+int32
+UMasterMaterialSystemBPLibrary::GetNumRemainingShaderJobs()
+{
+	return GShaderCompilingManager ? GShaderCompilingManager->GetNumRemainingJobs() : 0;
+}
+
+
+bool
+UMasterMaterialSystemBPLibrary::IsEditorLevelActor(const AActor* Actor)
+{
+	return UMasterMaterialSystemEvents::IsEditorLevelActor(Actor);
+}
@@ -0,0 +1,243 @@
+// Copyright Epic Games, Inc. All Rights Reserved.
+
+#include "MasterMaterialSystemEvents.h"
+#include "AssetRegistry/AssetRegistryModule.h"
+#include "AssetRegistry/IAssetRegistry.h"
+#include "Components/ActorComponent.h"
+#include "Editor.h"
+#include "Engine/Engine.h"
+#include "GameFramework/Actor.h"
+#include "Materials/Material.h"
+#include "UObject/Package.h"
+
+
+TObjectPtr<UMasterMaterialSystemEvents> UMasterMaterialSystemEvents::Instance = nullptr;
+
+
+UMasterMaterialSystemEvents*
+UMasterMaterialSystemEvents::Get()
+{
+    if (!Instance)
+    {
+        Instance = NewObject<UMasterMaterialSystemEvents>(GetTransientPackage());
+        Instance->AddToRoot();
+        Instance->BindDelegates();
+    }
+    return Instance;
+}
+
+
+void
+UMasterMaterialSystemEvents::Shutdown()
+{
+    if (Instance)
+    {
+        Instance->UnbindDelegates();
+        Instance->RemoveFromRoot();
+        Instance = nullptr;
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::BindDelegates()
+{
+    IAssetRegistry& AssetRegistry = FModuleManager::LoadModuleChecked<FAssetRegistryModule>("AssetRegistry").Get();
+    AssetRegistry.OnAssetAdded().AddUObject(this, &UMasterMaterialSystemEvents::HandleAssetAdded);
+    AssetRegistry.OnAssetRemoved().AddUObject(this, &UMasterMaterialSystemEvents::HandleAssetRemoved);
+    AssetRegistry.OnAssetRenamed().AddUObject(this, &UMasterMaterialSystemEvents::HandleAssetRenamed);
+    AssetRegistry.OnAssetUpdated().AddUObject(this, &UMasterMaterialSystemEvents::HandleAssetUpdated);
+    AssetRegistry.OnFilesLoaded().AddUObject(this, &UMasterMaterialSystemEvents::HandleFilesLoaded);
+
+    UPackage::PackageMarkedDirtyEvent.AddUObject(this, &UMasterMaterialSystemEvents::HandlePackageDirty);
+    UPackage::PackageSavedWithContextEvent.AddUObject(this, &UMasterMaterialSystemEvents::HandlePackageSaved);
+#if WITH_EDITOR
+    FCoreUObjectDelegates::OnAssetLoaded.AddUObject(this, &UMasterMaterialSystemEvents::HandleAssetLoaded);
+    FCoreUObjectDelegates::OnPackageReloaded.AddUObject(this, &UMasterMaterialSystemEvents::HandlePackageReloaded);
+    UMaterial::OnMaterialCompilationFinished().AddUObject(this, &UMasterMaterialSystemEvents::HandleMaterialCompiled);
+    FCoreUObjectDelegates::OnObjectPropertyChanged.AddUObject(this, &UMasterMaterialSystemEvents::HandleObjectPropertyChanged);
+    FEditorDelegates::OnMapOpened.AddUObject(this, &UMasterMaterialSystemEvents::HandleMapOpened);
+#endif
+
+    if (GEngine)
+    {
+        GEngine->OnLevelActorAdded().AddUObject(this, &UMasterMaterialSystemEvents::HandleLevelActorAdded);
+        GEngine->OnLevelActorDeleted().AddUObject(this, &UMasterMaterialSystemEvents::HandleLevelActorDeleted);
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::UnbindDelegates()
+{
+    if (FModuleManager::Get().IsModuleLoaded("AssetRegistry"))
+    {
+        IAssetRegistry& AssetRegistry = FModuleManager::GetModuleChecked<FAssetRegistryModule>("AssetRegistry").Get();
+        AssetRegistry.OnAssetAdded().RemoveAll(this);
+        AssetRegistry.OnAssetRemoved().RemoveAll(this);
+        AssetRegistry.OnAssetRenamed().RemoveAll(this);
+        AssetRegistry.OnAssetUpdated().RemoveAll(this);
+        AssetRegistry.OnFilesLoaded().RemoveAll(this);
+    }
+
+    UPackage::PackageMarkedDirtyEvent.RemoveAll(this);
+    UPackage::PackageSavedWithContextEvent.RemoveAll(this);
+#if WITH_EDITOR
+    FCoreUObjectDelegates::OnAssetLoaded.RemoveAll(this);
+    FCoreUObjectDelegates::OnPackageReloaded.RemoveAll(this);
+    UMaterial::OnMaterialCompilationFinished().RemoveAll(this);
+    FCoreUObjectDelegates::OnObjectPropertyChanged.RemoveAll(this);
+    FEditorDelegates::OnMapOpened.RemoveAll(this);
+#endif
+
+    if (GEngine)
+    {
+        GEngine->OnLevelActorAdded().RemoveAll(this);
+        GEngine->OnLevelActorDeleted().RemoveAll(this);
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleAssetAdded(const FAssetData& AssetData)
+{
+    OnAssetAdded.Broadcast(AssetData);
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleAssetRemoved(const FAssetData& AssetData)
+{
+    OnAssetRemoved.Broadcast(AssetData);
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleAssetRenamed(const FAssetData& AssetData, const FString& OldObjectPath)
+{
+    OnAssetRenamed.Broadcast(AssetData, OldObjectPath);
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleAssetUpdated(const FAssetData& AssetData)
+{
+    OnAssetUpdated.Broadcast(AssetData);
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleFilesLoaded()
+{
+    OnFilesLoaded.Broadcast();
+}
+
+
+void
+UMasterMaterialSystemEvents::HandlePackageDirty(UPackage* Package, bool bWasDirty)
+{
+    if (Package)
+    {
+        OnPackageDirty.Broadcast(Package->GetName());
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::HandlePackageSaved(const FString& PackageFileName, UPackage* Package, FObjectPostSaveContext ObjectSaveContext)
+{
+    if (Package)
+    {
+        OnPackageSaved.Broadcast(Package->GetName());
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::HandlePackageReloaded(EPackageReloadPhase PackageReloadPhase, FPackageReloadedEvent* PackageReloadedEvent)
+{
+    if (PackageReloadPhase == EPackageReloadPhase::PostPackageFixup && PackageReloadedEvent && PackageReloadedEvent->GetNewPackage())
+    {
+        OnPackageReloaded.Broadcast(PackageReloadedEvent->GetNewPackage()->GetName());
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleAssetLoaded(UObject* Object)
+{
+    OnAssetLoaded.Broadcast(Object);
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleMaterialCompiled(UMaterialInterface* Material)
+{
+    OnMaterialCompiled.Broadcast(Material);
+}
+
+
+bool
+UMasterMaterialSystemEvents::IsEditorLevelActor(const AActor* Actor)
+{
+    if (!Actor || Actor->IsTemplate() || Actor->HasAnyFlags(RF_Transient) || !GEditor)
+    {
+        return false;
+    }
+
+    // actors of streamed sublevels report the persistent level's world
+    UWorld* EditorWorld = GEditor->GetEditorWorldContext().World();
+    return EditorWorld && Actor->GetWorld() == EditorWorld;
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleLevelActorAdded(AActor* Actor)
+{
+    if (IsEditorLevelActor(Actor))
+    {
+        OnLevelActorAdded.Broadcast(Actor);
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleLevelActorDeleted(AActor* Actor)
+{
+    if (IsEditorLevelActor(Actor))
+    {
+        OnLevelActorDeleted.Broadcast(Actor);
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleObjectPropertyChanged(UObject* Object, FPropertyChangedEvent& PropertyChangedEvent)
+{
+    // dragging a slider sends an interactive change every frame, the final change follows on release
+    if (PropertyChangedEvent.ChangeType == EPropertyChangeType::Interactive)
+    {
+        return;
+    }
+
+    AActor* Actor = Cast<AActor>(Object);
+    if (!Actor)
+    {
+        if (UActorComponent* Component = Cast<UActorComponent>(Object))
+        {
+            Actor = Component->GetOwner();
+        }
+    }
+
+    if (IsEditorLevelActor(Actor))
+    {
+        OnLevelActorModified.Broadcast(Actor);
+    }
+}
+
+
+void
+UMasterMaterialSystemEvents::HandleMapOpened(const FString& Filename, bool bAsTemplate)
+{
+    OnMapOpened.Broadcast();
+}
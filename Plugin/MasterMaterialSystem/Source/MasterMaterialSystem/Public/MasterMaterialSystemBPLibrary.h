@@ -4,6 +4,7 @@
 
 #include "EditorUtilityWidgetBlueprint.h"
 #include "Kismet/BlueprintFunctionLibrary.h"
+#include "MasterMaterialSystemEvents.h"
 #include "MasterMaterialSystemBPLibrary.generated.h"
 
 /*
@@ -27,4 +28,41 @@ class UMasterMaterialSystemBPLibrary : public UBlueprintFunctionLibrary
     UFUNCTION(BlueprintCallable, Category = "Master Materials")
     static void RegisterMetadataTags(const TArray<FName>& Tags);
 
+
+    /**  Get the event bridge that forwards Asset Registry and editor delegates to Python
+     * @return  the Master Material System event bridge
+     */
+    UFUNCTION(BlueprintCallable, Category = "Master Materials")
+    static UMasterMaterialSystemEvents* GetEvents();
+
+
+    /**  Load many assets at once, their packages are requested together and loaded in a single flush
+     * @param  ObjectPaths  the object paths of the assets to load
+     */
+    UFUNCTION(BlueprintCallable, Category = "Master Materials")
+    static void PrefetchAssets(const TArray<FString>& ObjectPaths);
+
+
+    /**  Get the hash each package had when it was last saved, as recorded by the Asset Registry
+     * @param  PackageNames  the packages to look up
+     * @return  the {PackageName: SavedHash} of every package known to the Asset Registry
+     */
+    UFUNCTION(BlueprintCallable, Category = "Master Materials")
+    static TMap<FString, FString> GetPackageSavedHashes(const TArray<FString>& PackageNames);
+
+
+    /**  Get the number of shader compile jobs still queued or running
+     * @return  the remaining shader jobs, 0 once every queued shader is compiled
+     */
+    UFUNCTION(BlueprintCallable, BlueprintPure, Category = "Master Materials")
+    static int32 GetNumRemainingShaderJobs();
+
+
+    /**  Whether the actor is placed in the level being edited, the level actor events only report those
+     * @param  Actor  the actor to check
+     * @return  false for templates, transient actors and actors of preview scenes or PIE worlds
+     */
+    UFUNCTION(BlueprintCallable, BlueprintPure, Category = "Master Materials")
+    static bool IsEditorLevelActor(const AActor* Actor);
+
 };
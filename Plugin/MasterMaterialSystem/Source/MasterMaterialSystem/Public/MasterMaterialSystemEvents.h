@@ -0,0 +1,122 @@
+// Copyright Epic Games, Inc. All Rights Reserved.
+
+#pragma once
+
+#include "CoreMinimal.h"
+#include "AssetRegistry/AssetData.h"
+#include "GameFramework/Actor.h"
+#include "Materials/MaterialInterface.h"
+#include "UObject/ObjectSaveContext.h"
+#include "UObject/PackageReload.h"
+#include "UObject/Object.h"
+#include "MasterMaterialSystemEvents.generated.h"
+
+
+DECLARE_DYNAMIC_MULTICAST_DELEGATE_OneParam(FMasterMaterialAssetEvent, const FAssetData&, AssetData);
+DECLARE_DYNAMIC_MULTICAST_DELEGATE_TwoParams(FMasterMaterialAssetRenamedEvent, const FAssetData&, AssetData, const FString&, OldObjectPath);
+DECLARE_DYNAMIC_MULTICAST_DELEGATE(FMasterMaterialRegistryEvent);
+DECLARE_DYNAMIC_MULTICAST_DELEGATE_OneParam(FMasterMaterialPackageEvent, const FString&, PackageName);
+DECLARE_DYNAMIC_MULTICAST_DELEGATE_OneParam(FMasterMaterialObjectEvent, UObject*, Object);
+DECLARE_DYNAMIC_MULTICAST_DELEGATE_OneParam(FMasterMaterialCompiledEvent, UMaterialInterface*, Material);
+DECLARE_DYNAMIC_MULTICAST_DELEGATE_OneParam(FMasterMaterialActorEvent, AActor*, Actor);
+
+
+/*
+*  Forwards native editor delegates as dynamic delegates so Python may bind to them
+*/
+UCLASS(BlueprintType)
+class UMasterMaterialSystemEvents : public UObject
+{
+	GENERATED_BODY()
+
+public:
+
+    /**  Get the event bridge, creating and binding it on first use  */
+    static UMasterMaterialSystemEvents* Get();
+
+    /**  Unbind the native delegates and release the event bridge  */
+    static void Shutdown();
+
+    /**  Whether the actor is placed in the level being edited (or one of its streamed sublevels),
+     *   not in a preview scene, a PIE world or a transient world  */
+    static bool IsEditorLevelActor(const AActor* Actor);
+
+
+    /**  Called when the Asset Registry discovers a new asset  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialAssetEvent OnAssetAdded;
+
+    /**  Called when the Asset Registry removes an asset  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialAssetEvent OnAssetRemoved;
+
+    /**  Called when the Asset Registry renames an asset  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialAssetRenamedEvent OnAssetRenamed;
+
+    /**  Called when the Asset Registry updates the data of an existing asset  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialAssetEvent OnAssetUpdated;
+
+    /**  Called once the Asset Registry has finished its initial scan  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialRegistryEvent OnFilesLoaded;
+
+    /**  Called when a package is marked dirty  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialPackageEvent OnPackageDirty;
+
+    /**  Called when a package is saved  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialPackageEvent OnPackageSaved;
+
+    /**  Called when a package is reloaded from disk  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialPackageEvent OnPackageReloaded;
+
+    /**  Called when an asset is loaded from disk  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialObjectEvent OnAssetLoaded;
+
+    /**  Called when a material finishes compiling  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialCompiledEvent OnMaterialCompiled;
+
+    /**  Called when an actor is added to the editor level  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialActorEvent OnLevelActorAdded;
+
+    /**  Called when an actor is deleted from the editor level  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialActorEvent OnLevelActorDeleted;
+
+    /**  Called when a property of an actor, or of one of its components, is changed  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialActorEvent OnLevelActorModified;
+
+    /**  Called when a map is opened in the editor  */
+    UPROPERTY(BlueprintAssignable, Category = "Master Materials")
+    FMasterMaterialRegistryEvent OnMapOpened;
+
+private:
+
+    void BindDelegates();
+    void UnbindDelegates();
+
+    void HandleAssetAdded(const FAssetData& AssetData);
+    void HandleAssetRemoved(const FAssetData& AssetData);
+    void HandleAssetRenamed(const FAssetData& AssetData, const FString& OldObjectPath);
+    void HandleAssetUpdated(const FAssetData& AssetData);
+    void HandleFilesLoaded();
+    void HandlePackageDirty(UPackage* Package, bool bWasDirty);
+    void HandlePackageSaved(const FString& PackageFileName, UPackage* Package, FObjectPostSaveContext ObjectSaveContext);
+    void HandlePackageReloaded(EPackageReloadPhase PackageReloadPhase, FPackageReloadedEvent* PackageReloadedEvent);
+    void HandleAssetLoaded(UObject* Object);
+    void HandleMaterialCompiled(UMaterialInterface* Material);
+    void HandleLevelActorAdded(AActor* Actor);
+    void HandleLevelActorDeleted(AActor* Actor);
+    void HandleObjectPropertyChanged(UObject* Object, FPropertyChangedEvent& PropertyChangedEvent);
+    void HandleMapOpened(const FString& Filename, bool bAsTemplate);
+
+    static TObjectPtr<UMasterMaterialSystemEvents> Instance;
+};
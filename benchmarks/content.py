@@ -0,0 +1,153 @@
+"""
+Build simulated project content for the benchmarks
+"""
+import unreal
+
+
+# The parameter node types of generated material graphs as (node class, value property, default value)
+PARAMETER_TYPES = [
+    (unreal.MaterialExpressionScalarParameter, "default_value", 0.5),
+    (unreal.MaterialExpressionVectorParameter, "default_value", unreal.LinearColor(1.0, 1.0, 1.0, 1.0)),
+    (unreal.MaterialExpressionStaticSwitchParameter, "default_value", False),
+    (unreal.MaterialExpressionTextureSampleParameter2D, "texture", None),
+]
+
+MATERIAL_PROPERTIES = [
+    getattr(unreal.MaterialProperty, attr_member)
+    for attr_member in dir(unreal.MaterialProperty)
+    if attr_member.startswith("MP_")
+]
+
+# The number of content folders generated assets are spread over
+FOLDER_COUNT = 20
+
+# The length of the parent chains generated material instances form below a master
+INSTANCE_CHAIN_LENGTH = 3
+
+
+def build_material_graph(material, depth, fan_in, width, parameters):
+    """
+    Give the material a graph of parameter nodes feeding `depth` layers of math nodes
+
+    Each math node reads `fan_in` nodes of the layer below, so neighbouring nodes share
+    most of their inputs the way real material graphs do
+
+    parameters:
+        material (unreal.Material): the material to build the graph in
+        depth (int): the number of math node layers between the parameters and the outputs
+        fan_in (int): the number of inputs of each math node
+        width (int): the number of math nodes per layer
+        parameters (int): the number of parameter nodes
+    """
+    layer = []
+    for index in range(parameters):
+        node_class, value_property, default_value = PARAMETER_TYPES[index % len(PARAMETER_TYPES)]
+        node = node_class(material, f"Parameter{index}")
+        node._properties["parameter_name"] = f"{node_class.__name__.replace('MaterialExpression', '')}{index}"
+        node._properties[value_property] = default_value
+        material.expressions.append(node)
+        layer.append(node)
+
+    for layer_index in range(depth):
+        next_layer = []
+        for node_index in range(width):
+            node = unreal.MaterialExpressionMultiply(material, f"Math{layer_index}_{node_index}")
+            node.inputs = [layer[(node_index + offset) % len(layer)] for offset in range(fan_in)]
+            material.expressions.append(node)
+            next_layer.append(node)
+        layer = next_layer
+
+    for index, material_property in enumerate(MATERIAL_PROPERTIES):
+        material.property_inputs[material_property] = layer[index % len(layer)]
+
+
+def populate_project(config):
+    """
+    Register the benchmark project's assets with the simulated Asset Registry
+
+    parameters:
+        config (argparse.Namespace): the benchmark configuration
+
+    return:
+        list(str): the object paths of the registered master materials
+    """
+    def graph_builder(material):
+        build_material_graph(material, config.depth, config.fan_in, config.width, config.parameters)
+
+    unreal.world.add_asset(
+        "/MasterMaterialSystem/CreateFromMasterMaterial.CreateFromMasterMaterial",
+        "EditorUtilityWidgetBlueprint"
+    )
+
+    master_materials = []
+    for index in range(config.masters):
+        object_path = f"/Game/Masters/M_Master{index}.M_Master{index}"
+        tags = {"is_master_material": "True", "material_display_name": f"Master {index}"}
+        unreal.world.add_asset(object_path, "Material", tags, graph_builder)
+        master_materials.append(object_path)
+
+    # the remaining content is a mix of legacy materials, instances, textures and meshes
+    asset_classes = ["Material", "MaterialInstanceConstant", "Texture2D", "Texture2D", "StaticMesh"]
+    prefixes = {"Material": "M_Legacy", "MaterialInstanceConstant": "MI_", "Texture2D": "T_", "StaticMesh": "SM_"}
+    instances = []
+    for index in range(max(config.assets - config.masters, 0)):
+        asset_class = asset_classes[index % len(asset_classes)]
+        asset_name = f"{prefixes[asset_class]}{index}"
+        object_path = f"/Game/Content/Folder{index % FOLDER_COUNT}/{asset_name}.{asset_name}"
+        builder = graph_builder if asset_class == "Material" else None
+        tags = None
+        if asset_class == "MaterialInstanceConstant":
+            # chains of instances: the first is parented to a master, the others to the previous one
+            if len(instances) % INSTANCE_CHAIN_LENGTH == 0 and master_materials:
+                parent_path = master_materials[len(instances) % len(master_materials)]
+                tags = {"Parent": f"/Script/Engine.Material'{parent_path}'"}
+            elif instances:
+                parent_path = instances[-1]
+                tags = {"Parent": f"/Script/Engine.MaterialInstanceConstant'{parent_path}'"}
+            builder = parent_builder(parent_path) if tags else None
+            instances.append(object_path)
+        unreal.world.add_asset(object_path, asset_class, tags, builder)
+
+    return master_materials
+
+
+def parent_builder(parent_path):
+    """Get a builder parenting the instance it builds to the given material"""
+    def builder(material_instance):
+        material_instance.parent = unreal.load_asset(parent_path)
+    return builder
+
+
+def add_referencing_meshes(material, count, folder="/Game/Referencers"):
+    """
+    Register static meshes using the given material in two of their three slots
+
+    parameters:
+        material (unreal.MaterialInterface): the material the meshes reference
+        count (int): the number of meshes to add
+
+    return:
+        list(str): the package names of the meshes
+    """
+    def mesh_builder(mesh):
+        mesh.static_materials = [
+            unreal.StaticMaterial(material_interface=material, material_slot_name="Base"),
+            unreal.StaticMaterial(material_interface=None, material_slot_name="Decal"),
+            unreal.StaticMaterial(material_interface=material, material_slot_name="Trim"),
+        ]
+
+    package_names = []
+    material_package = material.get_package().get_path_name()
+    for index in range(count):
+        package_name = f"{folder}/SM_Referencer{index}"
+        unreal.world.add_asset(f"{package_name}.SM_Referencer{index}", "StaticMesh", builder=mesh_builder)
+        unreal.world.add_reference(package_name, material_package)
+        package_names.append(package_name)
+    return package_names
+
+
+def unload(package_names):
+    """Drop the given packages from memory so the next access loads them again from their builders"""
+    for package_name in package_names:
+        asset_name = package_name.rsplit("/", 1)[-1]
+        unreal.world.loaded.pop(f"{package_name}.{asset_name}", None)
@@ -0,0 +1,444 @@
+"""
+Benchmark the master_materials hot paths outside the editor
+
+The package runs against the simulated `unreal` module in this folder. Every engine
+call is given a configurable latency, and engine calls, asset loads and package saves
+are counted, those counts are deterministic and the most reliable regression signal.
+
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+"""
+import argparse
+import inspect
+import json
+import platform
+import shutil
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+PYTHON_DIR = BENCHMARK_DIR.parent / "Plugin" / "MasterMaterialSystem" / "Content" / "Python"
+sys.path[:0] = [str(BENCHMARK_DIR), str(PYTHON_DIR)]
+
+import content
+import unreal
+
+
+# The slowdown tolerated before a benchmark is reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Slowdowns below this many seconds are timer noise
+MIN_TIME_DELTA = 0.0005
+
+# The counters compared exactly against the baseline
+COUNTERS = ["calls", "loads", "saves"]
+
+
+def new_session(config):
+    """
+    Reset the simulated editor, its persistent index and re-import master_materials so no cache carries over
+
+    return:
+        list(str): the object paths of the registered master materials
+    """
+    # the previous session's index file is deleted below, its connection must not outlive it
+    close_persistent_index()
+    for module_name in list(sys.modules):
+        if module_name.split(".", 1)[0] == "master_materials":
+            del sys.modules[module_name]
+
+    unreal.reset()
+    unreal.simulation.latency = config.latency
+    reset_persistent_index()
+    return content.populate_project(config)
+
+
+def close_persistent_index():
+    """Close the SQLite connection of the current session's persistent index, if it opened one"""
+    persistent_index = sys.modules.get("master_materials.persistent_index")
+    store = persistent_index and persistent_index._persistent_index
+    if store and store.connection is not None:
+        store.connection.close()
+        store.connection = None
+
+
+def reset_persistent_index():
+    """
+    Empty the persistent index so the next run starts from an empty one: within a session its
+    tables are cleared through the open connection, between sessions the file is deleted
+    """
+    persistent_index = sys.modules.get("master_materials.persistent_index")
+    if persistent_index and persistent_index._persistent_index:
+        persistent_index._persistent_index.execute([
+            ("DELETE FROM master_materials", ()),
+            ("DELETE FROM parameter_schemas", ()),
+            ("DELETE FROM static_switches", ()),
+        ])
+        return
+    shutil.rmtree(Path(unreal.simulation.saved_dir, "master_materials"), ignore_errors=True)
+
+
+def bench_find_assets_by_metadata(config):
+    new_session(config)
+    from master_materials import assets, constants
+    return None, lambda: assets.find_assets(
+        metadata={constants.META_IS_MASTER_MATERIAL: True},
+        class_types=["Material"]
+    )
+
+
+def bench_find_assets_by_name(config):
+    new_session(config)
+    from master_materials import assets
+    return None, lambda: assets.find_assets(name="Legacy", class_types=["Material"])
+
+
+def bench_find_asset_exact(config):
+    new_session(config)
+    from master_materials import assets
+    return None, lambda: assets.find_asset(
+        name="CreateFromMasterMaterial",
+        exact_match=True,
+        class_types=["EditorUtilityWidgetBlueprint"],
+        package_paths=["/MasterMaterialSystem"],
+        recursive_paths=False
+    )
+
+
+def bench_setup_menus_cold(config):
+    new_session(config)
+    from master_materials import index, menus
+
+    def prepare():
+        index._master_material_index = None
+        reset_persistent_index()
+
+    return prepare, menus.setup_menus
+
+
+def bench_setup_menus_warm(config):
+    new_session(config)
+    from master_materials import menus
+    menus.setup_menus()
+    return None, menus.setup_menus
+
+
+def bench_setup_menus_persisted(config):
+    new_session(config)
+    from master_materials import index, menus
+    menus.setup_menus()
+
+    def prepare():
+        index._master_material_index = None
+
+    def run():
+        menus.register_menus()
+        menus.populate_menus(build=False)
+
+    return prepare, run
+
+
+def bench_populate_data_cold(config):
+    master_material = unreal.load_asset(new_session(config)[0])
+    from master_materials import materials
+
+    def prepare():
+        materials._schema_cache = None
+        reset_persistent_index()
+
+    return prepare, lambda: materials.MaterialParamInfo(master_material)
+
+
+def bench_populate_data_persisted(config):
+    master_material = unreal.load_asset(new_session(config)[0])
+    from master_materials import materials
+    materials.MaterialParamInfo(master_material)
+
+    def prepare():
+        materials._schema_cache = None
+
+    return prepare, lambda: materials.MaterialParamInfo(master_material)
+
+
+def bench_populate_data_cached(config):
+    master_material = unreal.load_asset(new_session(config)[0])
+    from master_materials import materials
+    material_instance = materials.create_new_material_instance(
+        "/Game/Instances", master_material, should_save=False, should_open=False
+    )
+    materials.MaterialParamInfo(master_material)
+    return None, lambda: materials.MaterialParamInfo(material_instance)
+
+
+def bench_walk_node(config):
+    master_material = unreal.load_asset(new_session(config)[0])
+    from master_materials import materials
+    schema = materials.ParameterSchema(master_material)
+    end_nodes = [
+        unreal.MaterialEditingLibrary.get_material_property_input_node(master_material, material_property)
+        for material_property in materials.MATERIAL_PROPERTIES
+    ]
+    return None, lambda: schema.walk_node(*end_nodes)
+
+
+def bench_hierarchy_build(config):
+    new_session(config)
+    from master_materials import hierarchy
+    material_hierarchy = hierarchy.MaterialHierarchyIndex()
+    return None, material_hierarchy.build
+
+
+def bench_hierarchy_descendants(config):
+    master_paths = new_session(config)
+    from master_materials import hierarchy
+    material_hierarchy = hierarchy.get_material_hierarchy()
+    return None, lambda: [material_hierarchy.get_descendants(master_path) for master_path in master_paths]
+
+
+def bench_populate_data_instance(config):
+    new_session(config)
+    from master_materials import hierarchy, materials
+    material_hierarchy = hierarchy.get_material_hierarchy()
+    instance_path = max(material_hierarchy.parents, key=material_hierarchy.get_depth)
+    material_instance = unreal.load_asset(instance_path)
+    materials.MaterialParamInfo(material_instance)
+    return None, lambda: materials.MaterialParamInfo(material_instance)
+
+
+def bench_permutations_cold(config):
+    new_session(config)
+    from master_materials import hierarchy, permutations
+    instance_packages = [path.split(".", 1)[0] for path in hierarchy.get_material_hierarchy().parents]
+
+    def prepare():
+        content.unload(instance_packages)
+        reset_persistent_index()
+
+    return prepare, permutations.analyze_permutations
+
+
+def bench_permutations_persisted(config):
+    new_session(config)
+    from master_materials import hierarchy, permutations
+    instance_packages = [path.split(".", 1)[0] for path in hierarchy.get_material_hierarchy().parents]
+    permutations.analyze_permutations()
+
+    def prepare():
+        content.unload(instance_packages)
+
+    return prepare, permutations.analyze_permutations
+
+
+def bench_bulk_instance_edit(config):
+    master_paths = new_session(config)
+    from master_materials import hierarchy, materials, shader_updates
+    instance_paths = sorted(hierarchy.get_material_hierarchy().get_descendants(master_paths[0]))
+    material_infos = [materials.MaterialParamInfo(unreal.load_asset(path)) for path in instance_paths]
+    parameters = [
+        parameter
+        for parameter in material_infos[0].get_parameter_names()
+        if material_infos[0].get_parameter_type(parameter) == float
+    ][:2]
+    values = [0.25, 0.75]
+
+    def prepare():
+        values.reverse()
+
+    def run():
+        for material_info in material_infos:
+            for parameter in parameters:
+                material_info.set_parameter_value(parameter, values[0])
+        shader_updates.flush()
+
+    return prepare, run
+
+
+def bench_register_master_materials(config):
+    new_session(config)
+    from master_materials import assets, constants, index, materials, menus
+    menus.setup_menus()
+    legacy_materials = assets.load_assets(assets.find_assets(name="Legacy", class_types=["Material"])[:50])
+
+    def prepare():
+        for material in legacy_materials:
+            assets.set_metadata(material, constants.META_IS_MASTER_MATERIAL, False)
+        index.get_master_material_index().update_materials(legacy_materials)
+
+    return prepare, lambda: materials.register_master_materials(legacy_materials)
+
+
+def bench_replace_material_references(config):
+    master_paths = new_session(config)
+    from master_materials import materials
+    old_material = unreal.load_asset(master_paths[0])
+    new_material = unreal.load_asset(master_paths[-1])
+    package_names = content.add_referencing_meshes(old_material, config.references)
+
+    def prepare():
+        content.unload(package_names)
+
+    return prepare, lambda: materials.replace_material_references(old_material, new_material)
+
+
+BENCHMARKS = {
+    "find_assets.metadata": bench_find_assets_by_metadata,
+    "find_assets.name": bench_find_assets_by_name,
+    "find_asset.exact": bench_find_asset_exact,
+    "setup_menus.cold": bench_setup_menus_cold,
+    "setup_menus.warm": bench_setup_menus_warm,
+    "setup_menus.persisted": bench_setup_menus_persisted,
+    "populate_data.cold": bench_populate_data_cold,
+    "populate_data.persisted": bench_populate_data_persisted,
+    "populate_data.cached": bench_populate_data_cached,
+    "populate_data.instance": bench_populate_data_instance,
+    "walk_node": bench_walk_node,
+    "hierarchy.build": bench_hierarchy_build,
+    "hierarchy.descendants": bench_hierarchy_descendants,
+    "permutations.cold": bench_permutations_cold,
+    "permutations.persisted": bench_permutations_persisted,
+    "bulk_instance_edit": bench_bulk_instance_edit,
+    "register_master_materials": bench_register_master_materials,
+    "replace_material_references": bench_replace_material_references,
+}
+
+
+def check_blueprint_library():
+    """
+    Import the Blueprint function library the way the editor does, its UFunctions are generated
+    from the argument names inspect.getfullargspec reads, decorators must keep them
+
+    return:
+        list(str): a description of every problem found
+    """
+    try:
+        from master_materials import bplibrary
+    except TypeError as error:
+        return [f"bplibrary: {error}"]
+
+    arg_names = inspect.getfullargspec(
+        bplibrary.PyMasterMaterialLibrary.create_material_instance_with_texture_data
+    ).args
+    if len(arg_names) != 4:
+        return [f"create_material_instance_with_texture_data: arguments {arg_names}, expected 4"]
+    return []
+
+
+def run_benchmark(benchmark, config):
+    """
+    Time a benchmark over config.repeat runs
+
+    return:
+        dict: the min / median seconds and the engine calls, loads and saves of a single run
+    """
+    prepare, run = benchmark(config)
+    timings = []
+    for _ in range(config.repeat):
+        if prepare:
+            prepare()
+        unreal.reset_counters()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "calls": unreal.simulation.call_count,
+        "loads": unreal.simulation.load_count,
+        "saves": unreal.simulation.save_count,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a saved baseline
+
+    return:
+        list(str): a description of every regression
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            continue
+        slowdown = result["median"] - previous["median"]
+        if slowdown > MIN_TIME_DELTA and result["median"] > previous["median"] * (1.0 + tolerance):
+            regressions.append(
+                f"{name}: {result['median'] * 1000:.2f} ms, baseline {previous['median'] * 1000:.2f} ms"
+            )
+        for counter in COUNTERS:
+            if result[counter] > previous[counter]:
+                regressions.append(f"{name}: {result[counter]} {counter}, baseline {previous[counter]}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=5000, help="the number of assets in the project")
+    parser.add_argument("--masters", type=int, default=20, help="the number of registered master materials")
+    parser.add_argument("--depth", type=int, default=12, help="the number of math node layers of each material graph")
+    parser.add_argument("--fan-in", type=int, default=3, help="the number of inputs of each math node")
+    parser.add_argument("--width", type=int, default=8, help="the number of math nodes per graph layer")
+    parser.add_argument("--parameters", type=int, default=24, help="the number of parameters of each material")
+    parser.add_argument("--references", type=int, default=200, help="the number of meshes referencing a material")
+    parser.add_argument("--latency", type=float, default=20e-6, help="the seconds spent in each engine call")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of timed runs per benchmark")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--save", type=Path, help="write the results to this JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare the results against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="the relative slowdown reported as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("repeat", "filter", "save", "compare", "tolerance")
+    }
+
+    problems = check_blueprint_library()
+    for problem in problems:
+        print(f"ERROR {problem}")
+    if problems:
+        return 1
+
+    results = dict()
+    print(f"{'benchmark':32} {'median ms':>10} {'min ms':>10} {'calls':>8} {'loads':>7} {'saves':>7}")
+    for name, benchmark in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        result = results[name] = run_benchmark(benchmark, args)
+        print(
+            f"{name:32} {result['median'] * 1000:10.2f} {result['min'] * 1000:10.2f} "
+            f"{result['calls']:8d} {result['loads']:7d} {result['saves']:7d}"
+        )
+
+    if args.save:
+        args.save.write_text(json.dumps({
+            "config": config,
+            "python": platform.python_version(),
+            "results": results,
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline["config"] != config:
+            print("Warning: the baseline was recorded with a different configuration")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1463 @@
+"""
+A minimal, simulated stand-in for Unreal's `unreal` Python module
+
+Only the API surface used by the `master_materials` package is provided. Each
+simulated engine call may be given a latency to mimic the cost of crossing the
+Python / C++ boundary in the editor.
+"""
+import inspect
+import itertools
+import os
+import tempfile
+import time
+
+
+# ---------------------------------------------------------------------------
+# simulation controls
+
+class _Simulation:
+    latency = 0.0
+    call_count = 0
+    load_count = 0
+    save_count = 0
+    shader_jobs = 0
+    shader_jobs_per_tick = 8
+    saved_dir = os.path.join(tempfile.gettempdir(), "fake_unreal_saved")
+
+
+simulation = _Simulation()
+
+
+def _engine_call():
+    simulation.call_count += 1
+    if simulation.latency:
+        end = time.perf_counter() + simulation.latency
+        while time.perf_counter() < end:
+            pass
+
+
+def reset_counters():
+    simulation.call_count = 0
+    simulation.load_count = 0
+    simulation.save_count = 0
+
+
+def reset():
+    """Drop all simulated content, editor state, callbacks and counters"""
+    _world.reset()
+    _log.clear()
+    _tick_callbacks.clear()
+    _shutdown_callbacks.clear()
+    _subsystems.clear()
+    ToolMenus._instance = None
+    MasterMaterialSystemBPLibrary._events = None
+    MasterMaterialSystemBPLibrary._tags = set()
+    EditorUtilityLibrary.selected_assets = []
+    simulation.shader_jobs = 0
+    reset_counters()
+
+
+# ---------------------------------------------------------------------------
+# logging / decorators
+
+_log = []
+
+
+def log(message):
+    _log.append(("log", str(message)))
+
+
+def log_warning(message):
+    _log.append(("warning", str(message)))
+
+
+def log_error(message):
+    _log.append(("error", str(message)))
+
+
+def uclass(*args, **kwargs):
+    return lambda cls: cls
+
+
+def ustruct(*args, **kwargs):
+    return lambda cls: cls
+
+
+def uenum(*args, **kwargs):
+    return lambda cls: cls
+
+
+def ufunction(*args, **kwargs):
+    def decorator(func):
+        # like UE, the declared parameter types are matched to the names getfullargspec reads
+        params = kwargs.get("params")
+        if params is not None:
+            arg_names = inspect.getfullargspec(func).args[0 if kwargs.get("static") else 1:]
+            if len(arg_names) != len(params):
+                raise TypeError(
+                    f"{func.__name__}: {len(params)} parameter type(s) declared for arguments {arg_names}"
+                )
+        if kwargs.get("static"):
+            return staticmethod(func)
+        return func
+    return decorator
+
+
+def uproperty(value_type=None, meta=None):
+    return None
+
+
+class Array(list):
+    def __init__(self, value_type=None, values=()):
+        super().__init__(values)
+
+
+class Map(dict):
+    def __init__(self, key_type=None, value_type=None):
+        super().__init__()
+
+
+class StructBase:
+    def __init__(self, *args, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+    def set_editor_property(self, name, value):
+        setattr(self, name, value)
+
+    def export_text(self):
+        return f"({','.join(f'{key}={value!r}' for key, value in sorted(vars(self).items()))})"
+
+
+_tick_callbacks = {}
+_tick_ids = itertools.count(1)
+
+
+def register_slate_post_tick_callback(callback):
+    handle = next(_tick_ids)
+    _tick_callbacks[handle] = callback
+    return handle
+
+
+def unregister_slate_post_tick_callback(handle):
+    _tick_callbacks.pop(handle, None)
+
+
+def tick(delta_seconds=1.0 / 60.0, count=1):
+    """Simulate editor ticks, compiling queued shaders and running registered Slate post tick callbacks"""
+    for _ in range(count):
+        simulation.shader_jobs = max(simulation.shader_jobs - simulation.shader_jobs_per_tick, 0)
+        for callback in list(_tick_callbacks.values()):
+            callback(delta_seconds)
+
+
+_shutdown_callbacks = []
+
+
+def register_python_shutdown_callback(callback):
+    _shutdown_callbacks.append(callback)
+    return callback
+
+
+# ---------------------------------------------------------------------------
+# core objects
+
+class Object:
+    def __init__(self, outer=None, name="None"):
+        self._name = name
+        self._outer = outer
+        self._properties = dict()
+        self._metadata = dict()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} '{self.get_path_name()}'>"
+
+    def get_name(self):
+        return self._name
+
+    def get_fname(self):
+        return self._name
+
+    def get_outer(self):
+        return self._outer
+
+    def get_outermost(self):
+        outer = self
+        while outer.get_outer() is not None:
+            outer = outer.get_outer()
+        return outer
+
+    def get_package(self):
+        return self.get_outermost()
+
+    def get_path_name(self):
+        if self._outer is None:
+            return self._name
+        separator = "." if isinstance(self._outer, Package) else ":"
+        return f"{self._outer.get_path_name()}{separator}{self._name}"
+
+    def get_full_name(self):
+        return f"{type(self).__name__} {self.get_path_name()}"
+
+    def get_class(self):
+        return type(self)
+
+    def get_editor_property(self, name):
+        _engine_call()
+        if name in self._properties:
+            return self._properties[name]
+        return getattr(self, name, None)
+
+    def set_editor_property(self, name, value, notify_mode=None):
+        _engine_call()
+        self._properties[name] = value
+        package = self.get_package()
+        if isinstance(package, Package):
+            package.dirty = True
+
+    def set_editor_properties(self, properties):
+        for name, value in properties.items():
+            self.set_editor_property(name, value)
+
+    def modify(self, always_mark_dirty=True):
+        _engine_call()
+        package = self.get_package()
+        if isinstance(package, Package):
+            package.dirty = True
+        return True
+
+
+class Package(Object):
+    def __init__(self, name):
+        super().__init__(None, name)
+        self.dirty = False
+
+    def get_path_name(self):
+        return self._name
+
+
+class Texture(Object):
+    pass
+
+
+class Texture2D(Texture):
+    pass
+
+
+class LinearColor:
+    def __init__(self, r=0.0, g=0.0, b=0.0, a=1.0):
+        self.r, self.g, self.b, self.a = r, g, b, a
+
+    def __eq__(self, other):
+        return isinstance(other, LinearColor) and (self.r, self.g, self.b, self.a) == (other.r, other.g, other.b, other.a)
+
+    def __hash__(self):
+        return hash((self.r, self.g, self.b, self.a))
+
+    def __repr__(self):
+        return f"<LinearColor {self.r} {self.g} {self.b} {self.a}>"
+
+
+class MaterialInterface(Object):
+    pass
+
+
+class Material(MaterialInterface):
+    def __init__(self, outer=None, name="None"):
+        super().__init__(outer, name)
+        self.expressions = []
+        self.property_inputs = dict()  # {MaterialProperty: expression}
+        self.compile_count = 0
+
+
+class MaterialInstance(MaterialInterface):
+    def __init__(self, outer=None, name="None"):
+        super().__init__(outer, name)
+        self.parent = None
+        self.overrides = dict()
+        self.update_count = 0
+
+
+class MaterialInstanceConstant(MaterialInstance):
+    pass
+
+
+class MaterialExpression(Object):
+    def __init__(self, outer=None, name="None"):
+        super().__init__(outer, name)
+        self.inputs = []
+
+
+class MaterialExpressionParameter(MaterialExpression):
+    pass
+
+
+class MaterialExpressionScalarParameter(MaterialExpressionParameter):
+    pass
+
+
+class MaterialExpressionVectorParameter(MaterialExpressionParameter):
+    pass
+
+
+class MaterialExpressionStaticSwitchParameter(MaterialExpressionParameter):
+    pass
+
+
+class MaterialExpressionTextureSampleParameter(MaterialExpression):
+    pass
+
+
+class MaterialExpressionTextureSampleParameter2D(MaterialExpressionTextureSampleParameter):
+    pass
+
+
+class MaterialExpressionMultiply(MaterialExpression):
+    pass
+
+
+class MaterialProperty:
+    MP_BASE_COLOR = "MP_BASE_COLOR"
+    MP_METALLIC = "MP_METALLIC"
+    MP_SPECULAR = "MP_SPECULAR"
+    MP_ROUGHNESS = "MP_ROUGHNESS"
+    MP_EMISSIVE_COLOR = "MP_EMISSIVE_COLOR"
+    MP_OPACITY = "MP_OPACITY"
+    MP_OPACITY_MASK = "MP_OPACITY_MASK"
+    MP_NORMAL = "MP_NORMAL"
+    MP_AMBIENT_OCCLUSION = "MP_AMBIENT_OCCLUSION"
+
+
+class StaticMaterial(StructBase):
+    pass
+
+
+class StaticMesh(Object):
+    def __init__(self, outer=None, name="None"):
+        super().__init__(outer, name)
+        self.static_materials = []
+
+    def get_material_index(self, slot_name):
+        _engine_call()
+        for i, slot in enumerate(self.static_materials):
+            if slot.material_slot_name == slot_name:
+                return i
+        return -1
+
+    def set_material(self, index, material):
+        _engine_call()
+        self.static_materials[index].material_interface = material
+        self.modify()
+
+
+class SkeletalMaterial(StructBase):
+    def __init__(self, material_interface=None, material_slot_name="", uv_channel_data=None):
+        super().__init__()
+        self.material_interface = material_interface
+        self.material_slot_name = material_slot_name
+        self.uv_channel_data = uv_channel_data
+
+
+class SkeletalMesh(Object):
+    def __init__(self, outer=None, name="None"):
+        super().__init__(outer, name)
+        self._materials = []
+
+    @property
+    def materials(self):
+        return self._materials
+
+    @materials.setter
+    def materials(self, value):
+        self._materials = list(value)
+
+
+class Blueprint(Object):
+    pass
+
+
+class EditorUtilityWidgetBlueprint(Blueprint):
+    pass
+
+
+class EditorUtilityWidget(Object):
+    pass
+
+
+class World(Object):
+    pass
+
+
+class Actor(Object):
+    def __init__(self, outer=None, name="None", transient=False):
+        super().__init__(outer, name)
+        self.components = []
+        self.transient = transient  # Sequencer spawnables, preview scene and PIE actors
+
+    def get_components_by_class(self, component_class):
+        _engine_call()
+        return [c for c in self.components if isinstance(c, component_class)]
+
+
+class SceneComponent(Object):
+    def get_owner(self):
+        _engine_call()
+        return self.get_outer()
+
+
+class PrimitiveComponent(SceneComponent):
+    pass
+
+
+class MeshComponent(PrimitiveComponent):
+    def __init__(self, outer=None, name="None"):
+        super().__init__(outer, name)
+        self.override_materials = []
+
+    def get_materials(self):
+        _engine_call()
+        return list(self.override_materials)
+
+    def get_material_slot_names(self):
+        _engine_call()
+        return [f"Slot{i}" for i in range(len(self.override_materials))]
+
+    def set_material(self, index, material):
+        _engine_call()
+        self.override_materials[index] = material
+
+
+class StaticMeshComponent(MeshComponent):
+    pass
+
+
+class MaterialInstanceConstantFactoryNew(Object):
+    pass
+
+
+class Factory(Object):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# asset registry
+
+class SoftObjectPath:
+    def __init__(self, path=""):
+        self.asset_path_string = str(path)
+
+    def __str__(self):
+        return self.asset_path_string
+
+    def export_text(self):
+        return self.asset_path_string
+
+
+class TopLevelAssetPath:
+    def __init__(self, package_name="", asset_name=""):
+        self.package_name = package_name
+        self.asset_name = asset_name
+
+    def __str__(self):
+        return f"{self.package_name}.{self.asset_name}"
+
+
+_SCRIPT_PACKAGES = {
+    "Material": "/Script/Engine",
+    "MaterialInstanceConstant": "/Script/Engine",
+    "StaticMesh": "/Script/Engine",
+    "SkeletalMesh": "/Script/Engine",
+    "Texture2D": "/Script/Engine",
+    "World": "/Script/Engine",
+    "EditorUtilityWidgetBlueprint": "/Script/Blutility",
+}
+
+
+class AssetData:
+    def __init__(self, package_name="", asset_name="", asset_class="", tags=None):
+        self.package_name = package_name
+        self.package_path = package_name.rsplit("/", 1)[0] if package_name else ""
+        self.asset_name = asset_name
+        self.asset_class = asset_class
+        self.asset_class_path = TopLevelAssetPath(_SCRIPT_PACKAGES.get(asset_class, "/Script/Engine"), asset_class)
+        self.tags = dict(tags or {})
+        self.object_path = f"{package_name}.{asset_name}"
+
+    def __repr__(self):
+        return f"<AssetData {self.object_path}>"
+
+    def get_tag_value(self, tag_name):
+        _engine_call()
+        return self.tags.get(str(tag_name))
+
+    def get_asset(self):
+        return _world.load(self.object_path)
+
+    def get_class(self):
+        return _CLASSES.get(self.asset_class, Object)
+
+    def get_export_text_name(self):
+        return f"{self.asset_class_path}'{self.object_path}'"
+
+    def is_valid(self):
+        return bool(self.package_name)
+
+    def is_asset_loaded(self):
+        return self.object_path in _world.loaded
+
+
+class Name:
+    """FName: compares and hashes apart from str, convert with str()"""
+
+    def __init__(self, value=""):
+        self._value = str(value)
+
+    def __str__(self):
+        return self._value
+
+    def __repr__(self):
+        return f'<Name "{self._value}">'
+
+    def __eq__(self, other):
+        return isinstance(other, Name) and other._value == self._value
+
+    def __hash__(self):
+        return hash((Name, self._value))
+
+    def __lt__(self, other):
+        return self._value < str(other)
+
+
+class ARFilter:
+    def __init__(self, package_names=None, package_paths=None, soft_object_paths=None, object_paths=None,
+                 class_names=None, class_paths=None, recursive_classes_exclusion_set=None,
+                 tags_and_values=None, recursive_paths=False, recursive_classes=False,
+                 include_only_on_disk_assets=False):
+        self.package_names = [str(package_name) for package_name in package_names or []]
+        self.package_paths = list(package_paths or [])
+        self.object_paths = list(object_paths or soft_object_paths or [])
+        self.class_names = list(class_names or [])
+        self.class_paths = list(class_paths or [])
+        self.tags_and_values = list(tags_and_values or [])
+        self.recursive_paths = recursive_paths
+        self.recursive_classes = recursive_classes
+        self.include_only_on_disk_assets = include_only_on_disk_assets
+
+    def copy(self):
+        new_filter = ARFilter()
+        new_filter.__dict__.update({
+            key: list(value) if isinstance(value, list) else value
+            for key, value in self.__dict__.items()
+        })
+        return new_filter
+
+    def matches(self, asset_data):
+        if self.package_names and asset_data.package_name not in self.package_names:
+            return False
+        if self.object_paths and asset_data.object_path not in [str(p) for p in self.object_paths]:
+            return False
+        if self.package_paths:
+            path = asset_data.package_path
+            if self.recursive_paths:
+                if not any(path == p.rstrip("/") or path.startswith(p.rstrip("/") + "/") for p in self.package_paths):
+                    return False
+            elif path not in [p.rstrip("/") for p in self.package_paths]:
+                return False
+        class_names = [c.lower() for c in self.class_names] + [
+            str(c.asset_name).lower() for c in self.class_paths
+        ]
+        if class_names:
+            asset_class = asset_data.get_class()
+            if self.recursive_classes:
+                if not any(
+                    issubclass(asset_class, _CLASSES.get(_CLASSES_LOWER.get(c, ""), type(None)))
+                    for c in class_names
+                ):
+                    return False
+            elif asset_data.asset_class.lower() not in class_names:
+                return False
+        if self.tags_and_values:
+            if not any(
+                asset_data.tags.get(str(t.tag)) == t.value if t.value is not None else str(t.tag) in asset_data.tags
+                for t in self.tags_and_values
+            ):
+                return False
+        return True
+
+
+class TagAndValue:
+    def __init__(self, tag="", value=None):
+        self.tag = tag
+        self.value = value
+
+
+class AssetRegistryDependencyOptions(StructBase):
+    pass
+
+
+class AssetRegistry:
+    def get_assets(self, filter):
+        _engine_call()
+        return [a for a in _world.asset_datas() if filter.matches(a)]
+
+    def run_assets_through_filter(self, asset_data_list, filter):
+        _engine_call()
+        return [a for a in asset_data_list if filter.matches(a)]
+
+    def get_assets_by_path(self, package_path, recursive=False, include_only_on_disk_assets=False):
+        _engine_call()
+        return self.get_assets(ARFilter(package_paths=[package_path], recursive_paths=recursive))
+
+    def get_assets_by_package_name(self, package_name, include_only_on_disk_assets=False):
+        _engine_call()
+        return [a for a in _world.asset_datas() if a.package_name == package_name]
+
+    def get_asset_by_object_path(self, object_path, include_only_on_disk_assets=False):
+        _engine_call()
+        return _world.asset_data(str(object_path)) or AssetData()
+
+    def get_referencers(self, package_name, reference_options=None):
+        _engine_call()
+        return [Name(referencer) for referencer in sorted(_world.referencers.get(str(package_name), set()))]
+
+    def get_dependencies(self, package_name, dependency_options=None):
+        _engine_call()
+        return sorted(
+            referencer
+            for referencer, dependencies in _world.referencers.items()
+            if str(package_name) in dependencies
+        )
+
+    def is_loading_assets(self):
+        return _world.is_loading
+
+    def wait_for_completion(self):
+        _world.is_loading = False
+
+
+_asset_registry = AssetRegistry()
+
+
+class AssetRegistryHelpers:
+    @staticmethod
+    def get_asset_registry():
+        return _asset_registry
+
+    @staticmethod
+    def set_filter_tags_and_values(filter, tags_and_values):
+        # like the engine, the tags are added to a copy of the filter's, and matched if any matches
+        new_filter = filter.copy()
+        new_filter.tags_and_values = filter.tags_and_values + list(tags_and_values)
+        return new_filter
+
+    @staticmethod
+    def get_asset(asset_data):
+        return asset_data.get_asset()
+
+
+# ---------------------------------------------------------------------------
+# simulated content
+
+class _World:
+    """The simulated project content: asset registry records, loaded objects and references"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.records = dict()      # {object_path: (asset_class, tags, builder)}
+        self.loaded = dict()       # {object_path: Object}
+        self.referencers = dict()  # {package_name: set(package_name)}
+        self.saved_versions = dict()  # {package_name: number of saves}
+        self.is_loading = False
+        self._asset_data_cache = None
+
+    def add_asset(self, object_path, asset_class, tags=None, builder=None):
+        self.records[object_path] = (asset_class, dict(tags or {}), builder)
+        self._asset_data_cache = None
+        bridge = MasterMaterialSystemBPLibrary._events
+        if bridge is not None:
+            bridge.on_asset_added.broadcast(self.asset_data(object_path))
+
+    def add_reference(self, referencer_package, dependency_package):
+        self.referencers.setdefault(dependency_package, set()).add(referencer_package)
+
+    def asset_datas(self):
+        if self._asset_data_cache is None:
+            self._asset_data_cache = [self.asset_data(path) for path in self.records]
+        return self._asset_data_cache
+
+    def asset_data(self, object_path):
+        record = self.records.get(object_path)
+        if not record:
+            return None
+        asset_class, tags, _ = record
+        package_name, asset_name = object_path.split(".", 1)
+        loaded = self.loaded.get(object_path)
+        if loaded is not None:
+            tags = dict(tags)
+            tags.update(loaded._metadata)
+            if isinstance(loaded, MaterialInstance) and loaded.parent is not None:
+                tags["Parent"] = f"{type(loaded.parent).__name__}'{loaded.parent.get_path_name()}'"
+        return AssetData(package_name, asset_name, asset_class, tags)
+
+    def load(self, object_path):
+        object_path = str(object_path)
+        if "." not in object_path:
+            object_path = f"{object_path}.{object_path.rsplit('/', 1)[-1]}"
+        if object_path in self.loaded:
+            return self.loaded[object_path]
+        record = self.records.get(object_path)
+        if not record:
+            return None
+        _engine_call()
+        simulation.load_count += 1
+        asset_class, tags, builder = record
+        package_name, asset_name = object_path.split(".", 1)
+        package = Package(package_name)
+        asset = _CLASSES.get(asset_class, Object)(package, asset_name)
+        asset._metadata.update(tags)
+        self.loaded[object_path] = asset
+        if builder:
+            builder(asset)
+        _broadcast("on_asset_loaded", asset)
+        return asset
+
+    def create(self, package_path, asset_name, asset_class):
+        object_path = f"{package_path}/{asset_name}.{asset_name}"
+        self.records[object_path] = (asset_class.__name__, dict(), None)
+        self._asset_data_cache = None
+        package = Package(f"{package_path}/{asset_name}")
+        package.dirty = True
+        asset = asset_class(package, asset_name)
+        self.loaded[object_path] = asset
+        return asset
+
+    def save(self, asset):
+        _engine_call()
+        simulation.save_count += 1
+        package = asset.get_package()
+        package.dirty = False
+        object_path = asset.get_path_name()
+        record = self.records.get(object_path)
+        if record:
+            asset_class, tags, builder = record
+            tags = dict(tags)
+            tags.update(asset._metadata)
+            self.records[object_path] = (asset_class, tags, builder)
+            self._asset_data_cache = None
+        self.saved_versions[package.get_name()] = self.saved_versions.get(package.get_name(), 0) + 1
+        _broadcast("on_package_saved", package.get_name())
+        return True
+
+    def consolidate(self, survivor, duplicate):
+        """Point every referencer of the duplicate at the survivor, then delete the duplicate"""
+        survivor_package = survivor.get_package().get_name()
+        duplicate_package = duplicate.get_package().get_name()
+        for referencer_package in self.referencers.pop(duplicate_package, set()):
+            for object_path in list(self.records):
+                if object_path.split(".", 1)[0] != referencer_package:
+                    continue
+                referencer = self.load(object_path)
+                for slot in getattr(referencer, "static_materials", []):
+                    if slot.material_interface is duplicate:
+                        slot.material_interface = survivor
+                if getattr(referencer, "parent", None) is duplicate:
+                    referencer.parent = survivor
+                referencer.get_package().dirty = True
+            self.referencers.setdefault(survivor_package, set()).add(referencer_package)
+
+        asset_data = self.asset_data(duplicate.get_path_name())
+        self.records.pop(duplicate.get_path_name(), None)
+        self.loaded.pop(duplicate.get_path_name(), None)
+        self._asset_data_cache = None
+        _broadcast("on_asset_removed", asset_data)
+
+
+def _broadcast(event_name, *args):
+    events = MasterMaterialSystemBPLibrary._events
+    if events is not None:
+        getattr(events, event_name).broadcast(*args)
+
+
+_world = _World()
+world = _world
+
+
+def load_asset(name, outer=None):
+    return _world.load(name)
+
+
+def find_asset(name, outer=None):
+    return _world.loaded.get(str(name))
+
+
+def load_package(name):
+    for path, asset in _world.loaded.items():
+        if path.split(".", 1)[0] == name:
+            return asset.get_package()
+    return None
+
+
+def find_package(name):
+    return load_package(name)
+
+
+def new_object(cls, outer=None, name="None"):
+    return cls()
+
+
+# ---------------------------------------------------------------------------
+# libraries
+
+class EditorAssetLibrary:
+    @staticmethod
+    def set_metadata_tag(asset, key, value):
+        _engine_call()
+        asset._metadata[str(key)] = str(value)
+        asset.get_package().dirty = True
+
+    @staticmethod
+    def get_metadata_tag(asset, key):
+        _engine_call()
+        return asset._metadata.get(str(key), "")
+
+    @staticmethod
+    def find_asset_data(asset_path):
+        _engine_call()
+        path = str(asset_path)
+        if "." not in path:
+            path = f"{path}.{path.rsplit('/', 1)[-1]}"
+        return _world.asset_data(path) or AssetData()
+
+    @staticmethod
+    def load_asset(asset_path):
+        return _world.load(asset_path)
+
+    @staticmethod
+    def does_asset_exist(asset_path):
+        return EditorAssetLibrary.find_asset_data(asset_path).is_valid()
+
+    @staticmethod
+    def sync_browser_to_objects(paths):
+        _engine_call()
+
+    @staticmethod
+    def save_loaded_asset(asset, only_if_is_dirty=True):
+        return _world.save(asset)
+
+    @staticmethod
+    def consolidate_assets(asset_to_consolidate_to, assets_to_consolidate):
+        _engine_call()
+        for asset in assets_to_consolidate:
+            _world.consolidate(asset_to_consolidate_to, asset)
+        return True
+
+
+class EditorLoadingAndSavingUtils:
+    @staticmethod
+    def save_packages(packages, only_dirty):
+        _engine_call()
+        for package in packages:
+            for path, asset in _world.loaded.items():
+                if asset.get_package() is package:
+                    _world.save(asset)
+        return True
+
+    @staticmethod
+    def save_dirty_packages(save_map_packages, save_content_packages):
+        return True
+
+
+class EditorUtilityLibrary:
+    selected_assets = []
+    current_path = "/Game"
+
+    @staticmethod
+    def get_selected_assets_of_class(cls):
+        return [a for a in EditorUtilityLibrary.selected_assets if isinstance(a, cls)]
+
+    @staticmethod
+    def get_selected_assets():
+        return list(EditorUtilityLibrary.selected_assets)
+
+    @staticmethod
+    def get_current_content_browser_path():
+        return EditorUtilityLibrary.current_path
+
+    def sync_browser_to_folders(self, folders):
+        pass
+
+
+class MathLibrary:
+    @staticmethod
+    def class_is_child_of(test_class, parent_class):
+        _engine_call()
+        return isinstance(test_class, type) and issubclass(test_class, parent_class)
+
+
+class SystemLibrary:
+    @staticmethod
+    def get_engine_version():
+        return "5.3.2-simulated"
+
+
+class Paths:
+    @staticmethod
+    def project_saved_dir():
+        return simulation.saved_dir
+
+    @staticmethod
+    def project_dir():
+        return os.path.dirname(simulation.saved_dir)
+
+
+class MaterialEditingLibrary:
+    @staticmethod
+    def _parameter_nodes(material):
+        root = material
+        while isinstance(root, MaterialInstance):
+            root = root.parent
+        if root is None:
+            return []
+        return root.expressions
+
+    @staticmethod
+    def _names(material, node_type):
+        _engine_call()
+        names = []
+        for node in MaterialEditingLibrary._parameter_nodes(material):
+            if isinstance(node, node_type):
+                name = node._properties.get("parameter_name")
+                if name not in names:
+                    names.append(name)
+        return names
+
+    @staticmethod
+    def get_scalar_parameter_names(material):
+        return MaterialEditingLibrary._names(material, MaterialExpressionScalarParameter)
+
+    @staticmethod
+    def get_vector_parameter_names(material):
+        return MaterialEditingLibrary._names(material, MaterialExpressionVectorParameter)
+
+    @staticmethod
+    def get_static_switch_parameter_names(material):
+        return MaterialEditingLibrary._names(material, MaterialExpressionStaticSwitchParameter)
+
+    @staticmethod
+    def get_texture_parameter_names(material):
+        return MaterialEditingLibrary._names(material, MaterialExpressionTextureSampleParameter)
+
+    @staticmethod
+    def get_material_property_input_node(material, material_property):
+        _engine_call()
+        return material.property_inputs.get(material_property)
+
+    @staticmethod
+    def get_inputs_for_material_expression(material, material_expression):
+        _engine_call()
+        return list(material_expression.inputs)
+
+    @staticmethod
+    def _default(material, parameter, prop):
+        for node in MaterialEditingLibrary._parameter_nodes(material):
+            if node._properties.get("parameter_name") == parameter:
+                return node._properties.get(prop)
+        return None
+
+    @staticmethod
+    def get_material_default_scalar_parameter_value(material, parameter_name):
+        _engine_call()
+        return MaterialEditingLibrary._default(material, parameter_name, "default_value")
+
+    @staticmethod
+    def get_material_default_static_switch_parameter_value(material, parameter_name):
+        _engine_call()
+        return MaterialEditingLibrary._default(material, parameter_name, "default_value")
+
+    @staticmethod
+    def get_material_default_texture_parameter_value(material, parameter_name):
+        _engine_call()
+        return MaterialEditingLibrary._default(material, parameter_name, "texture")
+
+    @staticmethod
+    def get_material_default_vector_parameter_value(material, parameter_name):
+        _engine_call()
+        return MaterialEditingLibrary._default(material, parameter_name, "default_value")
+
+    @staticmethod
+    def _instance_value(instance, parameter, prop):
+        material = instance
+        while isinstance(material, MaterialInstance):
+            if parameter in material.overrides:
+                return material.overrides[parameter]
+            material = material.parent
+        return MaterialEditingLibrary._default(material, parameter, prop) if material else None
+
+    @staticmethod
+    def get_material_instance_scalar_parameter_value(instance, parameter_name, association=None):
+        _engine_call()
+        return MaterialEditingLibrary._instance_value(instance, parameter_name, "default_value")
+
+    @staticmethod
+    def get_material_instance_static_switch_parameter_value(instance, parameter_name, association=None):
+        _engine_call()
+        return MaterialEditingLibrary._instance_value(instance, parameter_name, "default_value")
+
+    @staticmethod
+    def get_material_instance_texture_parameter_value(instance, parameter_name, association=None):
+        _engine_call()
+        return MaterialEditingLibrary._instance_value(instance, parameter_name, "texture")
+
+    @staticmethod
+    def get_material_instance_vector_parameter_value(instance, parameter_name, association=None):
+        _engine_call()
+        return MaterialEditingLibrary._instance_value(instance, parameter_name, "default_value")
+
+    @staticmethod
+    def _set_instance_value(instance, parameter, value):
+        _engine_call()
+        instance.overrides[parameter] = value
+        instance.get_package().dirty = True
+        return True
+
+    set_material_instance_scalar_parameter_value = _set_instance_value
+    set_material_instance_static_switch_parameter_value = _set_instance_value
+    set_material_instance_texture_parameter_value = _set_instance_value
+    set_material_instance_vector_parameter_value = _set_instance_value
+
+    @staticmethod
+    def set_material_instance_parent(instance, new_parent):
+        _engine_call()
+        instance.parent = new_parent
+
+    @staticmethod
+    def update_material_instance(instance):
+        _engine_call()
+        instance.update_count += 1
+        simulation.shader_jobs += 1
+
+    @staticmethod
+    def recompile_material(material):
+        _engine_call()
+        material.compile_count += 1
+        simulation.shader_jobs += 1
+
+    @staticmethod
+    def get_used_textures(material):
+        _engine_call()
+        return [
+            node._properties.get("texture")
+            for node in MaterialEditingLibrary._parameter_nodes(material)
+            if isinstance(node, MaterialExpressionTextureSampleParameter) and node._properties.get("texture")
+        ]
+
+
+class AssetTools:
+    def create_asset(self, asset_name, package_path, asset_class, factory):
+        _engine_call()
+        return _world.create(package_path, asset_name, asset_class)
+
+    def create_unique_asset_name(self, base_package_name, suffix):
+        _engine_call()
+        existing = {path.split(".", 1)[0].lower() for path in _world.records}
+        candidate = f"{base_package_name}{suffix}"
+        index = 0
+        while candidate.lower() in existing:
+            index += 1
+            candidate = f"{base_package_name}_{index}{suffix}"
+        return candidate, candidate.rsplit("/", 1)[-1]
+
+
+_asset_tools = AssetTools()
+
+
+class AssetToolsHelpers:
+    @staticmethod
+    def get_asset_tools():
+        return _asset_tools
+
+
+# ---------------------------------------------------------------------------
+# tool menus
+
+class MultiBlockType:
+    MENU_ENTRY = "MENU_ENTRY"
+
+
+class ToolMenuInsertType:
+    DEFAULT = "DEFAULT"
+    BEFORE = "BEFORE"
+    AFTER = "AFTER"
+    FIRST = "FIRST"
+
+
+class ToolMenuInsert(StructBase):
+    def __init__(self, name="", position=ToolMenuInsertType.DEFAULT):
+        super().__init__()
+        self.name = name
+        self.position = position
+
+
+class ToolMenuEntry(StructBase):
+    pass
+
+
+class ToolMenuEntryScriptData(StructBase):
+    pass
+
+
+class ToolMenuContext(Object):
+    def __init__(self, objects=()):
+        super().__init__(None, "ToolMenuContext")
+        self.objects = list(objects)
+
+    def find_by_class(self, cls):
+        for obj in self.objects:
+            if isinstance(obj, cls):
+                return obj
+        return None
+
+
+class ContentBrowserAssetContextMenuContext(Object):
+    def __init__(self, selected_assets=()):
+        super().__init__(None, "ContentBrowserAssetContextMenuContext")
+        self.selected_assets = list(selected_assets)
+
+
+class ToolMenuEntryScript(Object):
+    def __init__(self):
+        super().__init__(None, type(self).__name__)
+        self.data = None
+
+    def init_entry(self, owner_name, menu, section, name, label="", tool_tip=""):
+        _engine_call()
+        self.data = ToolMenuEntryScriptData(
+            owner_name=owner_name, menu=menu, section=section, name=name, label=label, tool_tip=tool_tip
+        )
+
+
+class ToolMenuSectionDynamic(Object):
+    def __init__(self):
+        super().__init__(None, type(self).__name__)
+
+
+class ToolMenu(Object):
+    def __init__(self, menu_name):
+        super().__init__(None, menu_name)
+        self.menu_name = menu_name
+        self.sections = dict()  # {section: [(owner, name, entry)]}
+        self.dynamic_sections = dict()  # {section: ToolMenuSectionDynamic}
+
+    def get_editor_property(self, name):
+        if name == "menu_name":
+            return self.menu_name
+        return super().get_editor_property(name)
+
+    def add_section(self, section_name, label="", insert_name="", insert_type=None):
+        _engine_call()
+        self.sections.setdefault(section_name, [])
+
+    def add_dynamic_section(self, section_name, obj):
+        _engine_call()
+        self.dynamic_sections[section_name] = obj
+
+    def open(self, context=None):
+        """Simulate the menu being opened, constructing its dynamic sections"""
+        for obj in list(self.dynamic_sections.values()):
+            obj.construct_sections(self, context)
+
+    def add_sub_menu(self, owner, section_name, name, label, tool_tip=""):
+        _engine_call()
+        sub_menu = ToolMenus.get().extend_menu(f"{self.menu_name}.{name}")
+        entries = self.sections.setdefault(section_name, [])
+        entries[:] = [e for e in entries if e[1] != name]
+        entries.append((owner, name, sub_menu))
+        return sub_menu
+
+    def _insert(self, section_name, owner, name, entry, insert_position=None):
+        entries = self.sections.setdefault(section_name, [])
+        entries[:] = [e for e in entries if e[1] != name]
+        index = len(entries)
+        if insert_position is not None and insert_position.name:
+            for i, existing in enumerate(entries):
+                if existing[1] == insert_position.name:
+                    index = i if insert_position.position == ToolMenuInsertType.BEFORE else i + 1
+                    break
+        entries.insert(index, (owner, name, entry))
+
+    def add_menu_entry_object(self, entry):
+        _engine_call()
+        data = entry.data
+        self._insert(data.section, data.owner_name, data.name, entry)
+
+    def add_menu_entry(self, section_name, entry):
+        _engine_call()
+        script = entry.script_object
+        self._insert(section_name, script.data.owner_name, entry.name, script, entry.insert_position)
+
+    def entry_names(self, section_name):
+        return [e[1] for e in self.sections.get(section_name, [])]
+
+
+class ToolMenus:
+    _instance = None
+
+    def __init__(self):
+        self.menus = dict()
+        self.refresh_count = 0
+
+    @classmethod
+    def get(cls):
+        if cls._instance is None:
+            cls._instance = ToolMenus()
+        return cls._instance
+
+    def extend_menu(self, name):
+        _engine_call()
+        if name not in self.menus:
+            self.menus[name] = ToolMenu(name)
+        return self.menus[name]
+
+    def find_menu(self, name):
+        return self.menus.get(name)
+
+    def unregister_owner_by_name(self, owner):
+        _engine_call()
+        for menu in self.menus.values():
+            for section, entries in menu.sections.items():
+                entries[:] = [e for e in entries if e[0] != owner]
+
+    def remove_entry(self, menu, section, name):
+        _engine_call()
+        menu_object = self.menus.get(str(menu))
+        if menu_object:
+            entries = menu_object.sections.get(str(section), [])
+            entries[:] = [e for e in entries if e[1] != str(name)]
+
+    def refresh_all_widgets(self):
+        _engine_call()
+        self.refresh_count += 1
+
+
+# ---------------------------------------------------------------------------
+# subsystems
+
+class ScopedSlowTask:
+    def __init__(self, amount_of_work=100.0, default_message=""):
+        self.amount_of_work = amount_of_work
+        self.completed = 0.0
+        self.cancel_requested = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def make_dialog(self, can_cancel=False, allow_in_pie=False):
+        pass
+
+    def make_dialog_delayed(self, threshold, can_cancel=False, allow_in_pie=False):
+        pass
+
+    def enter_progress_frame(self, work=1.0, desc=""):
+        self.completed += work
+
+    def should_cancel(self):
+        return self.cancel_requested
+
+
+class ScopedEditorTransaction:
+    def __init__(self, description=""):
+        self.description = description
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class EditorSubsystem(Object):
+    pass
+
+
+class AssetEditorSubsystem(EditorSubsystem):
+    def __init__(self):
+        super().__init__(None, "AssetEditorSubsystem")
+        self.open_assets = []
+
+    def close_all_editors_for_asset(self, asset):
+        _engine_call()
+        if asset in self.open_assets:
+            self.open_assets = [a for a in self.open_assets if a is not asset]
+            return True
+        return False
+
+    def open_editor_for_assets(self, assets):
+        _engine_call()
+        for asset in assets:
+            if asset not in self.open_assets:
+                self.open_assets.append(asset)
+
+    def get_all_edited_assets(self):
+        _engine_call()
+        return list(self.open_assets)
+
+
+class EditorAssetSubsystem(EditorSubsystem):
+    def __init__(self):
+        super().__init__(None, "EditorAssetSubsystem")
+
+    def save_loaded_asset(self, asset, only_if_is_dirty=True):
+        return _world.save(asset)
+
+    def save_loaded_assets(self, assets_to_save, only_if_is_dirty=True):
+        for asset in assets_to_save:
+            _world.save(asset)
+        return True
+
+    def save_asset(self, asset_to_save, only_if_is_dirty=True):
+        asset = _world.load(asset_to_save)
+        return _world.save(asset) if asset else False
+
+    def load_asset(self, asset_path):
+        return _world.load(asset_path)
+
+
+class EditorActorSubsystem(EditorSubsystem):
+    def __init__(self):
+        super().__init__(None, "EditorActorSubsystem")
+        self.actors = []
+
+    def get_all_level_actors(self):
+        _engine_call()
+        return list(self.actors)
+
+    def get_all_level_actors_components(self):
+        _engine_call()
+        components = []
+        for actor in self.actors:
+            components.extend(getattr(actor, "components", []))
+        return components
+
+
+class EditorUtilitySubsystem(EditorSubsystem):
+    def __init__(self):
+        super().__init__(None, "EditorUtilitySubsystem")
+
+    def spawn_and_register_tab(self, widget_blueprint):
+        _engine_call()
+        return EditorUtilityWidget(None, "Widget")
+
+    def register_tab_and_get_id(self, widget_blueprint):
+        _engine_call()
+        return "tab"
+
+    def unregister_tab_by_id(self, tab_id):
+        _engine_call()
+        return True
+
+
+class LevelEditorSubsystem(EditorSubsystem):
+    def __init__(self):
+        super().__init__(None, "LevelEditorSubsystem")
+
+
+class ImportSubsystem(EditorSubsystem):
+    pass
+
+
+_subsystems = dict()
+
+
+def get_editor_subsystem(cls):
+    if cls not in _subsystems:
+        _subsystems[cls] = cls()
+    return _subsystems[cls]
+
+
+# ---------------------------------------------------------------------------
+# plugin bindings
+
+class MulticastDelegate:
+    def __init__(self):
+        self.callables = []
+
+    def add_callable(self, callback):
+        self.callables.append(callback)
+
+    def remove_callable(self, callback):
+        if callback in self.callables:
+            self.callables.remove(callback)
+
+    def broadcast(self, *args):
+        for callback in list(self.callables):
+            callback(*args)
+
+
+class MasterMaterialSystemEvents(Object):
+    def __init__(self):
+        super().__init__(None, "MasterMaterialSystemEvents")
+        for name in (
+            "on_asset_added", "on_asset_removed", "on_asset_renamed", "on_asset_updated", "on_files_loaded",
+            "on_package_dirty", "on_asset_loaded", "on_package_saved", "on_package_reloaded", "on_material_compiled",
+            "on_level_actor_added", "on_level_actor_deleted", "on_level_actor_modified", "on_map_opened",
+        ):
+            setattr(self, name, MulticastDelegate())
+
+
+class MasterMaterialSystemBPLibrary:
+    _events = None
+    _tags = set()
+
+    @staticmethod
+    def register_metadata_tags(tags):
+        MasterMaterialSystemBPLibrary._tags.update(tags)
+
+    @staticmethod
+    def get_events():
+        if MasterMaterialSystemBPLibrary._events is None:
+            MasterMaterialSystemBPLibrary._events = MasterMaterialSystemEvents()
+        return MasterMaterialSystemBPLibrary._events
+
+    @staticmethod
+    def remove_euw_from_user_prefs(tool):
+        pass
+
+    @staticmethod
+    def get_num_remaining_shader_jobs():
+        _engine_call()
+        return simulation.shader_jobs
+
+    @staticmethod
+    def is_editor_level_actor(actor):
+        _engine_call()
+        return isinstance(actor, Actor) and not actor.transient
+
+    @staticmethod
+    def get_package_saved_hashes(package_names):
+        _engine_call()
+        known = {path.split(".", 1)[0] for path in _world.records}
+        return {
+            package_name: f"{package_name}#{_world.saved_versions.get(package_name, 0)}"
+            for package_name in package_names
+            if package_name in known
+        }
+
+
+class BlueprintFunctionLibrary:
+    pass
+
+
+_CLASSES = {
+    cls.__name__: cls
+    for cls in list(globals().values())
+    if isinstance(cls, type) and issubclass(cls, Object)
+}
+_CLASSES_LOWER = {name.lower(): name for name in _CLASSES}